@@ -20,7 +20,7 @@ class DHCPConfig(PluginConfig):
     def ready(self):
         super().ready()
 
-        from netbox_dhcp.signals import dhcp_server  # noqa: F401
+        from netbox_dhcp.signals import dhcp_server, config_generation  # noqa: F401
 
 
 #
@@ -0,0 +1,106 @@
+import json
+from collections import defaultdict
+
+from netbox_dhcp.kea.renderer import STREAM_BUFFER_SIZE, STREAM_CHUNK_SIZE
+from netbox_dhcp.models import HostReservation
+
+__all__ = ("HostReservationExporter",)
+
+
+HOST_RESERVATION_FIELDS = {
+    "id": "pk",
+    "name": "name",
+    "dhcp_server": "dhcp_server_id",
+    "subnet": "subnet_id",
+    "hw_address": "hw_address__mac_address",
+    "duid": "duid",
+    "client_id": "client_id",
+    "circuit_id": "circuit_id",
+    "flex_id": "flex_id",
+    "hostname": "hostname",
+    "ipv4_address": "ipv4_address__address",
+}
+HOST_RESERVATION_RELATIONS = {
+    "ipv6_addresses": "ipaddress__address",
+    "ipv6_prefixes": "prefix__prefix",
+    "excluded_ipv6_prefixes": "prefix__prefix",
+}
+
+
+def get_value(value):
+    if value is None or isinstance(value, (int, str)):
+        return value
+
+    return str(value)
+
+
+class HostReservationExporter:
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    def get_relations(self, pks):
+        relations = {}
+
+        for field_name, lookup in HOST_RESERVATION_RELATIONS.items():
+            values = defaultdict(list)
+            for pk, value in (
+                getattr(HostReservation, field_name)
+                .through.objects.filter(hostreservation_id__in=pks)
+                .order_by("pk")
+                .values_list("hostreservation_id", lookup)
+            ):
+                values[pk].append(str(value))
+            relations[field_name] = values
+
+        return relations
+
+    # +
+    # Host reservations are fetched in chunks ordered by their primary key,
+    # each with one query for the scalar fields and one query per many-to-many
+    # relation, and written out as one JSON object per line.
+    # -
+    def stream_lines(self, chunk_size):
+        queryset = (
+            self.queryset.order_by("pk")
+            .values_list(*HOST_RESERVATION_FIELDS.values())
+            .distinct()
+        )
+        last_pk = None
+
+        while True:
+            rows = list(
+                (queryset if last_pk is None else queryset.filter(pk__gt=last_pk))[
+                    :chunk_size
+                ]
+            )
+            if not rows:
+                return
+
+            relations = self.get_relations([row[0] for row in rows])
+            for row in rows:
+                record = {
+                    key: get_value(value)
+                    for key, value in zip(HOST_RESERVATION_FIELDS, row)
+                }
+                for field_name, values in relations.items():
+                    record[field_name] = values.get(row[0], [])
+
+                yield json.dumps(record, separators=(",", ":")) + "\n"
+
+            last_pk = rows[-1][0]
+
+    def stream(self, chunk_size=STREAM_CHUNK_SIZE, buffer_size=STREAM_BUFFER_SIZE):
+        buffer = []
+        buffered = 0
+
+        for line in self.stream_lines(chunk_size):
+            buffer.append(line)
+            buffered += len(line)
+
+            if buffered >= buffer_size:
+                yield "".join(buffer)
+                buffer = []
+                buffered = 0
+
+        if buffer:
+            yield "".join(buffer)
@@ -0,0 +1,110 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.db.models import Q
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from netbox.api.pagination import OptionalLimitOffsetPagination
+
+__all__ = ("KeysetPagination",)
+
+
+# +
+# Build the filter selecting the rows sorting after the given key values, i.e.
+# (k1, k2, ...) > (v1, v2, ...) expanded into k1 > v1 OR (k1 = v1 AND ...).
+# -
+def get_keyset_filter(keys, values):
+    query = Q(**{f"{keys[-1]}__gt": values[-1]})
+    for key, value in zip(reversed(keys[:-1]), reversed(values[:-1])):
+        query = Q(**{f"{key}__gt": value}) | (Q(**{key: value}) & query)
+
+    return query
+
+
+class KeysetPagination(OptionalLimitOffsetPagination):
+    cursor_query_param = "cursor"
+    invalid_cursor_message = _("Invalid cursor.")
+
+    def __init__(self):
+        super().__init__()
+        self.cursor_values = None
+
+    def is_keyset_request(self, request):
+        return self.cursor_query_param in request.query_params
+
+    def get_keyset_ordering(self, view):
+        return tuple(getattr(view, "keyset_ordering", ("pk",)))
+
+    def encode_cursor(self, values):
+        return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, request, keys):
+        if not (cursor := request.query_params.get(self.cursor_query_param)):
+            return None
+
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+        except (BinasciiError, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise NotFound(self.invalid_cursor_message)
+
+        return values
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # +
+        # Offset pagination stays the default. Clients opt in to keyset
+        # pagination by passing the cursor parameter (empty for the first
+        # page), which makes the cost of a page independent of its position.
+        # -
+        if not self.is_keyset_request(request):
+            self.cursor_values = None
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request) or self.default_limit
+
+        keys = self.get_keyset_ordering(view)
+        queryset = queryset.order_by(*keys)
+        if (values := self.decode_cursor(request, keys)) is not None:
+            queryset = queryset.filter(get_keyset_filter(keys, values))
+
+        results = list(queryset[: self.limit + 1])
+        if len(results) > self.limit:
+            results = results[: self.limit]
+            self.cursor_values = [getattr(results[-1], key) for key in keys]
+        else:
+            self.cursor_values = []
+
+        return results
+
+    def get_next_link(self):
+        if self.cursor_values is None:
+            return super().get_next_link()
+        if not self.cursor_values:
+            return None
+
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.offset_query_param
+        )
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.cursor_values)
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_values is None:
+            return super().get_paginated_response(data)
+
+        return Response(
+            {
+                "count": None,
+                "next": self.get_next_link(),
+                "previous": None,
+                "results": data,
+            }
+        )
@@ -0,0 +1,117 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+
+from dcim.models import MACAddress
+from ipam.models import IPAddress, IPRange, Prefix
+from netbox.api.authentication import TokenPermissions
+from utilities.permissions import get_permission_for_model
+
+from netbox_dhcp.models import (
+    ClientClass,
+    DHCPServer,
+    DHCPServerInterface,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+from netbox_dhcp.models.dhcp_server import CONFIG_GENERATION_LOOKUPS
+
+__all__ = (
+    "ConfigPermissions",
+    "UpsertPermissions",
+)
+
+
+CONFIG_MODELS = (
+    ClientClass,
+    DHCPServerInterface,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+    IPAddress,
+    IPRange,
+    MACAddress,
+    Prefix,
+)
+OPTION_MODELS = (
+    ClientClass,
+    DHCPServer,
+    HostReservation,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+
+
+def get_config_objects(model, dhcp_server):
+    if model is DHCPServerInterface:
+        return model.objects.filter(dhcp_server=dhcp_server)
+
+    condition = Q()
+    if model is Option:
+        for assigned_model in OPTION_MODELS:
+            condition |= Q(
+                assigned_object_type=ContentType.objects.get_for_model(assigned_model),
+                assigned_object_id__in=get_config_objects(
+                    assigned_model, dhcp_server
+                ).values("pk"),
+            )
+    else:
+        dhcp_servers = DHCPServer.objects.filter(pk=dhcp_server.pk)
+        for lookup in CONFIG_GENERATION_LOOKUPS[model._meta.model_name]:
+            condition |= Q(pk__in=dhcp_servers.values(lookup))
+
+    return model.objects.filter(condition)
+
+
+# +
+# An upsert creates some rows and updates others, so either the add or the
+# change permission grants access to the endpoint. Each row is then checked
+# against the permission for what is actually done with it.
+# -
+class UpsertPermissions(TokenPermissions):
+    def get_required_permissions(self, method, model_cls):
+        return []
+
+    def has_permission(self, request, view):
+        if not super().has_permission(request, view):
+            return False
+
+        model = view.queryset.model
+        return any(
+            request.user.has_perm(get_permission_for_model(model, action))
+            for action in ("add", "change")
+        )
+
+
+# +
+# The configuration of a DHCP server contains the objects assigned to it, so
+# it is only rendered for users permitted to view every one of them.
+# -
+class ConfigPermissions(TokenPermissions):
+    def has_object_permission(self, request, view, obj):
+        if not super().has_object_permission(request, view, obj):
+            return False
+        if request.user.is_superuser:
+            return True
+
+        for model in CONFIG_MODELS:
+            if not request.user.has_perm(get_permission_for_model(model, "view")):
+                return False
+
+            queryset = get_config_objects(model, obj)
+            if queryset.exclude(
+                pk__in=queryset.restrict(request.user, "view").values("pk")
+            ).exists():
+                return False
+
+        return True
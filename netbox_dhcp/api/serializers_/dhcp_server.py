@@ -53,11 +53,24 @@ class DHCPServerInterfaceSerializer(NetBoxModelSerializer):
             "virtual_machine_interface",
         )
 
+        prefetch_plan = {
+            "dhcp_server": ("dhcp_server",),
+            "device_interface": (
+                "device_interface__device",
+                "device_interface__cable",
+            ),
+            "virtual_machine_interface": (
+                "virtual_machine_interface__virtual_machine",
+            ),
+        }
+
     name = serializers.CharField(
+        source="get_name",
         read_only=True,
         required=False,
     )
     parent_name = serializers.CharField(
+        source="get_parent_name",
         read_only=True,
         required=False,
     )
@@ -106,6 +119,7 @@ class DHCPServerSerializer(
             "host_reservation_identifiers",
             "echo_client_id",
             "relay_supplied_options",
+            "config_generation",
             "client_classes",
             "child_subnets",
             "child_shared_networks",
@@ -121,6 +135,16 @@ class DHCPServerSerializer(
             "status",
         )
 
+        prefetch_plan = {
+            "device_interfaces": (
+                "device_interfaces__device",
+                "device_interfaces__cable",
+            ),
+            "virtual_machine_interfaces": (
+                "virtual_machine_interfaces__virtual_machine",
+            ),
+        }
+
     url = serializers.HyperlinkedIdentityField(
         view_name="plugins-api:netbox_dhcp-api:dhcpserver-detail"
     )
@@ -9,7 +9,20 @@ from netbox_dhcp.models import HostReservation
 from .option import OptionSerializer
 from .mixins import ClientClassSerializerMixin
 
-__all__ = ("HostReservationSerializer",)
+__all__ = (
+    "HostReservationSerializer",
+    "HostReservationUpsertSerializer",
+    "HostReservationBulkUpsertSerializer",
+)
+
+
+HOST_RESERVATION_IDENTIFIERS = (
+    "hw_address",
+    "duid",
+    "client_id",
+    "circuit_id",
+    "flex_id",
+)
 
 
 class HostReservationSerializer(
@@ -134,3 +147,89 @@ class HostReservationSerializer(
             host_reservation.excluded_ipv6_prefixes.set(excluded_ipv6_prefixes)
 
         return host_reservation
+
+
+# +
+# Host reservation rows for the bulk upsert endpoint. Related objects are
+# given by their IDs and resolved for the whole batch at once, so validating
+# a row does not touch the database.
+# -
+class HostReservationUpsertSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HostReservation
+
+        fields = (
+            "name",
+            "description",
+            "comments",
+            "dhcp_server",
+            "subnet",
+            "duid",
+            "hw_address",
+            "circuit_id",
+            "client_id",
+            "flex_id",
+            "next_server",
+            "server_hostname",
+            "boot_file_name",
+            "hostname",
+            "ipv4_address",
+            "ipv6_addresses",
+            "ipv6_prefixes",
+            "excluded_ipv6_prefixes",
+            "client_classes",
+        )
+
+        extra_kwargs = {
+            "name": {
+                "required": False,
+                "validators": [],
+            },
+        }
+
+    dhcp_server = serializers.IntegerField(required=False, allow_null=True)
+    subnet = serializers.IntegerField(required=False, allow_null=True)
+    hw_address = serializers.IntegerField(required=False, allow_null=True)
+    ipv4_address = serializers.IntegerField(required=False, allow_null=True)
+    ipv6_addresses = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+    )
+    ipv6_prefixes = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+    )
+    excluded_ipv6_prefixes = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+    )
+    client_classes = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+    )
+
+    def validate(self, data):
+        if (data.get("dhcp_server") is None) == (data.get("subnet") is None):
+            raise serializers.ValidationError(
+                _("Either DHCP Server or Subnet is required, not both")
+            )
+
+        identifier = self.context["identifier"]
+        if data.get(identifier) in (None, ""):
+            raise serializers.ValidationError(
+                {identifier: _("The identifier is required for upserts.")}
+            )
+
+        return data
+
+
+class HostReservationBulkUpsertSerializer(serializers.Serializer):
+    identifier = serializers.ChoiceField(
+        choices=HOST_RESERVATION_IDENTIFIERS,
+        help_text=_("Identifier used to match existing host reservations"),
+    )
+    host_reservations = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        help_text=_("Host reservations to create or update"),
+    )
@@ -72,6 +72,13 @@ class OptionSerializer(
             "data",
         )
 
+        prefetch_plan = {
+            "display": ("definition",),
+            "name": ("definition",),
+            "space": ("definition",),
+            "code": ("definition",),
+        }
+
     url = serializers.HyperlinkedIdentityField(
         view_name="plugins-api:netbox_dhcp-api:option-detail"
     )
@@ -100,6 +107,19 @@ class OptionSerializer(
         read_only=True,
     )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.assigned_object_serializers = {}
+
+    def get_assigned_object_serializer(self, model):
+        if model not in self.assigned_object_serializers:
+            self.assigned_object_serializers[model] = get_serializer_for_model(model)(
+                nested=True, context={"request": self.context["request"]}
+            )
+
+        return self.assigned_object_serializers[model]
+
     def get_name(self, instance):
         return instance.definition.name
 
@@ -111,11 +131,12 @@ class OptionSerializer(
 
     @extend_schema_field(serializers.JSONField(allow_null=True))
     def get_assigned_object(self, instance):
-        if instance.assigned_object is None:
+        if (assigned_object := instance.assigned_object) is None:
             return None
-        serializer = get_serializer_for_model(instance.assigned_object)
-        context = {"request": self.context["request"]}
-        return serializer(instance.assigned_object, nested=True, context=context).data
+
+        return self.get_assigned_object_serializer(
+            assigned_object._meta.model
+        ).to_representation(assigned_object)
 
     def get_always_send(self, instance):
         if instance.send_option is not None:
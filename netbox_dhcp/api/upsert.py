@@ -0,0 +1,357 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import PermissionDenied
+
+from core.events import OBJECT_CREATED, OBJECT_UPDATED
+from dcim.models import MACAddress
+from extras.events import enqueue_event
+from ipam.models import IPAddress, Prefix
+from netbox.context import events_queue
+from netbox.search.backends import search_backend
+
+from netbox_dhcp.api.serializers import HostReservationUpsertSerializer
+from netbox_dhcp.models import ClientClass, DHCPServer, HostReservation, Subnet
+from netbox_dhcp.utilities import log_object_changes
+
+__all__ = ("HostReservationUpsert",)
+
+
+FOREIGN_KEY_FIELDS = {
+    "dhcp_server": DHCPServer,
+    "subnet": Subnet,
+    "hw_address": MACAddress,
+    "ipv4_address": IPAddress,
+}
+MANY_TO_MANY_FIELDS = {
+    "ipv6_addresses": IPAddress,
+    "ipv6_prefixes": Prefix,
+    "excluded_ipv6_prefixes": Prefix,
+    "client_classes": ClientClass,
+}
+
+
+def get_related_pks(values, field_name):
+    if field_name in MANY_TO_MANY_FIELDS:
+        return values.get(field_name) or []
+
+    return [] if values.get(field_name) is None else [values[field_name]]
+
+
+def get_field_values(values):
+    return {
+        f"{field_name}_id" if field_name in FOREIGN_KEY_FIELDS else field_name: value
+        for field_name, value in values.items()
+        if field_name not in MANY_TO_MANY_FIELDS
+    }
+
+
+class HostReservationUpsert:
+    def __init__(self, identifier, rows, request):
+        self.identifier = identifier
+        self.rows = rows
+        self.request = request
+        self.results = [{"index": index} for index in range(len(rows))]
+
+    @property
+    def identifier_lookup(self):
+        if self.identifier in FOREIGN_KEY_FIELDS:
+            return f"{self.identifier}_id"
+
+        return self.identifier
+
+    def get_key(self, values):
+        return (
+            values.get("dhcp_server"),
+            values.get("subnet"),
+            values[self.identifier],
+        )
+
+    def set_error(self, data, index, errors):
+        self.results[index].update(status="error", errors=errors)
+        del data[index]
+
+    #
+    # Validation
+    #
+    def validate_rows(self):
+        data = {}
+
+        for index, row in enumerate(self.rows):
+            serializer = HostReservationUpsertSerializer(
+                data=row, context={"identifier": self.identifier}
+            )
+            if serializer.is_valid():
+                data[index] = serializer.validated_data
+            else:
+                self.results[index].update(status="error", errors=serializer.errors)
+
+        return data
+
+    def validate_related_objects(self, data):
+        pks = defaultdict(set)
+        for values in data.values():
+            for field_name, model in (FOREIGN_KEY_FIELDS | MANY_TO_MANY_FIELDS).items():
+                pks[model].update(get_related_pks(values, field_name))
+
+        permitted = {
+            model: set(
+                model.objects.restrict(self.request.user, "view")
+                .filter(pk__in=model_pks)
+                .values_list("pk", flat=True)
+            )
+            for model, model_pks in pks.items()
+            if model_pks
+        }
+
+        for index, values in list(data.items()):
+            errors = {}
+            for field_name, model in (FOREIGN_KEY_FIELDS | MANY_TO_MANY_FIELDS).items():
+                if missing := [
+                    pk
+                    for pk in get_related_pks(values, field_name)
+                    if pk not in permitted[model]
+                ]:
+                    errors[field_name] = [
+                        _("Related objects not found: {pks}").format(
+                            pks=", ".join(str(pk) for pk in missing)
+                        )
+                    ]
+
+            if errors:
+                self.set_error(data, index, errors)
+
+    def match_rows(self, data):
+        rows = {}
+        for index, values in list(data.items()):
+            if (key := self.get_key(values)) in rows:
+                self.set_error(
+                    data,
+                    index,
+                    {self.identifier: [_("Duplicate identifier in this request.")]},
+                )
+            else:
+                rows[key] = index
+
+        matches = defaultdict(list)
+        for host_reservation in HostReservation.objects.filter(
+            Q(dhcp_server__in={key[0] for key in rows if key[0] is not None})
+            | Q(subnet__in={key[1] for key in rows if key[1] is not None}),
+            **{f"{self.identifier_lookup}__in": {key[2] for key in rows}},
+        ).prefetch_related("tags", *MANY_TO_MANY_FIELDS):
+            matches[
+                (
+                    host_reservation.dhcp_server_id,
+                    host_reservation.subnet_id,
+                    getattr(host_reservation, self.identifier_lookup),
+                )
+            ].append(host_reservation)
+
+        changeable = set(
+            HostReservation.objects.restrict(self.request.user, "change")
+            .filter(
+                pk__in=[
+                    host_reservation.pk
+                    for host_reservations in matches.values()
+                    for host_reservation in host_reservations
+                ]
+            )
+            .values_list("pk", flat=True)
+        )
+        can_add = self.request.user.has_perm("netbox_dhcp.add_hostreservation")
+
+        creates, updates = {}, {}
+        for key, index in rows.items():
+            host_reservations = matches.get(key, [])
+
+            if len(host_reservations) > 1:
+                self.set_error(
+                    data,
+                    index,
+                    {
+                        self.identifier: [
+                            _("The identifier matches multiple host reservations.")
+                        ]
+                    },
+                )
+            elif host_reservations and host_reservations[0].pk not in changeable:
+                self.set_error(
+                    data,
+                    index,
+                    {"non_field_errors": [_("Permission denied.")]},
+                )
+            elif host_reservations:
+                updates[index] = host_reservations[0]
+            elif not can_add:
+                self.set_error(
+                    data,
+                    index,
+                    {"non_field_errors": [_("Permission denied.")]},
+                )
+            elif not data[index].get("name"):
+                self.set_error(
+                    data,
+                    index,
+                    {"name": [_("This field is required.")]},
+                )
+            else:
+                creates[index] = data[index]
+
+        return creates, updates
+
+    def validate_names(self, data, updates):
+        names = {}
+        for index, values in list(data.items()):
+            if (name := values.get("name")) is None:
+                continue
+            if name in names:
+                self.set_error(
+                    data,
+                    index,
+                    {"name": [_("Duplicate name in this request.")]},
+                )
+            else:
+                names[name] = index
+
+        for name, pk in HostReservation.objects.filter(name__in=names).values_list(
+            "name", "pk"
+        ):
+            index = names[name]
+            if index not in updates or updates[index].pk != pk:
+                self.set_error(
+                    data,
+                    index,
+                    {"name": [_("A host reservation with this name already exists.")]},
+                )
+
+    #
+    # Writes
+    #
+    def set_many_to_many(self, field_name, values):
+        field = HostReservation._meta.get_field(field_name)
+        through = field.remote_field.through
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+
+        existing = defaultdict(set)
+        stale = []
+        for pk, source_pk, target_pk in through.objects.filter(
+            **{f"{source}__in": list(values)}
+        ).values_list("pk", source, target):
+            if target_pk in values[source_pk]:
+                existing[source_pk].add(target_pk)
+            else:
+                stale.append(pk)
+
+        through.objects.filter(pk__in=stale).delete()
+        through.objects.bulk_create(
+            through(**{f"{source}_id": source_pk, f"{target}_id": target_pk})
+            for source_pk, target_pks in values.items()
+            for target_pk in target_pks - existing[source_pk]
+        )
+
+    # +
+    # bulk_create() and bulk_update() do not send the signals NetBox uses for
+    # change logging, search caching and event rules, so all three are done
+    # here for the written objects.
+    # -
+    def log_changes(self, pks, updates):
+        host_reservations = list(
+            HostReservation.objects.filter(pk__in=pks).prefetch_related(
+                "tags", *MANY_TO_MANY_FIELDS
+            )
+        )
+        snapshots = {
+            host_reservation.pk: host_reservation._prechange_snapshot
+            for host_reservation in updates.values()
+        }
+
+        log_object_changes(
+            host_reservations,
+            self.request.user,
+            self.request.id,
+            snapshots=snapshots,
+        )
+        search_backend.cache(host_reservations, remove_existing=True)
+
+        queue = events_queue.get()
+        for host_reservation in host_reservations:
+            enqueue_event(
+                queue,
+                host_reservation,
+                self.request,
+                OBJECT_UPDATED if host_reservation.pk in snapshots else OBJECT_CREATED,
+            )
+        events_queue.set(queue)
+
+    # +
+    # All rows that passed validation are written in one transaction: one
+    # bulk_create(), one bulk_update() and a fixed number of queries per
+    # many-to-many relation, regardless of the number of rows. A row violating
+    # an object permission constraint rolls back the whole batch.
+    # -
+    @transaction.atomic
+    def save(self, data, creates, updates):
+        for host_reservation in updates.values():
+            host_reservation.snapshot()
+
+        created = {
+            index: HostReservation(**get_field_values(values))
+            for index, values in creates.items()
+        }
+        HostReservation.objects.bulk_create(created.values())
+
+        update_fields = {"last_updated"}
+        now = timezone.now()
+        for index, host_reservation in updates.items():
+            for field_name, value in get_field_values(data[index]).items():
+                setattr(host_reservation, field_name, value)
+                update_fields.add(field_name)
+            host_reservation.last_updated = now
+        HostReservation.objects.bulk_update(updates.values(), update_fields)
+
+        for action, host_reservations in (
+            ("add", created.values()),
+            ("change", updates.values()),
+        ):
+            pks = [host_reservation.pk for host_reservation in host_reservations]
+            if HostReservation.objects.restrict(self.request.user, action).filter(
+                pk__in=pks
+            ).count() != len(pks):
+                raise PermissionDenied(
+                    _("Objects outside the permitted set cannot be saved.")
+                )
+
+        host_reservations = created | updates
+        for field_name in MANY_TO_MANY_FIELDS:
+            if values := {
+                host_reservation.pk: set(data[index][field_name])
+                for index, host_reservation in host_reservations.items()
+                if field_name in data[index]
+            }:
+                self.set_many_to_many(field_name, values)
+
+        pks = [host_reservation.pk for host_reservation in host_reservations.values()]
+        self.log_changes(pks, updates)
+        DHCPServer.objects.bump_config_generation(HostReservation, pks)
+
+        for index, host_reservation in host_reservations.items():
+            self.results[index].update(
+                status="created" if index in created else "updated",
+                id=host_reservation.pk,
+            )
+
+    def run(self):
+        data = self.validate_rows()
+        self.validate_related_objects(data)
+        creates, updates = self.match_rows(data)
+        self.validate_names(data, updates)
+
+        creates = {index: values for index, values in creates.items() if index in data}
+        updates = {index: obj for index, obj in updates.items() if index in data}
+        if creates or updates:
+            self.save(data, creates, updates)
+
+        return self.results
@@ -1,12 +1,28 @@
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags
+from django.utils.translation import gettext as _
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer, Serializer
 from rest_framework.routers import APIRootView
 
+from ipam.choices import IPAddressFamilyChoices
+
 from netbox.api.viewsets import NetBoxModelViewSet
 
+from netbox_dhcp.api.export import HostReservationExporter
+from netbox_dhcp.api.pagination import KeysetPagination
+from netbox_dhcp.api.permissions import ConfigPermissions, UpsertPermissions
+from netbox_dhcp.api.upsert import HostReservationUpsert
 from netbox_dhcp.api.serializers import (
     ClientClassSerializer,
     DHCPClusterSerializer,
     DHCPServerSerializer,
     DHCPServerInterfaceSerializer,
+    HostReservationBulkUpsertSerializer,
     HostReservationSerializer,
     OptionSerializer,
     OptionDefinitionSerializer,
@@ -28,6 +44,8 @@ from netbox_dhcp.filtersets import (
     SharedNetworkFilterSet,
     SubnetFilterSet,
 )
+from netbox_dhcp.kea import KeaConfigDelta, KeaConfigRenderer, KeaOptionResolver
+from netbox_dhcp.utilities import allocate_subnet_ids, assign_pool_ids
 from netbox_dhcp.models import (
     ClientClass,
     DHCPCluster,
@@ -48,67 +66,303 @@ class NetBoxDHCPRootView(APIRootView):
         return "NetBoxDHCP"
 
 
-class ClientClassViewSet(NetBoxModelViewSet):
+# +
+# Collect the lookups declared in the prefetch_plan of a serializer's Meta class
+# for the requested fields, descending into nested serializers. NetBox itself
+# only prefetches the first level of lists of nested objects.
+# -
+def get_prefetch_lookups(serializer_class, fields=None, prefix=""):
+    if fields is None:
+        fields = serializer_class.Meta.fields
+    prefetch_plan = getattr(serializer_class.Meta, "prefetch_plan", {})
+
+    lookups = []
+    for field_name in fields:
+        lookups.extend(
+            f"{prefix}{lookup}" for lookup in prefetch_plan.get(field_name, ())
+        )
+
+        field = serializer_class._declared_fields.get(field_name)
+        if isinstance(field, ListSerializer):
+            field = field.child
+        if isinstance(field, Serializer):
+            lookups.extend(
+                get_prefetch_lookups(
+                    type(field),
+                    (
+                        getattr(field.Meta, "brief_fields", None)
+                        if getattr(field, "nested", False)
+                        else None
+                    ),
+                    f"{prefix}{field_name}__",
+                )
+            )
+
+    return lookups
+
+
+class PrefetchPlanMixin:
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if lookups := get_prefetch_lookups(
+            self.get_serializer_class(), self.requested_fields
+        ):
+            queryset = queryset.prefetch_related(*dict.fromkeys(lookups))
+
+        return queryset
+
+
+class NetBoxDHCPModelViewSet(PrefetchPlanMixin, NetBoxModelViewSet):
+    pagination_class = KeysetPagination
+    keyset_ordering = ("pk",)
+
+
+class EffectiveOptionsMixin:
+    @action(detail=True, methods=["get"], url_path="effective-options")
+    def effective_options(self, request, pk=None):
+        obj = self.get_object()
+        options = KeaOptionResolver.for_object(obj).resolve_object(obj)
+
+        permitted = set(
+            Option.objects.restrict(request.user, "view")
+            .filter(pk__in=[option.pk for option in options])
+            .values_list("pk", flat=True)
+        )
+        serializer = OptionSerializer(
+            [option for option in options if option.pk in permitted],
+            many=True,
+            context=self.get_serializer_context(),
+        )
+
+        return Response(serializer.data)
+
+
+class ClientClassViewSet(EffectiveOptionsMixin, NetBoxDHCPModelViewSet):
     queryset = ClientClass.objects.all()
     serializer_class = ClientClassSerializer
     filterset_class = ClientClassFilterSet
 
 
-class DHCPClusterViewSet(NetBoxModelViewSet):
+class DHCPClusterViewSet(NetBoxDHCPModelViewSet):
     queryset = DHCPCluster.objects.all()
     serializer_class = DHCPClusterSerializer
     filterset_class = DHCPClusterFilterSet
 
 
-class DHCPServerViewSet(NetBoxModelViewSet):
+class DHCPServerViewSet(EffectiveOptionsMixin, NetBoxDHCPModelViewSet):
     queryset = DHCPServer.objects.all()
     serializer_class = DHCPServerSerializer
     filterset_class = DHCPServerFilterSet
 
+    def get_family(self, request):
+        try:
+            family = int(
+                request.query_params.get("family", IPAddressFamilyChoices.FAMILY_4)
+            )
+        except ValueError:
+            family = None
+
+        if family not in (
+            IPAddressFamilyChoices.FAMILY_4,
+            IPAddressFamilyChoices.FAMILY_6,
+        ):
+            raise ValidationError({"family": _("Family must be 4 or 6.")})
+
+        return family
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="config",
+        permission_classes=[ConfigPermissions],
+    )
+    def config(self, request, pk=None):
+        dhcp_server = self.get_object()
+        family = self.get_family(request)
+
+        etag = f'"{dhcp_server.pk}-{dhcp_server.config_generation}-{family}"'
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            response = HttpResponseNotModified()
+        else:
+            response = StreamingHttpResponse(
+                KeaConfigRenderer(dhcp_server, family=family).stream(),
+                content_type="application/json",
+            )
 
-class DHCPServerInterfaceViewSet(NetBoxModelViewSet):
-    queryset = DHCPServerInterface.objects.all()
+        response["ETag"] = etag
+        return response
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="config/changes",
+        permission_classes=[ConfigPermissions],
+    )
+    def config_changes(self, request, pk=None):
+        since = request.query_params.get("since")
+        since_time = request.query_params.get("since_time")
+
+        if since is not None:
+            try:
+                since = int(since)
+            except ValueError:
+                raise ValidationError(
+                    {"since": _("The cursor must be an object change ID.")}
+                )
+        if since_time is not None:
+            if (since_time := parse_datetime(since_time)) is None:
+                raise ValidationError(
+                    {"since_time": _("The timestamp must be an ISO 8601 date/time.")}
+                )
+        if since is None and since_time is None:
+            raise ValidationError(
+                {"since": _("Either a cursor or a timestamp is required.")}
+            )
+
+        delta = KeaConfigDelta(
+            self.get_object(),
+            family=self.get_family(request),
+            since=since,
+            since_time=since_time,
+        )
+
+        return Response(delta.render())
+
+
+class DHCPServerInterfaceViewSet(NetBoxDHCPModelViewSet):
+    queryset = DHCPServerInterface.objects.with_names()
     serializer_class = DHCPServerInterfaceSerializer
     filterset_class = DHCPServerInterfaceFilterSet
 
 
-class HostReservationViewSet(NetBoxModelViewSet):
+class HostReservationViewSet(EffectiveOptionsMixin, NetBoxDHCPModelViewSet):
     queryset = HostReservation.objects.all()
     serializer_class = HostReservationSerializer
     filterset_class = HostReservationFilterSet
+    keyset_ordering = ("name", "pk")
+
+    @action(detail=False, methods=["get"], url_path="export.ndjson")
+    def export_ndjson(self, request):
+        queryset = self.filter_queryset(
+            HostReservation.objects.restrict(request.user, "view")
+        )
+
+        return StreamingHttpResponse(
+            HostReservationExporter(queryset).stream(),
+            content_type="application/x-ndjson",
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="upsert",
+        permission_classes=[UpsertPermissions],
+    )
+    def upsert(self, request):
+        serializer = HostReservationBulkUpsertSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        upsert = HostReservationUpsert(
+            serializer.validated_data["identifier"],
+            serializer.validated_data["host_reservations"],
+            request,
+        )
 
+        return Response(upsert.run())
 
-class OptionViewSet(NetBoxModelViewSet):
-    queryset = Option.objects.all()
+
+class OptionViewSet(NetBoxDHCPModelViewSet):
+    queryset = Option.objects.select_related("definition", "assigned_object_type")
     serializer_class = OptionSerializer
     filterset_class = OptionFilterSet
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # +
+        # Prefetching the generic relation fetches the assigned objects with
+        # one query per content type instead of one query per option.
+        # -
+        if not self.brief:
+            queryset = queryset.prefetch_related(
+                GenericPrefetch(
+                    "assigned_object",
+                    [
+                        ClientClass.objects.all(),
+                        DHCPServer.objects.all(),
+                        HostReservation.objects.select_related("hw_address"),
+                        PDPool.objects.all(),
+                        Pool.objects.all(),
+                        SharedNetwork.objects.all(),
+                        Subnet.objects.all(),
+                    ],
+                )
+            )
+
+        return queryset
 
-class OptionDefinitionViewSet(NetBoxModelViewSet):
+
+class OptionDefinitionViewSet(NetBoxDHCPModelViewSet):
     queryset = OptionDefinition.objects.all()
     serializer_class = OptionDefinitionSerializer
     filterset_class = OptionDefinitionFilterSet
 
 
-class PDPoolViewSet(NetBoxModelViewSet):
-    queryset = PDPool.objects.all()
+class PDPoolViewSet(EffectiveOptionsMixin, NetBoxDHCPModelViewSet):
+    queryset = PDPool.objects.with_prefix_display()
     serializer_class = PDPoolSerializer
     filterset_class = PDPoolFilterSet
 
+    def perform_create(self, serializer):
+        if isinstance(serializer, ListSerializer):
+            items = [
+                item
+                for item in serializer.validated_data
+                if item.get("pool_id") is None
+            ]
+            assign_pool_ids(items, [item["subnet"].pk for item in items])
+
+        super().perform_create(serializer)
 
-class PoolViewSet(NetBoxModelViewSet):
+
+class PoolViewSet(EffectiveOptionsMixin, NetBoxDHCPModelViewSet):
     queryset = Pool.objects.all()
     serializer_class = PoolSerializer
     filterset_class = PoolFilterSet
 
+    def perform_create(self, serializer):
+        if isinstance(serializer, ListSerializer):
+            items = [
+                item
+                for item in serializer.validated_data
+                if item.get("pool_id") is None
+            ]
+            assign_pool_ids(items, [item["subnet"].pk for item in items])
+
+        super().perform_create(serializer)
+
 
-class SharedNetworkViewSet(NetBoxModelViewSet):
-    queryset = SharedNetwork.objects.all()
+class SharedNetworkViewSet(EffectiveOptionsMixin, NetBoxDHCPModelViewSet):
+    queryset = SharedNetwork.objects.with_prefix_display()
     serializer_class = SharedNetworkSerializer
     filterset_class = SharedNetworkFilterSet
 
 
-class SubnetViewSet(NetBoxModelViewSet):
-    queryset = Subnet.objects.all()
+class SubnetViewSet(EffectiveOptionsMixin, NetBoxDHCPModelViewSet):
+    queryset = Subnet.objects.with_prefix_display()
     serializer_class = SubnetSerializer
     filterset_class = SubnetFilterSet
+
+    def perform_create(self, serializer):
+        if isinstance(serializer, ListSerializer):
+            items = [
+                item
+                for item in serializer.validated_data
+                if item.get("subnet_id") is None
+            ]
+            for item, subnet_id in zip(items, allocate_subnet_ids(len(items))):
+                item["subnet_id"] = subnet_id
+
+        super().perform_create(serializer)
@@ -1,10 +1,9 @@
-from django.db.models import Q
-
 from netbox.filtersets import PrimaryModelFilterSet
 from utilities.filtersets import register_filterset
 
 from ..models import ClientClass
 from .mixins import (
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     BOOTPFilterMixin,
     LifetimeFilterMixin,
@@ -16,6 +15,7 @@ __all__ = ("ClientClassFilterSet",)
 
 @register_filterset
 class ClientClassFilterSet(
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     BOOTPFilterMixin,
     LifetimeFilterMixin,
@@ -37,13 +37,4 @@ class ClientClassFilterSet(
             *LifetimeFilterMixin.FILTER_FIELDS,
         )
 
-    def search(self, queryset, name, value):
-        if not value.strip():
-            return queryset
-        qs_filter = (
-            Q(name__icontains=value)
-            | Q(test__icontains=value)
-            | Q(template_test__icontains=value)
-            | Q(boot_file_name__icontains=value)
-        )
-        return queryset.filter(qs_filter)
+    SEARCH_FIELDS = ["name", "test", "template_test", "boot_file_name"]
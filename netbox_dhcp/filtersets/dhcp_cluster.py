@@ -1,5 +1,4 @@
 import django_filters
-from django.db.models import Q
 
 from netbox.filtersets import PrimaryModelFilterSet
 from utilities.filtersets import register_filterset
@@ -7,12 +6,14 @@ from utilities.filtersets import register_filterset
 from netbox_dhcp.models import DHCPCluster
 from netbox_dhcp.choices import DHCPClusterStatusChoices
 
+from .mixins import SearchFilterMixin
+
 
 __all__ = ("DHCPClusterFilterSet",)
 
 
 @register_filterset
-class DHCPClusterFilterSet(PrimaryModelFilterSet):
+class DHCPClusterFilterSet(SearchFilterMixin, PrimaryModelFilterSet):
     class Meta:
         model = DHCPCluster
 
@@ -23,12 +24,8 @@ class DHCPClusterFilterSet(PrimaryModelFilterSet):
             "status",
         )
 
+    SEARCH_FIELDS = ["name"]
+
     status = django_filters.MultipleChoiceFilter(
         choices=DHCPClusterStatusChoices,
     )
-
-    def search(self, queryset, name, value):
-        if not value.strip():
-            return queryset
-        qs_filter = Q(name__icontains=value)
-        return queryset.filter(qs_filter)
@@ -1,5 +1,4 @@
 import django_filters
-from django.db.models import Q
 
 from netbox.filtersets import NetBoxModelFilterSet, PrimaryModelFilterSet
 from utilities.filtersets import register_filterset
@@ -14,6 +13,7 @@ from netbox_dhcp.choices import (
     HostReservationIdentifierChoices,
 )
 from .mixins import (
+    SearchFilterMixin,
     BOOTPFilterMixin,
     LifetimeFilterMixin,
     LeaseFilterMixin,
@@ -55,6 +55,7 @@ class DHCPServerInterfaceFilterSet(NetBoxModelFilterSet):
 
 @register_filterset
 class DHCPServerFilterSet(
+    SearchFilterMixin,
     BOOTPFilterMixin,
     LifetimeFilterMixin,
     LeaseFilterMixin,
@@ -82,6 +83,7 @@ class DHCPServerFilterSet(
             "virtual_machine",
             "virtual_machine_interfaces",
             "decline_probation_period",
+            "config_generation",
             *BOOTPFilterMixin.FILTER_FIELDS,
             *LifetimeFilterMixin.FILTER_FIELDS,
             *LeaseFilterMixin.FILTER_FIELDS,
@@ -91,6 +93,13 @@ class DHCPServerFilterSet(
             *ChildHostReservationFilterMixin.FILTER_FIELDS,
         )
 
+    SEARCH_FIELDS = ["name"]
+    SEARCH_RELATIONS = {
+        "dhcp_cluster": (DHCPCluster, "name"),
+        "device": (Device, "name"),
+        "virtual_machine": (VirtualMachine, "name"),
+    }
+
     status = django_filters.MultipleChoiceFilter(
         choices=DHCPServerStatusChoices,
     )
@@ -175,14 +184,3 @@ class DHCPServerFilterSet(
             return queryset
 
         return queryset.filter(relay_supplied_options__overlap=value)
-
-    def search(self, queryset, name, value):
-        if not value.strip():
-            return queryset
-        qs_filter = (
-            Q(name__icontains=value)
-            | Q(dhcp_cluster__name__icontains=value)
-            | Q(device__name__icontains=value)
-            | Q(virtual_machine__name__icontains=value)
-        )
-        return queryset.filter(qs_filter)
@@ -1,5 +1,4 @@
 import django_filters
-from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from netbox.filtersets import PrimaryModelFilterSet
@@ -11,6 +10,7 @@ from ipam.choices import IPAddressFamilyChoices
 from netbox_dhcp.models import HostReservation
 
 from .mixins import (
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     SubnetFilterMixin,
     ClientClassFilterMixin,
@@ -22,6 +22,7 @@ __all__ = ("HostReservationFilterSet",)
 
 @register_filterset
 class HostReservationFilterSet(
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     SubnetFilterMixin,
     ClientClassFilterMixin,
@@ -44,6 +45,8 @@ class HostReservationFilterSet(
             *BOOTPFilterMixin.FILTER_FIELDS,
         )
 
+    SEARCH_FIELDS = ["name"]
+
     hw_address_id = django_filters.ModelMultipleChoiceFilter(
         queryset=MACAddress.objects.all(),
         field_name="hw_address",
@@ -96,9 +99,3 @@ class HostReservationFilterSet(
         distinct=True,
         label=_("Excluded IPv6 Prefix"),
     )
-
-    def search(self, queryset, name, value):
-        if not value.strip():
-            return queryset
-        qs_filter = Q(name__icontains=value)
-        return queryset.filter(qs_filter)
@@ -1,4 +1,6 @@
 import django_filters
+import netaddr
+from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from netbox.filtersets import NetBoxModelFilterSet
@@ -22,6 +24,7 @@ from netbox_dhcp.choices import (
 )
 
 __all__ = (
+    "SearchFilterMixin",
     "BOOTPFilterMixin",
     "OfferLifetimeFilterMixin",
     "LeaseFilterMixin",
@@ -41,6 +44,38 @@ __all__ = (
 )
 
 
+class SearchFilterMixin(NetBoxModelFilterSet):
+    SEARCH_FIELDS = []
+    SEARCH_RELATIONS = {}
+
+    # +
+    # The fields of the model itself are matched with icontains, which is
+    # backed by their trigram indexes. Related objects are matched by an ID
+    # subquery on their own (trigram indexed) table instead of joining the
+    # related table, so every condition can be served by an index and the
+    # planner can combine them with a bitmap OR in a single query.
+    # -
+    def get_search_filter(self, value):
+        qs_filter = Q()
+        for field_name in self.SEARCH_FIELDS:
+            qs_filter |= Q(**{f"{field_name}__icontains": value})
+        for field_name, (model, lookup) in self.SEARCH_RELATIONS.items():
+            qs_filter |= Q(
+                **{
+                    f"{field_name}__in": model.objects.filter(
+                        **{f"{lookup}__icontains": value}
+                    ).values("pk")
+                }
+            )
+
+        return qs_filter
+
+    def search(self, queryset, name, value):
+        if not value.strip():
+            return queryset
+        return queryset.filter(self.get_search_filter(value))
+
+
 class BOOTPFilterMixin(NetBoxModelFilterSet):
     FILTER_FIELDS = [
         "next_server",
@@ -181,6 +216,41 @@ class PrefixFilterMixin(NetBoxModelFilterSet):
         field_name="prefix__prefix",
         label=_("Prefix"),
     )
+    within = django_filters.CharFilter(
+        method="filter_prefix",
+        label=_("Within prefix"),
+    )
+    within_include = django_filters.CharFilter(
+        method="filter_prefix",
+        label=_("Within and including prefix"),
+    )
+    contains = django_filters.CharFilter(
+        method="filter_prefix",
+        label=_("Prefixes which contain this prefix or IP"),
+    )
+
+    # +
+    # The containment filters map to the PostgreSQL inet operators <<, <<= and
+    # >>=, which can use the GiST index on the IPAM prefix column.
+    # -
+    PREFIX_LOOKUPS = {
+        "within": "net_contained",
+        "within_include": "net_contained_or_equal",
+        "contains": "net_contains_or_equals",
+    }
+
+    def filter_prefix(self, queryset, name, value):
+        if not (value := value.strip()):
+            return queryset
+
+        try:
+            query = str(netaddr.IPNetwork(value).cidr)
+        except (netaddr.AddrFormatError, ValueError):
+            return queryset.none()
+
+        return queryset.filter(
+            **{f"prefix__prefix__{self.PREFIX_LOOKUPS[name]}": query}
+        )
 
 
 class DHCPServerFilterMixin(NetBoxModelFilterSet):
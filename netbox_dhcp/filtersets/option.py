@@ -1,5 +1,4 @@
 import django_filters
-from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from netbox.filtersets import PrimaryModelFilterSet
@@ -8,7 +7,7 @@ from ipam.choices import IPAddressFamilyChoices
 
 from netbox_dhcp.models import Option, OptionDefinition
 from netbox_dhcp.choices import OptionSpaceChoices
-from .mixins import ClientClassFilterMixin
+from .mixins import ClientClassFilterMixin, SearchFilterMixin
 
 
 __all__ = ("OptionFilterSet",)
@@ -16,6 +15,7 @@ __all__ = ("OptionFilterSet",)
 
 @register_filterset
 class OptionFilterSet(
+    SearchFilterMixin,
     ClientClassFilterMixin,
     PrimaryModelFilterSet,
 ):
@@ -32,6 +32,11 @@ class OptionFilterSet(
             *ClientClassFilterMixin.FILTER_FIELDS,
         )
 
+    SEARCH_FIELDS = ["data"]
+    SEARCH_RELATIONS = {
+        "definition": (OptionDefinition, "name"),
+    }
+
     family = django_filters.MultipleChoiceFilter(
         label=_("Address Family"),
         field_name="definition__family",
@@ -61,9 +66,3 @@ class OptionFilterSet(
         label=_("Option Definition"),
         field_name="definition__name",
     )
-
-    def search(self, queryset, name, value):
-        if not value.strip():
-            return queryset
-        qs_filter = Q(definition__name__icontains=value) | Q(data__icontains=value)
-        return queryset.filter(qs_filter)
@@ -11,6 +11,7 @@ from netbox_dhcp.models import OptionDefinition, ClientClass
 from netbox_dhcp.choices import OptionSpaceChoices, OptionTypeChoices
 
 from .mixins import (
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     ClientClassFilterMixin,
 )
@@ -20,6 +21,7 @@ __all__ = ("OptionDefinitionFilterSet",)
 
 @register_filterset
 class OptionDefinitionFilterSet(
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     ClientClassFilterMixin,
     PrimaryModelFilterSet,
@@ -37,6 +39,8 @@ class OptionDefinitionFilterSet(
             "standard",
         )
 
+    SEARCH_FIELDS = ["name", "space"]
+
     family = django_filters.MultipleChoiceFilter(
         label=_("Address Family"),
         choices=IPAddressFamilyChoices,
@@ -74,7 +78,7 @@ class OptionDefinitionFilterSet(
         if not value.strip():
             return queryset
 
-        qs_filter = Q(Q(name__icontains=value) | Q(space__icontains=value))
+        qs_filter = self.get_search_filter(value)
         try:
             value = int(value)
             qs_filter |= Q(code=value)
@@ -1,5 +1,4 @@
 import django_filters
-from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from netbox.filtersets import PrimaryModelFilterSet
@@ -9,6 +8,7 @@ from ipam.models import Prefix
 from netbox_dhcp.models import PDPool
 
 from .mixins import (
+    SearchFilterMixin,
     SubnetFilterMixin,
     PrefixFilterMixin,
     ClientClassFilterMixin,
@@ -20,6 +20,7 @@ __all__ = ("PDPoolFilterSet",)
 
 @register_filterset
 class PDPoolFilterSet(
+    SearchFilterMixin,
     SubnetFilterMixin,
     PrefixFilterMixin,
     ClientClassFilterMixin,
@@ -38,6 +39,8 @@ class PDPoolFilterSet(
             "delegated_length",
         )
 
+    SEARCH_FIELDS = ["name"]
+
     excluded_prefix_id = django_filters.ModelMultipleChoiceFilter(
         queryset=Prefix.objects.all(),
         field_name="excluded_prefix",
@@ -47,9 +50,3 @@ class PDPoolFilterSet(
         field_name="excluded_prefix__prefix",
         label=_("Excluded Prefix"),
     )
-
-    def search(self, queryset, name, value):
-        if not value.strip():
-            return queryset
-        qs_filter = Q(name__icontains=value)
-        return queryset.filter(qs_filter)
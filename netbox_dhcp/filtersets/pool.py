@@ -1,5 +1,4 @@
 import django_filters
-from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from netbox.filtersets import PrimaryModelFilterSet
@@ -10,6 +9,7 @@ from ipam.choices import IPAddressFamilyChoices
 from netbox_dhcp.models import Pool
 
 from .mixins import (
+    SearchFilterMixin,
     SubnetFilterMixin,
     ClientClassFilterMixin,
     EvaluateClientClassFilterMixin,
@@ -21,6 +21,7 @@ __all__ = ("PoolFilterSet",)
 
 @register_filterset
 class PoolFilterSet(
+    SearchFilterMixin,
     SubnetFilterMixin,
     ClientClassFilterMixin,
     EvaluateClientClassFilterMixin,
@@ -40,6 +41,8 @@ class PoolFilterSet(
             *DDNSUpdateFilterMixin.FILTER_FIELDS,
         )
 
+    SEARCH_FIELDS = ["name"]
+
     family = django_filters.MultipleChoiceFilter(
         label=_("Address Family"),
         choices=IPAddressFamilyChoices,
@@ -51,9 +54,3 @@ class PoolFilterSet(
         field_name="ip_range",
         label=_("IP Range ID"),
     )
-
-    def search(self, queryset, name, value):
-        if not value.strip():
-            return queryset
-        qs_filter = Q(name__icontains=value)
-        return queryset.filter(qs_filter)
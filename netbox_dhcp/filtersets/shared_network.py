@@ -1,5 +1,4 @@
 import django_filters
-from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from netbox.filtersets import PrimaryModelFilterSet
@@ -9,6 +8,7 @@ from ipam.choices import IPAddressFamilyChoices
 from netbox_dhcp.models import SharedNetwork
 
 from .mixins import (
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     PrefixFilterMixin,
     ClientClassFilterMixin,
@@ -26,6 +26,7 @@ __all__ = ("SharedNetworkFilterSet",)
 
 @register_filterset
 class SharedNetworkFilterSet(
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     PrefixFilterMixin,
     ClientClassFilterMixin,
@@ -56,15 +57,11 @@ class SharedNetworkFilterSet(
             *ChildSubnetFilterMixin.FILTER_FIELDS,
         )
 
+    SEARCH_FIELDS = ["name", "boot_file_name"]
+
     family = django_filters.MultipleChoiceFilter(
         choices=IPAddressFamilyChoices,
         field_name="prefix__prefix",
         lookup_expr="family",
         label=_("Address Family"),
     )
-
-    def search(self, queryset, name, value):
-        if not value.strip():
-            return queryset
-        qs_filter = Q(name__icontains=value) | Q(boot_file_name__icontains=value)
-        return queryset.filter(qs_filter)
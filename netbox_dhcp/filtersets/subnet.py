@@ -1,5 +1,4 @@
 import django_filters
-from django.db.models import Q
 from django.utils.translation import gettext as _
 
 from netbox.filtersets import PrimaryModelFilterSet
@@ -9,6 +8,7 @@ from ipam.choices import IPAddressFamilyChoices
 from netbox_dhcp.models import Subnet
 
 from .mixins import (
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     SharedNetworkFilterMixin,
     PrefixFilterMixin,
@@ -29,6 +29,7 @@ __all__ = ("SubnetFilterSet",)
 
 @register_filterset
 class SubnetFilterSet(
+    SearchFilterMixin,
     DHCPServerFilterMixin,
     SharedNetworkFilterMixin,
     PrefixFilterMixin,
@@ -61,15 +62,11 @@ class SubnetFilterSet(
             *NetworkFilterMixin.FILTER_FIELDS,
         )
 
+    SEARCH_FIELDS = ["name", "boot_file_name"]
+
     family = django_filters.MultipleChoiceFilter(
         choices=IPAddressFamilyChoices,
         field_name="prefix__prefix",
         lookup_expr="family",
         label=_("Address Family"),
     )
-
-    def search(self, queryset, name, value):
-        if not value.strip():
-            return queryset
-        qs_filter = Q(name__icontains=value) | Q(boot_file_name__icontains=value)
-        return queryset.filter(qs_filter)
@@ -8,3 +8,4 @@ from .pd_pool import *
 from .pool import *
 from .shared_network import *
 from .subnet import *
+from .bulk_import_job import *
@@ -0,0 +1,51 @@
+from django import forms
+from django.utils.translation import gettext_lazy as _
+
+from utilities.choices import CSVDelimiterChoices, ImportFormatChoices
+
+__all__ = ("BulkImportJobForm",)
+
+
+class BulkImportJobForm(forms.Form):
+    data = forms.CharField(
+        required=False,
+        widget=forms.Textarea(attrs={"class": "font-monospace"}),
+        label=_("Data"),
+        help_text=_("Enter object data in CSV, JSON or YAML format."),
+    )
+    upload_file = forms.FileField(
+        required=False,
+        label=_("Data File"),
+    )
+    format = forms.ChoiceField(
+        choices=ImportFormatChoices,
+        initial=ImportFormatChoices.AUTO,
+        label=_("Format"),
+    )
+    csv_delimiter = forms.ChoiceField(
+        choices=CSVDelimiterChoices,
+        initial=CSVDelimiterChoices.AUTO,
+        label=_("CSV Delimiter"),
+    )
+    chunk_size = forms.IntegerField(
+        min_value=1,
+        max_value=10000,
+        label=_("Chunk Size"),
+        help_text=_("Number of rows validated and written per transaction"),
+    )
+
+    def clean(self):
+        super().clean()
+
+        if upload_file := self.cleaned_data.get("upload_file"):
+            try:
+                self.cleaned_data["data"] = upload_file.read().decode("utf-8-sig")
+            except UnicodeDecodeError:
+                raise forms.ValidationError(
+                    {"upload_file": _("The file must be UTF-8 encoded.")}
+                )
+
+        if not self.cleaned_data.get("data"):
+            raise forms.ValidationError(_("Form data must be provided."))
+
+        return self.cleaned_data
@@ -11,8 +11,6 @@ from utilities.forms.fields import (
     TagFilterField,
     DynamicModelChoiceField,
     DynamicModelMultipleChoiceField,
-    CSVModelChoiceField,
-    CSVModelMultipleChoiceField,
 )
 from utilities.forms.rendering import FieldSet, TabbedGroups
 from utilities.forms import get_field_value
@@ -42,6 +40,8 @@ from .mixins import (
     BOOTPBulkEditFormMixin,
     NetBoxDHCPBulkEditFormMixin,
     NetBoxDHCPFilterFormMixin,
+    LookupCSVModelChoiceField,
+    LookupCSVModelMultipleChoiceField,
 )
 
 
@@ -355,7 +355,7 @@ class HostReservationImportForm(
             "tags",
         )
 
-    hw_address = CSVModelChoiceField(
+    hw_address = LookupCSVModelChoiceField(
         queryset=MACAddress.objects.all(),
         required=False,
         to_field_name="mac_address",
@@ -366,7 +366,7 @@ class HostReservationImportForm(
         label=_("Hardware Address"),
     )
 
-    ipv4_address = CSVModelChoiceField(
+    ipv4_address = LookupCSVModelChoiceField(
         queryset=IPAddress.objects.filter(
             address__family=IPAddressFamilyChoices.FAMILY_4
         ),
@@ -377,7 +377,7 @@ class HostReservationImportForm(
         },
         label=_("IPv4 Address"),
     )
-    ipv6_addresses = CSVModelMultipleChoiceField(
+    ipv6_addresses = LookupCSVModelMultipleChoiceField(
         queryset=IPAddress.objects.filter(
             address__family=IPAddressFamilyChoices.FAMILY_6
         ),
@@ -388,7 +388,7 @@ class HostReservationImportForm(
         },
         label=_("IPv6 Addresses"),
     )
-    ipv6_prefixes = CSVModelMultipleChoiceField(
+    ipv6_prefixes = LookupCSVModelMultipleChoiceField(
         queryset=Prefix.objects.filter(prefix__family=IPAddressFamilyChoices.FAMILY_6),
         required=False,
         to_field_name="prefix",
@@ -397,7 +397,7 @@ class HostReservationImportForm(
         },
         label=_("IPv6 Prefixes"),
     )
-    excluded_ipv6_prefixes = CSVModelMultipleChoiceField(
+    excluded_ipv6_prefixes = LookupCSVModelMultipleChoiceField(
         queryset=Prefix.objects.filter(prefix__family=IPAddressFamilyChoices.FAMILY_6),
         required=False,
         to_field_name="prefix",
@@ -1,4 +1,7 @@
+from collections import defaultdict
+
 from django import forms
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.utils.translation import gettext as _
 
 from utilities.forms.fields import (
@@ -22,6 +25,10 @@ from netbox_dhcp.choices import (
 )
 
 __all__ = (
+    "LookupCSVModelChoiceField",
+    "LookupCSVModelMultipleChoiceField",
+    "get_import_lookups",
+    "get_lookup_import_form",
     "BOOTPImportFormMixin",
     "ClientClassImportFormMixin",
     "EvaluateClientClassImportFormMixin",
@@ -36,6 +43,123 @@ __all__ = (
 )
 
 
+# +
+# Bulk import lookups
+#
+# The values referenced by a model choice field in all records of a bulk
+# import are resolved with a single query per field before the records are
+# validated. The model choice fields below look values up in the resulting
+# map instead of querying the database once per record.
+# -
+class ImportLookup:
+    def __init__(self, field, to_field_name, values, user):
+        self.to_field_name = to_field_name
+        self.model_field = field.queryset.model._meta.get_field(to_field_name)
+        self.objects = defaultdict(list)
+
+        if keys := {self.get_key(value) for value in values} - {None}:
+            for obj in field.queryset.restrict(user, "view").filter(
+                **{f"{to_field_name}__in": keys}
+            ):
+                self.objects[str(getattr(obj, to_field_name))].append(obj)
+
+    def get_key(self, value):
+        try:
+            return str(self.model_field.to_python(value))
+        except (ValidationError, ValueError, TypeError):
+            return None
+
+    def get(self, value):
+        return self.objects.get(self.get_key(value), [])
+
+
+class LookupFieldMixin:
+    lookup = None
+
+    def get_lookup(self):
+        if self.lookup is not None and self.lookup.to_field_name == self.to_field_name:
+            return self.lookup
+
+        return None
+
+    def get_lookup_objects(self, value):
+        if not (objects := self.lookup.get(value)):
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+
+        return objects
+
+
+class LookupCSVModelChoiceField(LookupFieldMixin, CSVModelChoiceField):
+    def to_python(self, value):
+        if value in self.empty_values or self.get_lookup() is None:
+            return super().to_python(value)
+
+        objects = self.get_lookup_objects(value)
+        if len(objects) > 1:
+            raise ValidationError(
+                _(
+                    '"{value}" is not a unique value for this field; multiple '
+                    "objects were found"
+                ).format(value=value)
+            )
+
+        return objects[0]
+
+
+class LookupCSVModelMultipleChoiceField(LookupFieldMixin, CSVModelMultipleChoiceField):
+    def _check_values(self, value):
+        if self.get_lookup() is None:
+            return super()._check_values(value)
+
+        return list(
+            {
+                obj.pk: obj for item in value for obj in self.get_lookup_objects(item)
+            }.values()
+        )
+
+
+def get_import_lookups(form_class, records, headers, user):
+    lookups = {}
+
+    for field_name, field in form_class.base_fields.items():
+        if not isinstance(field, LookupFieldMixin):
+            continue
+
+        values = set()
+        for record in records:
+            if (value := record.get(field_name)) in field.empty_values:
+                continue
+            if isinstance(field, LookupCSVModelMultipleChoiceField):
+                values.update(value.split(",") if isinstance(value, str) else value)
+            else:
+                values.add(value)
+
+        to_field_name = (headers or {}).get(field_name) or field.to_field_name
+        if values:
+            try:
+                lookups[field_name] = ImportLookup(field, to_field_name, values, user)
+            except FieldDoesNotExist:
+                continue
+
+    return lookups
+
+
+def get_lookup_import_form(form_class, lookups):
+    class LookupImportForm(form_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+
+            for field_name, lookup in lookups.items():
+                if field_name in self.fields:
+                    self.fields[field_name].lookup = lookup
+
+    return LookupImportForm
+
+
 class BOOTPImportFormMixin(forms.Form):
     FIELDS = [
         "next_server",
@@ -49,7 +173,7 @@ class ClientClassImportFormMixin(forms.Form):
         "client_classes",
     ]
 
-    client_classes = CSVModelMultipleChoiceField(
+    client_classes = LookupCSVModelMultipleChoiceField(
         queryset=ClientClass.objects.all(),
         required=False,
         to_field_name="name",
@@ -65,7 +189,7 @@ class EvaluateClientClassImportFormMixin(forms.Form):
         "evaluate_additional_classes",
     ]
 
-    evaluate_additional_classes = CSVModelMultipleChoiceField(
+    evaluate_additional_classes = LookupCSVModelMultipleChoiceField(
         queryset=ClientClass.objects.all(),
         required=False,
         to_field_name="name",
@@ -77,7 +201,7 @@ class EvaluateClientClassImportFormMixin(forms.Form):
 
 
 class PrefixImportFormMixin(forms.Form):
-    prefix = CSVModelChoiceField(
+    prefix = LookupCSVModelChoiceField(
         queryset=Prefix.objects.all(),
         required=True,
         to_field_name="prefix",
@@ -164,7 +288,7 @@ class SubnetImportFormMixin(forms.Form):
         "subnet",
     ]
 
-    subnet = CSVModelChoiceField(
+    subnet = LookupCSVModelChoiceField(
         queryset=Subnet.objects.all(),
         required=False,
         to_field_name="name",
@@ -180,7 +304,7 @@ class DHCPServerImportFormMixin(forms.Form):
         "dhcp_server",
     ]
 
-    dhcp_server = CSVModelChoiceField(
+    dhcp_server = LookupCSVModelChoiceField(
         queryset=DHCPServer.objects.all(),
         required=False,
         to_field_name="name",
@@ -196,7 +320,7 @@ class SharedNetworkImportFormMixin(forms.Form):
         "shared_network",
     ]
 
-    shared_network = CSVModelChoiceField(
+    shared_network = LookupCSVModelChoiceField(
         queryset=SharedNetwork.objects.all(),
         required=False,
         to_field_name="name",
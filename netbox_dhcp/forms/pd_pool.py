@@ -244,6 +244,7 @@ class PDPoolImportForm(
             "description",
             "weight",
             "subnet",
+            "pool_id",
             "prefix",
             "delegated_length",
             "excluded_prefix",
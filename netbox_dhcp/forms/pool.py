@@ -189,6 +189,7 @@ class PoolImportForm(
             "description",
             "weight",
             *SubnetImportFormMixin.FIELDS,
+            "pool_id",
             "ip_range",
             *ClientClassImportFormMixin.FIELDS,
             *EvaluateClientClassImportFormMixin.FIELDS,
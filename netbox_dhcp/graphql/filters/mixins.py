@@ -2,7 +2,9 @@ from dataclasses import dataclass
 
 from typing import Annotated, TYPE_CHECKING
 
+import netaddr
 import strawberry
+from django.db.models import Q
 from strawberry.scalars import ID
 import strawberry_django
 from strawberry_django import FilterLookup
@@ -162,6 +164,30 @@ class PrefixGraphQLFilterMixin:
     ) = strawberry_django.filter_field()
     prefix_id: ID | None = strawberry_django.filter_field()
 
+    def filter_prefix(self, value, lookup):
+        try:
+            query = str(netaddr.IPNetwork(value.strip()).cidr)
+        except (netaddr.AddrFormatError, ValueError):
+            return Q(pk__in=[])
+
+        return Q(**{lookup: query})
+
+    @strawberry_django.filter_field()
+    def within(self, value: str, prefix) -> Q:
+        return self.filter_prefix(value, f"{prefix}prefix__prefix__net_contained")
+
+    @strawberry_django.filter_field()
+    def within_include(self, value: str, prefix) -> Q:
+        return self.filter_prefix(
+            value, f"{prefix}prefix__prefix__net_contained_or_equal"
+        )
+
+    @strawberry_django.filter_field()
+    def contains(self, value: str, prefix) -> Q:
+        return self.filter_prefix(
+            value, f"{prefix}prefix__prefix__net_contains_or_equals"
+        )
+
 
 @dataclass
 class ChildSharedNetworkGraphQLFilterMixin:
@@ -413,7 +413,9 @@ class NetBoxDHCPPoolType(
     ip_range: Annotated["IPRangeType", strawberry.lazy("ipam.graphql.types")] | None
 
 
-@strawberry_django.type(Subnet, fields="__all__", filters=NetBoxDHCPSubnetFilter)
+@strawberry_django.type(
+    Subnet, exclude=("_last_pool_id",), filters=NetBoxDHCPSubnetFilter
+)
 class NetBoxDHCPSubnetType(
     DHCPServerGraphQLTypeMixin,
     SharedNetworkGraphQLTypeMixin,
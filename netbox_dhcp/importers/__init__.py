@@ -0,0 +1,3 @@
+from .bulk import *
+from .kea import *
+from .dhcpd import *
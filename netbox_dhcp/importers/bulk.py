@@ -0,0 +1,393 @@
+import csv
+import io
+import json
+import time
+from collections import Counter, defaultdict
+from itertools import islice
+
+import yaml
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext as _
+
+from extras.models import TaggedItem
+from netbox.search.backends import search_backend
+from utilities.choices import CSVDelimiterChoices, ImportFormatChoices
+from utilities.forms import restrict_form_fields
+
+from netbox_dhcp.forms import (
+    HostReservationImportForm,
+    OptionImportForm,
+    PoolImportForm,
+    SubnetImportForm,
+)
+from netbox_dhcp.forms.mixins import get_import_lookups, get_lookup_import_form
+from netbox_dhcp.models import DHCPServer, Pool, Subnet
+from netbox_dhcp.signals.config_generation import get_config_object
+from netbox_dhcp.utilities import (
+    allocate_pool_ids,
+    allocate_subnet_ids,
+    log_object_changes,
+    reserve_pool_id,
+    reserve_subnet_id,
+)
+
+__all__ = (
+    "IMPORT_CHUNK_SIZE",
+    "IMPORT_FORMS",
+    "BulkImporter",
+    "parse_records",
+)
+
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_MAX_ERRORS = 1000
+IMPORT_FORMS = {
+    "hostreservation": HostReservationImportForm,
+    "option": OptionImportForm,
+    "pool": PoolImportForm,
+    "subnet": SubnetImportForm,
+}
+
+
+class RowsDenied(Exception):
+    def __init__(self, indexes):
+        self.indexes = indexes
+
+
+# +
+# Instances written by a bulk_create() that was rolled back must be saved as
+# new objects again.
+# -
+def reset_instances(forms):
+    for _row, _form, instance in forms:
+        instance.pk = None
+        instance._state.adding = True
+
+
+#
+# Parsing
+#
+def detect_format(data):
+    stripped = data.lstrip()
+    if stripped.startswith(("[", "{")):
+        return ImportFormatChoices.JSON
+    if stripped.startswith("---"):
+        return ImportFormatChoices.YAML
+
+    return ImportFormatChoices.CSV
+
+
+def detect_delimiter(data):
+    try:
+        return (
+            csv.Sniffer()
+            .sniff(data.lstrip().partition("\n")[0], delimiters=",;\t")
+            .delimiter
+        )
+    except csv.Error:
+        return CSVDelimiterChoices.COMMA
+
+
+def parse_csv(data, delimiter):
+    if delimiter == CSVDelimiterChoices.AUTO:
+        delimiter = detect_delimiter(data)
+    reader = csv.reader(io.StringIO(data.strip()), delimiter=delimiter)
+
+    headers = {}
+    for header in next(reader, []):
+        field_name, _dot, to_field_name = header.strip().partition(".")
+        headers[field_name] = to_field_name or None
+
+    def records():
+        for row in reader:
+            if any(row):
+                yield dict(zip(headers, (value.strip() for value in row)))
+
+    return records(), headers
+
+
+def parse_records(
+    data,
+    format=ImportFormatChoices.AUTO,
+    csv_delimiter=CSVDelimiterChoices.AUTO,
+):
+    if format == ImportFormatChoices.AUTO:
+        format = detect_format(data)
+
+    if format == ImportFormatChoices.CSV:
+        return parse_csv(data, csv_delimiter)
+
+    if format == ImportFormatChoices.JSON:
+        records = json.loads(data)
+    else:
+        records = [
+            record
+            for document in yaml.safe_load_all(data)
+            for record in (document if isinstance(document, list) else [document])
+        ]
+
+    if isinstance(records, dict):
+        records = [records]
+
+    return iter(records), None
+
+
+# +
+# Bulk import of large data sets
+#
+# Records are validated with the model's import form in chunks, using lookup
+# maps resolved once per chunk for the referenced objects. The valid rows of
+# a chunk are written with one bulk_create() per model and many-to-many
+# relation in a single transaction. If the chunk violates a database
+# constraint, its rows are saved one by one instead so that only the
+# offending rows fail.
+#
+# bulk_create() bypasses the model signals, so change records, search cache
+# entries and the DHCP server config generation are written in bulk as well.
+# -
+class BulkImporter:
+    def __init__(self, model_name, user, request_id, chunk_size=IMPORT_CHUNK_SIZE):
+        self.form_class = IMPORT_FORMS[model_name]
+        self.model = self.form_class._meta.model
+        self.user = user
+        self.request_id = request_id
+        self.chunk_size = chunk_size
+        self.many_to_many_fields = {
+            field.name: field
+            for field in self.model._meta.many_to_many
+            if field.name != "tags"
+        }
+
+        self.processed = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.monotonic()
+
+    @property
+    def progress(self):
+        elapsed = time.monotonic() - self.started
+
+        return {
+            "model": self.model._meta.label_lower,
+            "processed": self.processed,
+            "created": self.created,
+            "failed": self.failed,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(self.processed / elapsed, 1) if elapsed else None,
+            "errors": self.errors,
+        }
+
+    def add_error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    #
+    # Validation
+    #
+    def validate_chunk(self, records, headers):
+        form_class = get_lookup_import_form(
+            self.form_class,
+            get_import_lookups(
+                self.form_class,
+                [record for _row, record in records],
+                headers,
+                self.user,
+            ),
+        )
+
+        forms = []
+        for row, record in records:
+            if record.get("id"):
+                self.add_error(
+                    row, {"id": [_("Background imports can only create objects.")]}
+                )
+                continue
+
+            form = form_class(data=record, headers=headers)
+            restrict_form_fields(form, self.user)
+
+            if form.is_valid():
+                forms.append((row, form, form.save(commit=False)))
+            else:
+                self.add_error(row, form.errors.get_json_data())
+
+        return forms
+
+    #
+    # Writes
+    #
+    def allocate_ids(self, instances):
+        if self.model is Subnet:
+            allocated = iter(
+                allocate_subnet_ids(
+                    sum(1 for instance in instances if instance.subnet_id is None)
+                )
+            )
+            for instance in instances:
+                if instance.subnet_id is None:
+                    instance.subnet_id = next(allocated)
+                else:
+                    reserve_subnet_id(instance.subnet_id)
+
+        elif self.model is Pool:
+            allocated = {
+                subnet_pk: iter(pool_ids)
+                for subnet_pk, pool_ids in allocate_pool_ids(
+                    Counter(
+                        instance.subnet_id
+                        for instance in instances
+                        if instance.pool_id is None
+                    )
+                ).items()
+            }
+            for instance in instances:
+                if instance.pool_id is None:
+                    instance.pool_id = next(allocated[instance.subnet_id])
+                else:
+                    reserve_pool_id(instance.subnet_id, instance.pool_id)
+
+    def save_many_to_many(self, forms):
+        content_type = ContentType.objects.get_for_model(self.model)
+        relations = defaultdict(list)
+        tagged_items = []
+
+        for _row, form, instance in forms:
+            for field_name, value in form.cleaned_data.items():
+                if field_name == "tags":
+                    tagged_items.extend(
+                        TaggedItem(
+                            content_type=content_type, object_id=instance.pk, tag=tag
+                        )
+                        for tag in value or ()
+                    )
+                elif value and field_name in self.many_to_many_fields:
+                    field = self.many_to_many_fields[field_name]
+                    relations[field.remote_field.through].extend(
+                        field.remote_field.through(
+                            **{
+                                f"{field.m2m_field_name()}_id": instance.pk,
+                                f"{field.m2m_reverse_field_name()}_id": obj.pk,
+                            }
+                        )
+                        for obj in value
+                    )
+
+        for through, through_objects in relations.items():
+            through.objects.bulk_create(through_objects)
+        TaggedItem.objects.bulk_create(tagged_items)
+
+    def create_objects(self, forms):
+        instances = [instance for _row, _form, instance in forms]
+
+        self.allocate_ids(instances)
+        self.model.objects.bulk_create(instances)
+
+        permitted = set(
+            self.model.objects.restrict(self.user, "add")
+            .filter(pk__in=[instance.pk for instance in instances])
+            .values_list("pk", flat=True)
+        )
+        if denied := [
+            index
+            for index, instance in enumerate(instances)
+            if instance.pk not in permitted
+        ]:
+            raise RowsDenied(denied)
+
+        self.save_many_to_many(forms)
+
+        return instances
+
+    def save_objects(self, forms):
+        instances = []
+
+        for row, form, instance in forms:
+            try:
+                with transaction.atomic():
+                    form.save()
+                    if not (
+                        self.model.objects.restrict(self.user, "add")
+                        .filter(pk=instance.pk)
+                        .exists()
+                    ):
+                        raise RowsDenied([row])
+            except RowsDenied:
+                self.add_error(row, {"__all__": [_("Permission denied.")]})
+            except ValidationError as exc:
+                self.add_error(row, {"__all__": exc.messages})
+            except IntegrityError as exc:
+                self.add_error(row, {"__all__": [str(exc)]})
+            else:
+                instances.append(instance)
+
+        return instances
+
+    def log_objects(self, instances, saved=False):
+        pks = [instance.pk for instance in instances]
+        objects = list(
+            self.model.objects.filter(pk__in=pks).prefetch_related(
+                "tags", *self.many_to_many_fields
+            )
+        )
+
+        log_object_changes(objects, self.user, self.request_id)
+
+        # +
+        # Objects saved one by one have already been cached and have bumped
+        # the config generation through the post_save signal.
+        # -
+        if saved:
+            return
+
+        search_backend.cache(objects, remove_existing=False)
+
+        config_objects = defaultdict(list)
+        for instance in instances:
+            model, pk = get_config_object(instance)
+            if model is not None:
+                config_objects[model].append(pk)
+        for model, model_pks in config_objects.items():
+            DHCPServer.objects.bump_config_generation(model, model_pks)
+
+    def save_chunk(self, forms):
+        while forms:
+            try:
+                with transaction.atomic():
+                    instances = self.create_objects(forms)
+                    self.log_objects(instances)
+            except RowsDenied as exc:
+                for index in exc.indexes:
+                    self.add_error(
+                        forms[index][0], {"__all__": [_("Permission denied.")]}
+                    )
+                forms = [
+                    item for index, item in enumerate(forms) if index not in exc.indexes
+                ]
+                reset_instances(forms)
+                continue
+            except IntegrityError:
+                reset_instances(forms)
+                with transaction.atomic():
+                    instances = self.save_objects(forms)
+                    self.log_objects(instances, saved=True)
+
+            self.created += len(instances)
+            return
+
+    def import_chunk(self, records, headers):
+        forms = self.validate_chunk(records, headers)
+        if forms:
+            self.save_chunk(forms)
+
+        self.processed += len(records)
+
+    def run(self, records, headers=None):
+        records = enumerate(records, start=1)
+
+        while chunk := list(islice(records, self.chunk_size)):
+            self.import_chunk(chunk, headers)
+            yield self.progress
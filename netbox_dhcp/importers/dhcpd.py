@@ -0,0 +1,847 @@
+import re
+from collections import namedtuple
+from itertools import islice
+
+import netaddr
+from django.utils.translation import gettext as _
+
+from ipam.choices import IPAddressFamilyChoices
+
+from .kea import HOST_PREFIX_LENGTHS, KeaConfigImporter, get_pool_range
+
+__all__ = (
+    "DhcpdConfigImporter",
+    "DhcpdParser",
+    "DhcpdTokenizer",
+)
+
+
+PUNCTUATION = frozenset("{};,")
+DHCPD_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+# +
+# Strings may span lines, but an unterminated string would otherwise swallow
+# (and re-tokenize) the rest of the file, so it is rejected after this many.
+# -
+DHCPD_MAX_STRING_LINES = 100
+
+Token = namedtuple("Token", ("type", "value", "line"))
+
+# +
+# Statements that map to a Kea parameter, with the conversion of their value
+# -
+DHCPD_PARAMETERS = {
+    "default-lease-time": ("valid-lifetime", int),
+    "min-lease-time": ("min-valid-lifetime", int),
+    "max-lease-time": ("max-valid-lifetime", int),
+    "preferred-lifetime": ("preferred-lifetime", int),
+    "filename": ("boot-file-name", str),
+    "next-server": ("next-server", str),
+    "server-name": ("server-hostname", str),
+}
+DHCPD_OPTION_TYPES = {
+    "boolean": "boolean",
+    "integer 8": "int8",
+    "integer 16": "int16",
+    "integer 32": "int32",
+    "signed integer 8": "int8",
+    "signed integer 16": "int16",
+    "signed integer 32": "int32",
+    "unsigned integer 8": "uint8",
+    "unsigned integer 16": "uint16",
+    "unsigned integer 32": "uint32",
+    "ip-address": "ipv4-address",
+    "ip6-address": "ipv6-address",
+    "domain-name": "fqdn",
+    "text": "string",
+    "string": "binary",
+}
+DHCPD_DOMAIN_LIST_TYPES = ("domain-list", "domain-list compressed")
+DHCPD_DHCP6_OPTION_NAMES = {
+    "name-servers": "dns-servers",
+    "info-refresh-time": "information-refresh-time",
+}
+
+# +
+# Scopes in which each declaration and statement may appear. Anything else is
+# rejected the same way dhcpd rejects it.
+# -
+DHCPD_SCOPES = {
+    "shared-network": ("global", "group"),
+    "subnet": ("global", "group", "shared-network"),
+    "subnet6": ("global", "group", "shared-network"),
+    "pool": ("subnet", "shared-network"),
+    "pool6": ("subnet", "shared-network"),
+    "range": ("subnet", "shared-network", "pool"),
+    "range6": ("subnet", "shared-network", "pool"),
+    "host": ("global", "group", "shared-network", "subnet"),
+    "class": ("global", "group"),
+    "group": ("global", "group", "shared-network", "subnet"),
+    "hardware": ("host",),
+    "fixed-address": ("host",),
+    "fixed-address6": ("host",),
+    "fixed-prefix6": ("host",),
+    "host-identifier": ("host",),
+}
+
+
+def unescape(value):
+    if "\\" not in value:
+        return value
+
+    return DHCPD_ESCAPE.sub(lambda match: match.group(1), value)
+
+
+def find_string_end(line, position):
+    while (position := line.find('"', position + 1)) >= 0:
+        backslashes = 0
+        while line[position - backslashes - 1] == "\\":
+            backslashes += 1
+        if not backslashes % 2:
+            return position
+
+    return -1
+
+
+def split_values(values):
+    groups, group = [], []
+    for value in values:
+        if value.type == ",":
+            groups.append(" ".join(group))
+            group = []
+        else:
+            group.append(value.value)
+    groups.append(" ".join(group))
+
+    return groups
+
+
+def get_option(name):
+    space, _dot, name = name.rpartition(".")
+    if space == "dhcp6":
+        return {"name": DHCPD_DHCP6_OPTION_NAMES.get(name, name)}
+    if space:
+        return {"space": space, "name": name}
+
+    return {"name": name}
+
+
+def get_option_type(values):
+    array = [value.value for value in values[:2]] == ["array", "of"]
+    if array:
+        values = values[2:]
+
+    if values and values[0].type == "{":
+        if values[-1].type != "}":
+            raise ValueError
+        return {
+            "type": "record",
+            "record-types": ", ".join(
+                DHCPD_OPTION_TYPES.get(record_type, record_type)
+                for record_type in split_values(values[1:-1])
+            ),
+            "array": array,
+        }
+
+    option_type = " ".join(value.value for value in values)
+    if option_type in DHCPD_DOMAIN_LIST_TYPES:
+        return {"type": "fqdn", "array": True}
+
+    return {"type": DHCPD_OPTION_TYPES.get(option_type, option_type), "array": array}
+
+
+def get_identifier(value):
+    if value.type == "string":
+        return ":".join(f"{byte:02x}" for byte in value.value.encode())
+
+    try:
+        return ":".join(f"{int(octet, 16):02x}" for octet in value.value.split(":"))
+    except ValueError:
+        return value.value
+
+
+def find_subnet(address, prefix_lengths, subnets):
+    try:
+        address = netaddr.IPAddress(address)
+    except (TypeError, ValueError, netaddr.AddrFormatError):
+        return None
+
+    for prefix_length in prefix_lengths:
+        if (
+            network := str(netaddr.IPNetwork(f"{address}/{prefix_length}").cidr)
+        ) in subnets:
+            return network
+
+    return None
+
+
+# +
+# Incremental tokenizer for ISC dhcpd configurations
+#
+# The configuration is read line by line, so memory use is bounded by the
+# longest line rather than by the size of the file. Outside of strings, the
+# punctuation of a line is padded with spaces and the line is split with
+# str.split(); strings and comments are located with str.find(). A string
+# that is not terminated on its line is continued on the next one.
+# -
+class DhcpdTokenizer:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __iter__(self):
+        pending, pending_line = "", None
+
+        for line_number, line in enumerate(self.stream, start=1):
+            if pending:
+                if line_number - pending_line >= DHCPD_MAX_STRING_LINES:
+                    break
+                line, line_number = pending + line, pending_line
+            if (tokens := self.tokenize(line, line_number)) is None:
+                pending, pending_line = line, line_number
+                continue
+
+            pending = ""
+            yield from tokens
+
+        if pending:
+            raise ValueError(
+                _("Line {line}: Unterminated string.").format(line=pending_line)
+            )
+
+    def split(self, text, line_number):
+        return [
+            (
+                Token(word, word, line_number)
+                if word in PUNCTUATION
+                else Token("word", word, line_number)
+            )
+            for word in text.replace("{", " { ")
+            .replace("}", " } ")
+            .replace(";", " ; ")
+            .replace(",", " , ")
+            .split()
+        ]
+
+    def tokenize(self, line, line_number):
+        if '"' not in line:
+            return self.split(line.partition("#")[0], line_number)
+
+        tokens, position = [], 0
+        while True:
+            quote = line.find('"', position)
+            text = line[position:] if quote < 0 else line[position:quote]
+            if (comment := text.find("#")) >= 0:
+                return tokens + self.split(text[:comment], line_number)
+
+            tokens += self.split(text, line_number)
+            if quote < 0:
+                return tokens
+
+            if (string_end := find_string_end(line, quote)) < 0:
+                return None
+            tokens.append(
+                Token("string", unescape(line[quote + 1 : string_end]), line_number)
+            )
+            position = string_end + 1
+
+
+class Scope:
+    def __init__(self, kind, parent=None, name=None, line=None, config=None):
+        self.kind = kind
+        self.parent = parent
+        self.name = name
+        self.line = line
+        self.config = {} if config is None else config
+        self.flags = {}
+        self.pools = []
+        self.ranges = []
+
+    @property
+    def path(self):
+        if self.name is None:
+            return f"{self.kind} (line {self.line})"
+
+        return f"{self.kind} {self.name} (line {self.line})"
+
+    def find(self, *kinds):
+        scope = self.parent
+        while scope is not None and scope.kind not in kinds:
+            scope = scope.parent
+
+        return scope
+
+    def get_flag(self, name):
+        scope = self
+        while scope is not None:
+            if name in scope.flags:
+                return scope.flags[name]
+            scope = scope.parent
+
+        return False
+
+
+# +
+# Streaming parser for ISC dhcpd configurations
+#
+# The declarations are translated to the structure of a Kea configuration so
+# that they can be imported with the Kea importer. Host declarations are
+# yielded one at a time as they are parsed and are not kept; everything else
+# is collected in the configuration, which therefore only grows with the
+# number of subnets, not with the number of hosts.
+#
+# Statements without a Kea equivalent are skipped, including their blocks,
+# and reported as ignored.
+# -
+class DhcpdParser:
+    def __init__(self, tokens, family):
+        self.tokens = iter(tokens)
+        self.family = int(family)
+        self.pending = None
+        self.line = 1
+
+        self.config = {}
+        self.paths = {}
+        self.ignored = set()
+        self.errors = []
+        self.warnings = []
+
+        self.is_dhcp4 = is_dhcp4 = self.family == IPAddressFamilyChoices.FAMILY_4
+        self.subnet_key = "subnet4" if is_dhcp4 else "subnet6"
+        self.declarations = {
+            "shared-network": self.parse_shared_network,
+            "subnet" if is_dhcp4 else "subnet6": self.parse_subnet,
+            "pool" if is_dhcp4 else "pool6": self.parse_pool,
+            "host": self.parse_host,
+            "class": self.parse_class,
+            "group": self.parse_group,
+        }
+        self.statements = {
+            "option": self.parse_option,
+            "range" if is_dhcp4 else "range6": self.parse_range,
+            "hardware": self.parse_hardware,
+            "authoritative": self.parse_authoritative,
+            "not": self.parse_not,
+            "use-host-decl-names": self.parse_use_host_decl_names,
+            "match": self.parse_match,
+            "allow": self.parse_allow,
+            "include": self.parse_include,
+            **dict.fromkeys(DHCPD_PARAMETERS, self.parse_parameter),
+        }
+        if is_dhcp4:
+            self.statements["fixed-address"] = self.parse_fixed_address
+        else:
+            self.statements |= {
+                "fixed-address6": self.parse_fixed_address,
+                "fixed-prefix6": self.parse_fixed_prefix,
+                "host-identifier": self.parse_host_identifier,
+            }
+
+    #
+    # Tokens
+    #
+    def next(self):
+        if self.pending is not None:
+            token, self.pending = self.pending, None
+        else:
+            token = next(self.tokens, None)
+
+        if token is not None:
+            self.line = token.line
+        return token
+
+    def peek(self):
+        if self.pending is None:
+            self.pending = next(self.tokens, None)
+
+        return self.pending
+
+    def error(self, message):
+        return ValueError(
+            _("Line {line}: {message}").format(line=self.line, message=message)
+        )
+
+    def read_values(self, terminator=";", allow_blocks=False):
+        values = []
+        while (token := self.next()) is not None:
+            if token.type == terminator:
+                return values
+            if token.type in ("{", "}", ";") and not allow_blocks:
+                raise self.error(_("Unexpected {token}.").format(token=token.value))
+            values.append(token)
+
+        raise self.error(_("Unexpected end of file."))
+
+    def read_value(self, keyword):
+        values = self.read_values()
+        if len(values) != 1:
+            raise self.error(
+                _("{keyword} takes exactly one value.").format(keyword=keyword)
+            )
+
+        return values[0]
+
+    def skip_block(self):
+        depth = 1
+        while depth:
+            if (token := self.next()) is None:
+                raise self.error(_("Unexpected end of file."))
+            if token.type == "{":
+                depth += 1
+            elif token.type == "}":
+                depth -= 1
+
+    def skip_statement(self):
+        while (token := self.next()) is not None:
+            if token.type == ";":
+                return
+            if token.type == "}":
+                raise self.error(_("Unexpected }."))
+            if token.type == "{":
+                self.skip_block()
+                following = self.peek()
+                if following is None or following.value not in ("else", "elsif"):
+                    return
+
+        raise self.error(_("Unexpected end of file."))
+
+    #
+    # Blocks
+    #
+    def parse(self):
+        yield from self.parse_block(Scope("global", config=self.config))
+
+    def parse_block(self, scope):
+        while (token := self.next()) is not None:
+            if token.type == "}":
+                if scope.parent is None:
+                    raise self.error(_("Unexpected }."))
+                return
+            if token.type == ";":
+                continue
+            if token.type != "word":
+                raise self.error(_("Unexpected {token}.").format(token=token.value))
+
+            keyword = token.value
+            if keyword in DHCPD_SCOPES and scope.kind not in DHCPD_SCOPES[keyword]:
+                raise self.error(
+                    _("{keyword} is not allowed in a {scope} declaration.").format(
+                        keyword=keyword, scope=scope.kind
+                    )
+                )
+
+            if (declaration := self.declarations.get(keyword)) is not None:
+                yield from declaration(token, scope)
+            elif (statement := self.statements.get(keyword)) is not None:
+                statement(token, scope)
+            else:
+                self.ignored.add(f"{scope.kind}.{keyword}")
+                self.skip_statement()
+
+        if scope.parent is not None:
+            raise self.error(_("Unexpected end of file."))
+
+    def inherit(self, scope):
+        parent = scope.parent
+        while parent is not None and parent.kind == "group":
+            for key, value in parent.config.items():
+                if key != "option-data":
+                    scope.config.setdefault(key, value)
+                    continue
+
+                options = scope.config.setdefault("option-data", [])
+                names = {(option.get("space"), option["name"]) for option in options}
+                options.extend(
+                    option
+                    for option in value
+                    if (option.get("space"), option["name"]) not in names
+                )
+            parent = parent.parent
+
+    def add_pool(self, scope, pool, path):
+        if scope.kind == "subnet":
+            scope.config.setdefault("pools", []).append(pool)
+        else:
+            scope.pools.append((pool, path))
+
+    def parse_shared_network(self, token, scope):
+        values = self.read_values(terminator="{")
+        if len(values) != 1:
+            raise self.error(_("Invalid shared-network declaration."))
+
+        shared_network = Scope(
+            "shared-network",
+            scope,
+            values[0].value,
+            token.line,
+            {"name": values[0].value, self.subnet_key: []},
+        )
+        yield from self.parse_block(shared_network)
+        self.inherit(shared_network)
+
+        networks = [
+            (netaddr.IPNetwork(subnet["subnet"]), subnet)
+            for subnet in shared_network.config[self.subnet_key]
+        ]
+        for pool, path in shared_network.pools:
+            try:
+                start, _end = get_pool_range(pool["pool"])
+            except (ValueError, netaddr.AddrFormatError):
+                start = None
+            if subnet := next(
+                (
+                    subnet
+                    for network, subnet in networks
+                    if start is not None and start in network
+                ),
+                None,
+            ):
+                subnet.setdefault("pools", []).append(pool)
+            else:
+                self.errors.append(
+                    (path, _("The range is not inside a subnet of the shared network."))
+                )
+
+        self.paths[id(shared_network.config)] = shared_network.path
+        self.config.setdefault("shared-networks", []).append(shared_network.config)
+
+    def parse_subnet(self, token, scope):
+        values = [value.value for value in self.read_values(terminator="{")]
+        try:
+            if self.is_dhcp4:
+                if len(values) != 3 or values[1] != "netmask":
+                    raise ValueError
+                prefix = netaddr.IPNetwork(f"{values[0]}/{values[2]}").cidr
+            else:
+                if len(values) != 1:
+                    raise ValueError
+                prefix = netaddr.IPNetwork(values[0]).cidr
+        except (ValueError, netaddr.AddrFormatError):
+            raise self.error(
+                _("Invalid {keyword} declaration.").format(keyword=token.value)
+            )
+
+        subnet = Scope(
+            "subnet", scope, str(prefix), token.line, {"subnet": str(prefix)}
+        )
+        yield from self.parse_block(subnet)
+        self.inherit(subnet)
+
+        self.paths[id(subnet.config)] = subnet.path
+        if (parent := subnet.find("shared-network")) is not None:
+            parent.config[self.subnet_key].append(subnet.config)
+        else:
+            self.config.setdefault(self.subnet_key, []).append(subnet.config)
+
+    def parse_pool(self, token, scope):
+        if self.read_values(terminator="{"):
+            raise self.error(
+                _("Invalid {keyword} declaration.").format(keyword=token.value)
+            )
+
+        pool = Scope("pool", scope, line=token.line)
+        yield from self.parse_block(pool)
+
+        if not pool.ranges:
+            self.errors.append((pool.path, _("The pool has no range.")))
+        for value, path in pool.ranges:
+            self.add_pool(scope, {**pool.config, "pool": value}, path)
+
+    def parse_host(self, token, scope):
+        values = self.read_values(terminator="{")
+        if len(values) != 1:
+            raise self.error(_("Invalid host declaration."))
+
+        host = Scope("host", scope, values[0].value, token.line)
+        yield from self.parse_block(host)
+        self.inherit(host)
+
+        if "hostname" not in host.config and host.get_flag("use-host-decl-names"):
+            host.config["hostname"] = host.name
+        subnet = host.find("subnet")
+
+        yield host.path, host.config, subnet and subnet.name, host.name
+
+    def parse_class(self, token, scope):
+        values = self.read_values(terminator="{")
+        if len(values) != 1:
+            raise self.error(_("Invalid class declaration."))
+
+        client_class = Scope(
+            "class", scope, values[0].value, token.line, {"name": values[0].value}
+        )
+        yield from self.parse_block(client_class)
+        self.inherit(client_class)
+
+        if expression := client_class.flags.get("match"):
+            self.warnings.append(
+                (
+                    client_class.path,
+                    _(
+                        "The match expression {expression} was not imported, the "
+                        "client class needs a Kea test expression."
+                    ).format(expression=expression),
+                )
+            )
+
+        self.paths[id(client_class.config)] = client_class.path
+        self.config.setdefault("client-classes", []).append(client_class.config)
+
+    def parse_group(self, token, scope):
+        if self.read_values(terminator="{"):
+            raise self.error(_("Invalid group declaration."))
+
+        yield from self.parse_block(Scope("group", scope, line=token.line))
+
+    #
+    # Statements
+    #
+    def parse_option(self, token, scope):
+        values = self.read_values(allow_blocks=True)
+        if not values or values[0].type != "word":
+            raise self.error(_("Option name expected."))
+
+        name = values[0].value
+        if len(values) > 1 and values[1].value == "code":
+            self.parse_option_definition(name, values[2:], scope)
+            return
+        if name == "space":
+            self.ignored.add(f"{scope.kind}.option space")
+            return
+        if any(value.type in ("{", "}") for value in values):
+            raise self.error(_("Unexpected {."))
+
+        if scope.kind == "host" and len(values) == 2:
+            if name == "host-name":
+                scope.config["hostname"] = values[1].value
+                return
+            if name == "dhcp-client-identifier":
+                scope.config["client-id"] = get_identifier(values[1])
+                return
+
+        scope.config.setdefault("option-data", []).append(
+            {**get_option(name), "data": ", ".join(split_values(values[1:]))}
+        )
+
+    def parse_option_definition(self, name, values, scope):
+        if scope.kind != "global":
+            raise self.error(_("Options can only be defined globally."))
+        if len(values) < 3 or values[1].value != "=":
+            raise self.error(_("Invalid option definition."))
+
+        try:
+            definition = {
+                **get_option(name),
+                "code": int(values[0].value),
+                **get_option_type(values[2:]),
+            }
+        except ValueError:
+            raise self.error(_("Invalid option definition."))
+
+        self.config.setdefault("option-def", []).append(definition)
+
+    def parse_parameter(self, token, scope):
+        key, convert = DHCPD_PARAMETERS[token.value]
+        value = self.read_value(token.value).value
+        try:
+            scope.config[key] = convert(value)
+        except ValueError:
+            raise self.error(
+                _("Invalid value for {keyword}.").format(keyword=token.value)
+            )
+
+    def parse_range(self, token, scope):
+        values = [value.value for value in self.read_values()]
+        if values[:1] == ["dynamic-bootp"]:
+            values = values[1:]
+        if values[-1:] == ["temporary"]:
+            self.ignored.add(f"{scope.kind}.{token.value} temporary")
+            return
+
+        if len(values) == 2:
+            value = f"{values[0]} - {values[1]}"
+        elif len(values) == 1:
+            value = values[0] if "/" in values[0] else f"{values[0]} - {values[0]}"
+        else:
+            raise self.error(
+                _("Invalid {keyword} statement.").format(keyword=token.value)
+            )
+
+        path = f"{token.value} {value} (line {token.line})"
+        if scope.kind == "pool":
+            scope.ranges.append((value, path))
+        else:
+            self.add_pool(scope, {"pool": value}, path)
+
+    def parse_hardware(self, token, scope):
+        values = self.read_values()
+        if len(values) != 2:
+            raise self.error(_("Invalid hardware statement."))
+
+        if values[0].value == "ethernet":
+            scope.config["hw-address"] = values[1].value
+        else:
+            self.ignored.add(f"host.hardware {values[0].value}")
+
+    def parse_fixed_address(self, token, scope):
+        addresses = split_values(self.read_values())
+
+        if self.is_dhcp4:
+            scope.config["ip-address"] = addresses[0]
+            if len(addresses) > 1:
+                self.errors.append(
+                    (scope.path, _("Only the first fixed address was imported."))
+                )
+        else:
+            scope.config.setdefault("ip-addresses", []).extend(addresses)
+
+    def parse_fixed_prefix(self, token, scope):
+        scope.config.setdefault("prefixes", []).append(
+            self.read_value(token.value).value
+        )
+
+    def parse_host_identifier(self, token, scope):
+        values = self.read_values()
+        if [value.value for value in values[:2]] == ["option", "dhcp6.client-id"]:
+            if len(values) != 3:
+                raise self.error(_("Invalid host-identifier statement."))
+            scope.config["duid"] = get_identifier(values[2])
+        else:
+            self.ignored.add(f"host.host-identifier {values[0].value}")
+
+    def parse_authoritative(self, token, scope):
+        if self.read_values():
+            raise self.error(_("Invalid authoritative statement."))
+
+        scope.config["authoritative"] = True
+
+    def parse_not(self, token, scope):
+        values = [value.value for value in self.read_values()]
+        if values == ["authoritative"]:
+            scope.config["authoritative"] = False
+        else:
+            self.ignored.add(f"{scope.kind}.not {' '.join(values)}")
+
+    def parse_use_host_decl_names(self, token, scope):
+        scope.flags["use-host-decl-names"] = self.read_value(token.value).value in (
+            "on",
+            "true",
+        )
+
+    def parse_match(self, token, scope):
+        values = self.read_values()
+        if scope.kind != "class":
+            raise self.error(_("match is only allowed in a class declaration."))
+
+        scope.flags["match"] = ", ".join(
+            split_values(
+                [
+                    (
+                        value._replace(value=f'"{value.value}"')
+                        if value.type == "string"
+                        else value
+                    )
+                    for value in values
+                ]
+            )
+        )
+
+    def parse_allow(self, token, scope):
+        values = self.read_values()
+        if scope.kind == "pool" and [value.value for value in values[:2]] == [
+            "members",
+            "of",
+        ]:
+            scope.config.setdefault("client-classes", []).extend(
+                value.value for value in values[2:]
+            )
+        else:
+            self.ignored.add(f"{scope.kind}.allow")
+
+    def parse_include(self, token, scope):
+        raise self.error(_("Include statements are not supported."))
+
+
+# +
+# Import of ISC dhcpd configurations
+#
+# The configuration is read twice. The first pass validates the whole file and
+# imports everything except the host declarations with the Kea importer. The
+# second pass streams the host declarations into host reservations in chunks.
+# A host is assigned to the subnet it is declared in or, for hosts declared
+# globally or in a group, to the imported subnet that contains its fixed
+# address. Hosts without a matching subnet become global host reservations.
+# -
+class DhcpdConfigImporter(KeaConfigImporter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.paths = {}
+
+    def iter_subnets(self, config):
+        for _path, subnet, parent in super().iter_subnets(config):
+            yield self.paths[id(subnet)], subnet, parent
+
+    def iter_dhcpd_host_reservations(self, hosts):
+        subnets = {
+            str(prefix): (pk, prefix.prefixlen)
+            for _path, _subnet, pk, _name, prefix in self.subnets
+        }
+        prefix_lengths = sorted(
+            {prefix.prefixlen for *_values, prefix in self.subnets}, reverse=True
+        )
+
+        for path, host_reservation, subnet, name in hosts:
+            if subnet is None:
+                subnet = find_subnet(
+                    host_reservation.get("ip-address")
+                    or next(iter(host_reservation.get("ip-addresses") or ()), None),
+                    prefix_lengths,
+                    subnets,
+                )
+            elif subnet not in subnets:
+                self.add_error(
+                    path,
+                    [
+                        _(
+                            "The host was not imported because its subnet {subnet} "
+                            "was not imported."
+                        ).format(subnet=subnet)
+                    ],
+                )
+                continue
+
+            if subnet in subnets:
+                pk, prefix_length = subnets[subnet]
+                parent = {"subnet_id": pk}
+            else:
+                prefix_length = HOST_PREFIX_LENGTHS[self.family]
+                parent = {"dhcp_server_id": self.dhcp_server.pk}
+
+            yield (
+                path,
+                host_reservation,
+                parent,
+                f"{self.dhcp_server.name}-{name}",
+                prefix_length,
+            )
+
+    def run(self, stream):
+        parser = DhcpdParser(DhcpdTokenizer(stream), self.family)
+        for _host in parser.parse():
+            pass
+
+        self.paths = parser.paths
+        self.ignored_keys.update(parser.ignored)
+        for path, message in parser.errors:
+            self.add_error(path, [message])
+        for path, message in parser.warnings:
+            self.add_error(path, [message], count=0)
+
+        yield from super().run(parser.config)
+
+        stream.seek(0)
+        host_reservations = self.iter_dhcpd_host_reservations(
+            DhcpdParser(DhcpdTokenizer(stream), self.family).parse()
+        )
+        while chunk := list(islice(host_reservations, self.chunk_size)):
+            self.write_chunk(self.import_host_reservations, chunk)
+            yield self.progress
@@ -0,0 +1,1547 @@
+import json
+import re
+import time
+from collections import Counter, defaultdict
+from itertools import islice
+
+import netaddr
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.translation import gettext as _
+
+from dcim.models import MACAddress
+from ipam.choices import IPAddressFamilyChoices
+from ipam.models import IPAddress, IPRange, Prefix
+from netbox.search.backends import search_backend
+from utilities.permissions import get_permission_for_model
+
+from netbox_dhcp.choices import OptionSendChoices, OptionSpaceChoices
+from netbox_dhcp.kea.renderer import (
+    CLIENT_CLASS_PARAMETERS,
+    DHCP4_ONLY_PARAMETERS,
+    DHCP6_ONLY_PARAMETERS,
+    HOST_RESERVATION_PARAMETERS,
+    POOL_PARAMETERS,
+    SERVER_PARAMETERS,
+    SHARED_NETWORK_PARAMETERS,
+    SUBNET_PARAMETERS,
+)
+from netbox_dhcp.models import (
+    ClientClass,
+    DHCPServer,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+from netbox_dhcp.utilities import (
+    allocate_pool_ids,
+    allocate_subnet_ids,
+    log_object_changes,
+    reserve_pool_id,
+    reserve_subnet_id,
+)
+from netbox_dhcp.validators import validate_option_data
+
+from .bulk import IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS
+
+__all__ = (
+    "KeaConfigImporter",
+    "parse_kea_config",
+)
+
+
+KEA_ROOT_KEYS = {
+    "Dhcp4": IPAddressFamilyChoices.FAMILY_4,
+    "Dhcp6": IPAddressFamilyChoices.FAMILY_6,
+}
+KEA_COMMENT = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|#[^\n]*|/\*.*?\*/', re.DOTALL)
+KEA_INCLUDE = re.compile(r"<\?include\b")
+
+CLIENT_CLASS_RELATIONS = {
+    "client_classes": ("client-classes", "client-class"),
+    "evaluate_additional_classes": (
+        "evaluate-additional-classes",
+        "require-client-classes",
+    ),
+}
+CLIENT_CLASS_KEYS = {key for keys in CLIENT_CLASS_RELATIONS.values() for key in keys}
+HOST_RESERVATION_IDENTIFIERS = (
+    "hw-address",
+    "duid",
+    "client-id",
+    "circuit-id",
+    "flex-id",
+)
+HOST_PREFIX_LENGTHS = {
+    IPAddressFamilyChoices.FAMILY_4: 32,
+    IPAddressFamilyChoices.FAMILY_6: 128,
+}
+
+# +
+# Keys handled explicitly for each section of the configuration. Keys that
+# are neither handled nor map to a model parameter are reported as ignored.
+# -
+SERVER_KEYS = {
+    "host-reservation-identifiers",
+    "relay-supplied-options",
+    "server-id",
+    "client-classes",
+    "option-def",
+    "option-data",
+    "shared-networks",
+    "subnet4",
+    "subnet6",
+    "reservations",
+}
+CLIENT_CLASS_KEYS_HANDLED = {
+    "name",
+    "test",
+    "template-test",
+    "option-def",
+    "option-data",
+}
+NETWORK_KEYS = {
+    "relay",
+    "option-data",
+    *CLIENT_CLASS_KEYS,
+}
+SHARED_NETWORK_KEYS = {
+    "name",
+    "subnet4",
+    "subnet6",
+    *NETWORK_KEYS,
+}
+SUBNET_KEYS = {
+    "id",
+    "subnet",
+    "pools",
+    "pd-pools",
+    "reservations",
+    *NETWORK_KEYS,
+}
+POOL_KEYS = {
+    "pool",
+    "pool-id",
+    "option-data",
+    *CLIENT_CLASS_KEYS,
+}
+PD_POOL_KEYS = {
+    "prefix",
+    "prefix-len",
+    "delegated-len",
+    "excluded-prefix",
+    "excluded-prefix-len",
+    "pool-id",
+    "option-data",
+    *CLIENT_CLASS_KEYS,
+}
+HOST_RESERVATION_KEYS = {
+    "hw-address",
+    "ip-address",
+    "ip-addresses",
+    "prefixes",
+    "excluded-prefixes",
+    "client-classes",
+    "option-data",
+}
+
+# +
+# Lookups from each model to the DHCP server it belongs to, used to decide
+# whether an existing object with the same name can be reused.
+# -
+DHCP_SERVER_LOOKUPS = {
+    ClientClass: ("dhcp_server",),
+    SharedNetwork: ("dhcp_server",),
+    Subnet: ("dhcp_server", "shared_network__dhcp_server"),
+    Pool: ("subnet__dhcp_server", "subnet__shared_network__dhcp_server"),
+    PDPool: ("subnet__dhcp_server", "subnet__shared_network__dhcp_server"),
+    HostReservation: (
+        "dhcp_server",
+        "subnet__dhcp_server",
+        "subnet__shared_network__dhcp_server",
+    ),
+}
+WRITE_ERRORS = (IntegrityError, PermissionDenied, ValidationError)
+IMPORT_MODELS = (
+    ClientClass,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+    Prefix,
+    IPRange,
+    IPAddress,
+    MACAddress,
+)
+
+
+def strip_comments(data):
+    return KEA_COMMENT.sub(lambda match: match.group(1) or "", data)
+
+
+def parse_kea_config(data):
+    if KEA_INCLUDE.search(data):
+        raise ValueError(_("Kea include directives are not supported."))
+
+    config = json.loads(strip_comments(data))
+    if not isinstance(config, dict) or not (
+        root_keys := [key for key in KEA_ROOT_KEYS if key in config]
+    ):
+        raise ValueError(_("The configuration has no Dhcp4 or Dhcp6 section."))
+    if len(root_keys) > 1:
+        raise ValueError(_("The configuration has both a Dhcp4 and a Dhcp6 section."))
+
+    return KEA_ROOT_KEYS[root_keys[0]], config[root_keys[0]]
+
+
+def get_kea_keys(parameters):
+    return {parameter.replace("_", "-"): parameter for parameter in parameters}
+
+
+def get_relay(config):
+    relay = config.get("relay") or {}
+    addresses = relay.get("ip-addresses") or (
+        [relay["ip-address"]] if relay.get("ip-address") else []
+    )
+
+    return ", ".join(addresses) or None
+
+
+def get_pool_range(value):
+    start, separator, end = value.partition("-")
+    if separator:
+        return netaddr.IPAddress(start.strip()), netaddr.IPAddress(end.strip())
+
+    network = netaddr.IPNetwork(value.strip())
+    return network[0], network[-1]
+
+
+def get_host_reservation_identifier(host_reservation):
+    return next(
+        (
+            host_reservation[key]
+            for key in HOST_RESERVATION_IDENTIFIERS
+            if host_reservation.get(key)
+        ),
+        None,
+    )
+
+
+def get_host_reservation_name(parent_name, host_reservation):
+    suffix = host_reservation.get("hostname") or get_host_reservation_identifier(
+        host_reservation
+    )
+
+    return f"{parent_name}-{suffix}"
+
+
+def get_write_error_messages(exc):
+    if isinstance(exc, ValidationError):
+        return exc.messages
+    if isinstance(exc, PermissionDenied):
+        return [str(exc) or _("Permission denied.")]
+
+    return [str(exc)]
+
+
+def get_network(config, key, length_key=None):
+    if length_key is None:
+        return netaddr.IPNetwork(config[key]).cidr
+
+    return netaddr.IPNetwork(f"{config[key]}/{config[length_key]}").cidr
+
+
+# +
+# Import of Kea DHCPv4/DHCPv6 configurations
+#
+# The server, its option definitions, client classes and shared networks are
+# imported in one transaction. Subnets (with their pools and prefix delegation
+# pools) and host reservations follow in chunks, each written in its own
+# transaction with one bulk_create() per model and many-to-many relation.
+# Prefixes, IP ranges, IP addresses and MAC addresses referenced by a chunk are
+# resolved with one query per model; prefixes and IP ranges that do not exist
+# are created with save() because NetBox maintains their hierarchy there, IP
+# and MAC addresses with bulk_create().
+#
+# Objects are matched by name, so running an import again only creates what
+# is missing. Existing objects are reused but not updated, with the exception
+# of the DHCP server parameters.
+# -
+class KeaConfigImporter:
+    def __init__(
+        self,
+        dhcp_server_name,
+        family,
+        user,
+        request_id,
+        chunk_size=IMPORT_CHUNK_SIZE,
+    ):
+        self.dhcp_server_name = dhcp_server_name
+        self.family = int(family)
+        self.user = user
+        self.request_id = request_id
+        self.chunk_size = chunk_size
+
+        self.excluded = (
+            DHCP6_ONLY_PARAMETERS if self.is_dhcp4 else DHCP4_ONLY_PARAMETERS
+        )
+        self.option_space = (
+            OptionSpaceChoices.DHCPV4 if self.is_dhcp4 else OptionSpaceChoices.DHCPV6
+        )
+
+        self.dhcp_server = None
+        self.client_classes = {}
+        self.definitions = {}
+        self.shared_networks = {}
+        self.subnets = []
+
+        self.processed = 0
+        self.created = Counter()
+        self.skipped = Counter()
+        self.failed = 0
+        self.errors = []
+        self.ignored_keys = set()
+        self.started = time.monotonic()
+
+        self.chunk_created = Counter()
+        self.chunk_skipped = Counter()
+
+    @property
+    def is_dhcp4(self):
+        return self.family == IPAddressFamilyChoices.FAMILY_4
+
+    @property
+    def root_key(self):
+        return "Dhcp4" if self.is_dhcp4 else "Dhcp6"
+
+    @property
+    def subnet_key(self):
+        return "subnet4" if self.is_dhcp4 else "subnet6"
+
+    @property
+    def progress(self):
+        elapsed = time.monotonic() - self.started
+        created = sum(self.created.values())
+
+        return {
+            "dhcp_server": self.dhcp_server_name,
+            "family": self.family,
+            "processed": self.processed,
+            "created": dict(self.created),
+            "skipped": dict(self.skipped),
+            "failed": self.failed,
+            "elapsed": round(elapsed, 3),
+            "objects_per_second": round(created / elapsed, 1) if elapsed else None,
+            "ignored_keys": sorted(self.ignored_keys),
+            "errors": self.errors,
+        }
+
+    def add_error(self, path, messages, count=1):
+        self.failed += count
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"path": path, "errors": messages})
+
+    def check_permissions(self):
+        permissions = [
+            get_permission_for_model(model, "add") for model in IMPORT_MODELS
+        ]
+        if DHCPServer.objects.filter(name=self.dhcp_server_name).exists():
+            permissions.append(get_permission_for_model(DHCPServer, "change"))
+        else:
+            permissions.append(get_permission_for_model(DHCPServer, "add"))
+
+        if missing := [
+            permission
+            for permission in permissions
+            if not self.user.has_perm(permission)
+        ]:
+            raise PermissionDenied(
+                _("Missing permissions: {permissions}").format(
+                    permissions=", ".join(missing)
+                )
+            )
+
+    #
+    # Object construction
+    #
+    def get_parameters(self, config, parameters, scope, handled_keys):
+        kea_keys = get_kea_keys(parameters)
+
+        values = {}
+        for key, value in config.items():
+            if key in kea_keys and kea_keys[key] not in self.excluded:
+                values[kea_keys[key]] = value
+            elif key not in handled_keys:
+                self.ignored_keys.add(f"{scope}.{key}")
+
+        return values
+
+    def get_client_class_pks(self, config, keys, path):
+        names = []
+        for key in keys:
+            value = config.get(key) or []
+            names.extend([value] if isinstance(value, str) else value)
+
+        pks = set()
+        for name in names:
+            if name in self.client_classes:
+                pks.add(self.client_classes[name])
+            else:
+                self.add_error(
+                    path,
+                    [
+                        _("Unknown client class {name} was not assigned.").format(
+                            name=name
+                        )
+                    ],
+                    count=0,
+                )
+
+        return pks
+
+    def get_client_class_relations(self, model, config, path):
+        return {
+            field_name: self.get_client_class_pks(config, keys, path)
+            for field_name, keys in CLIENT_CLASS_RELATIONS.items()
+            if hasattr(model, field_name)
+        }
+
+    def build(self, model, path, values):
+        instance = model(**values)
+
+        try:
+            instance.clean_fields(
+                exclude=[
+                    field.name
+                    for field in model._meta.concrete_fields
+                    if field.is_relation
+                ]
+            )
+        except ValidationError as exc:
+            self.add_error(path, exc.messages)
+            return None
+
+        return instance
+
+    def get_existing(self, model, names):
+        existing = {}
+        for name, pk, *dhcp_server_pks in model.objects.filter(
+            name__in=[name for name in names if name]
+        ).values_list("name", "pk", *DHCP_SERVER_LOOKUPS[model]):
+            existing[name] = pk if self.dhcp_server.pk in dhcp_server_pks else None
+
+        return existing
+
+    # +
+    # Returns whether the object can be imported and, if an object with the
+    # same name already exists for this DHCP server, its primary key.
+    # -
+    def match_existing(self, model, path, name, existing, seen):
+        if name in seen:
+            self.add_error(
+                path,
+                [_("The name {name} is not unique.").format(name=name)],
+            )
+            return False, None
+        seen.add(name)
+
+        if name not in existing:
+            return True, None
+        if existing[name] is None:
+            self.add_error(
+                path,
+                [
+                    _("{model} {name} belongs to another DHCP server.").format(
+                        model=model._meta.verbose_name, name=name
+                    )
+                ],
+            )
+            return False, None
+
+        self.chunk_skipped[model._meta.label_lower] += 1
+        return True, existing[name]
+
+    #
+    # Writes
+    #
+    # +
+    # Object permission constraints can only be evaluated against saved rows,
+    # so the written objects are checked before the transaction is committed.
+    # -
+    def check_restrictions(self, model, instances, action="add"):
+        pks = [instance.pk for instance in instances]
+        if model.objects.restrict(self.user, action).filter(pk__in=pks).count() != len(
+            pks
+        ):
+            raise PermissionDenied(
+                _("{model} objects outside the permitted set cannot be saved.").format(
+                    model=model._meta.verbose_name
+                )
+            )
+
+    def log_objects(self, model, instances, cache=True):
+        if not instances:
+            return
+
+        self.check_restrictions(model, instances)
+        objects = list(
+            model.objects.filter(
+                pk__in=[instance.pk for instance in instances]
+            ).prefetch_related(
+                "tags",
+                *(
+                    field.name
+                    for field in model._meta.many_to_many
+                    if field.name != "tags"
+                ),
+            )
+        )
+
+        log_object_changes(objects, self.user, self.request_id)
+        if cache:
+            search_backend.cache(objects, remove_existing=False)
+
+        self.chunk_created[model._meta.label_lower] += len(objects)
+
+    def save_many_to_many(self, model, relations):
+        through_objects = defaultdict(list)
+
+        for instance, field_name, pks in relations:
+            field = model._meta.get_field(field_name)
+            through = field.remote_field.through
+            through_objects[through].extend(
+                through(
+                    **{
+                        f"{field.m2m_field_name()}_id": instance.pk,
+                        f"{field.m2m_reverse_field_name()}_id": pk,
+                    }
+                )
+                for pk in pks
+            )
+
+        for through, objects in through_objects.items():
+            through.objects.bulk_create(objects)
+
+    def create_objects(self, model, items):
+        instances = [instance for instance, _relations in items]
+        model.objects.bulk_create(instances)
+
+        self.save_many_to_many(
+            model,
+            [
+                (instance, field_name, pks)
+                for instance, relations in items
+                for field_name, pks in relations.items()
+                if pks
+            ],
+        )
+        self.log_objects(model, instances)
+
+        return instances
+
+    def write_items(self, function, items):
+        self.chunk_created = Counter()
+        self.chunk_skipped = Counter()
+        failed = self.failed
+        error_count = len(self.errors)
+
+        try:
+            with transaction.atomic():
+                result = function(items)
+                DHCPServer.objects.bump_config_generation(
+                    DHCPServer, [self.dhcp_server.pk]
+                )
+        except WRITE_ERRORS:
+            self.failed = failed
+            del self.errors[error_count:]
+            raise
+
+        self.created.update(self.chunk_created)
+        self.skipped.update(self.chunk_skipped)
+        return result
+
+    # +
+    # A chunk violating a database constraint or an object permission is
+    # written again item by item, so that only the offending items fail.
+    # -
+    def write_chunk(self, function, items):
+        try:
+            result = self.write_items(function, items)
+        except WRITE_ERRORS:
+            result = []
+            for item in items:
+                try:
+                    result.extend(self.write_items(function, [item]) or ())
+                except WRITE_ERRORS as exc:
+                    self.add_error(item[0], get_write_error_messages(exc))
+
+        self.processed += len(items)
+        return result
+
+    #
+    # IPAM objects
+    #
+    def resolve_prefixes(self, prefixes):
+        pks = {}
+        if not prefixes:
+            return pks
+
+        for pk, prefix in (
+            Prefix.objects.restrict(self.user, "view")
+            .filter(vrf__isnull=True, prefix__in=[str(prefix) for prefix in prefixes])
+            .order_by("pk")
+            .values_list("pk", "prefix")
+        ):
+            pks.setdefault(str(prefix), pk)
+
+        created = []
+        for prefix in prefixes:
+            if str(prefix) not in pks:
+                obj = Prefix(prefix=prefix)
+                obj.save()
+                pks[str(prefix)] = obj.pk
+                created.append(obj)
+        self.log_objects(Prefix, created, cache=False)
+
+        return pks
+
+    def resolve_ip_ranges(self, ranges):
+        pks = {}
+        if not ranges:
+            return pks
+
+        for pk, start_address, end_address in (
+            IPRange.objects.restrict(self.user, "view")
+            .filter(
+                vrf__isnull=True,
+                start_address__net_in=[str(start) for start, _end in ranges],
+            )
+            .order_by("pk")
+            .values_list("pk", "start_address", "end_address")
+        ):
+            pks.setdefault((str(start_address.ip), str(end_address.ip)), pk)
+
+        created = []
+        for (start, end), prefix_length in ranges.items():
+            if (key := (str(start), str(end))) not in pks:
+                obj = IPRange(
+                    start_address=netaddr.IPNetwork(f"{start}/{prefix_length}"),
+                    end_address=netaddr.IPNetwork(f"{end}/{prefix_length}"),
+                )
+                obj.save()
+                pks[key] = obj.pk
+                created.append(obj)
+        self.log_objects(IPRange, created, cache=False)
+
+        return pks
+
+    def resolve_ip_addresses(self, addresses):
+        pks = {}
+        if not addresses:
+            return pks
+
+        for pk, address in (
+            IPAddress.objects.restrict(self.user, "view")
+            .filter(vrf__isnull=True, address__net_in=list(addresses))
+            .order_by("pk")
+            .values_list("pk", "address")
+        ):
+            pks.setdefault(str(address.ip), pk)
+
+        created = IPAddress.objects.bulk_create(
+            IPAddress(address=netaddr.IPNetwork(f"{address}/{prefix_length}"))
+            for address, prefix_length in addresses.items()
+            if address not in pks
+        )
+        for obj in created:
+            pks[str(obj.address.ip)] = obj.pk
+        self.log_objects(IPAddress, created)
+
+        return pks
+
+    def resolve_mac_addresses(self, mac_addresses):
+        pks = {}
+        if not mac_addresses:
+            return pks
+
+        for pk, mac_address in (
+            MACAddress.objects.restrict(self.user, "view")
+            .filter(mac_address__in=mac_addresses)
+            .order_by("pk")
+            .values_list("pk", "mac_address")
+        ):
+            pks.setdefault(str(mac_address), pk)
+
+        created = MACAddress.objects.bulk_create(
+            MACAddress(mac_address=mac_address)
+            for mac_address in mac_addresses
+            if mac_address not in pks
+        )
+        for obj in created:
+            pks[str(obj.mac_address)] = obj.pk
+        self.log_objects(MACAddress, created)
+
+        return pks
+
+    #
+    # Options
+    #
+    def load_option_definitions(self):
+        self.definitions = {}
+
+        for definition in sorted(
+            OptionDefinition.objects.filter(
+                Q(dhcp_server__isnull=True, client_class__isnull=True)
+                | Q(dhcp_server=self.dhcp_server)
+                | Q(client_class__dhcp_server=self.dhcp_server),
+                family=self.family,
+            ),
+            key=lambda definition: definition.dhcp_server_id is not None
+            or definition.client_class_id is not None,
+        ):
+            self.definitions[(definition.space, definition.code)] = definition
+            self.definitions[(definition.space, definition.name)] = definition
+
+    def import_option_definitions(self, owners):
+        existing = set(
+            OptionDefinition.objects.filter(
+                Q(dhcp_server=self.dhcp_server)
+                | Q(client_class__dhcp_server=self.dhcp_server)
+            ).values_list("dhcp_server_id", "client_class_id", "space", "code")
+        )
+
+        items = []
+        for field_name, pk, configs, path in owners:
+            for index, config in enumerate(configs or ()):
+                definition_path = f"{path}.option-def[{index}]"
+                values = {
+                    "dhcp_server_id": pk if field_name == "dhcp_server" else None,
+                    "client_class_id": pk if field_name == "client_class" else None,
+                    "space": config.get("space", self.option_space),
+                    "code": config.get("code"),
+                }
+                if tuple(values.values()) in existing:
+                    self.chunk_skipped[OptionDefinition._meta.label_lower] += 1
+                    continue
+
+                record_types = [
+                    record_type.strip()
+                    for record_type in config.get("record-types", "").split(",")
+                    if record_type.strip()
+                ]
+                if instance := self.build(
+                    OptionDefinition,
+                    definition_path,
+                    {
+                        **values,
+                        "family": self.family,
+                        "name": config.get("name"),
+                        "type": config.get("type"),
+                        "record_types": record_types or None,
+                        "array": config.get("array"),
+                        "encapsulate": config.get("encapsulate") or None,
+                    },
+                ):
+                    items.append((instance, {}))
+
+        self.create_objects(OptionDefinition, items)
+        self.load_option_definitions()
+
+    def import_options(self, owners):
+        owners = [owner for owner in owners if owner[2]]
+        if not owners:
+            return
+
+        content_types = ContentType.objects.get_for_models(
+            *{model for model, _pk, _configs, _path in owners}
+        )
+        pks = defaultdict(list)
+        for model, pk, _configs, _path in owners:
+            pks[content_types[model]].append(pk)
+
+        condition = Q()
+        for content_type, content_type_pks in pks.items():
+            condition |= Q(
+                assigned_object_type=content_type,
+                assigned_object_id__in=content_type_pks,
+            )
+        existing = set(
+            Option.objects.filter(condition).values_list(
+                "assigned_object_type_id", "assigned_object_id", "definition_id"
+            )
+        )
+
+        items = []
+        for model, pk, configs, path in owners:
+            content_type = content_types[model]
+
+            for index, config in enumerate(configs):
+                option_path = f"{path}.option-data[{index}]"
+                space = config.get("space", self.option_space)
+                definition = self.definitions.get(
+                    (space, config["code"])
+                    if "code" in config
+                    else (space, config.get("name"))
+                )
+                if definition is None:
+                    self.add_error(option_path, [_("Unknown option definition.")])
+                    continue
+                if (content_type.pk, pk, definition.pk) in existing:
+                    self.chunk_skipped[Option._meta.label_lower] += 1
+                    continue
+
+                data = str(config.get("data", ""))
+                try:
+                    validate_option_data(data, definition)
+                except ValidationError as exc:
+                    self.add_error(option_path, exc.messages)
+                    continue
+
+                if config.get("always-send"):
+                    send_option = OptionSendChoices.ALWAYS_SEND
+                elif config.get("never-send"):
+                    send_option = OptionSendChoices.NEVER_SEND
+                else:
+                    send_option = None
+
+                items.append(
+                    (
+                        Option(
+                            definition=definition,
+                            assigned_object_type=content_type,
+                            assigned_object_id=pk,
+                            data=data,
+                            csv_format=config.get("csv-format"),
+                            send_option=send_option,
+                        ),
+                        {
+                            "client_classes": self.get_client_class_pks(
+                                config, ("client-classes",), option_path
+                            )
+                        },
+                    )
+                )
+
+        self.create_objects(Option, items)
+
+    #
+    # DHCP server, client classes and shared networks
+    #
+    def import_dhcp_server(self, config):
+        values = self.get_parameters(
+            config, SERVER_PARAMETERS, self.root_key, SERVER_KEYS
+        )
+        if "host-reservation-identifiers" in config:
+            values["host_reservation_identifiers"] = config[
+                "host-reservation-identifiers"
+            ]
+        if not self.is_dhcp4:
+            if "relay-supplied-options" in config:
+                values["relay_supplied_options"] = config["relay-supplied-options"]
+            if server_id := (config.get("server-id") or {}).get("type"):
+                values["server_id"] = server_id
+
+        dhcp_server = DHCPServer.objects.filter(name=self.dhcp_server_name).first()
+        if dhcp_server is None:
+            dhcp_server = DHCPServer(name=self.dhcp_server_name)
+        else:
+            dhcp_server.snapshot()
+
+        for field_name, value in values.items():
+            setattr(dhcp_server, field_name, value)
+        dhcp_server.full_clean()
+        dhcp_server.save()
+        self.dhcp_server = dhcp_server
+
+        if hasattr(dhcp_server, "_prechange_snapshot"):
+            self.check_restrictions(DHCPServer, [dhcp_server], "change")
+            log_object_changes(
+                [dhcp_server],
+                self.user,
+                self.request_id,
+                snapshots={dhcp_server.pk: dhcp_server._prechange_snapshot},
+            )
+        else:
+            self.log_objects(DHCPServer, [dhcp_server], cache=False)
+
+    def import_client_classes(self, config):
+        configs = [
+            (f"client-classes[{index}]", client_class)
+            for index, client_class in enumerate(config.get("client-classes") or ())
+        ]
+        existing = self.get_existing(
+            ClientClass, [client_class.get("name") for _path, client_class in configs]
+        )
+
+        owners, created, seen = [], [], set()
+        for path, client_class in configs:
+            if not (name := client_class.get("name")):
+                self.add_error(path, [_("The client class has no name.")])
+                continue
+
+            valid, pk = self.match_existing(ClientClass, path, name, existing, seen)
+            if not valid:
+                continue
+            if pk is not None:
+                owners.append((pk, client_class, path))
+                continue
+
+            if instance := self.build(
+                ClientClass,
+                path,
+                {
+                    "name": name,
+                    "dhcp_server_id": self.dhcp_server.pk,
+                    "test": client_class.get("test", ""),
+                    "template_test": client_class.get("template-test", ""),
+                    **self.get_parameters(
+                        client_class,
+                        CLIENT_CLASS_PARAMETERS,
+                        "client-classes",
+                        CLIENT_CLASS_KEYS_HANDLED,
+                    ),
+                },
+            ):
+                created.append((instance, client_class, path))
+
+        self.create_objects(
+            ClientClass, [(instance, {}) for instance, _config, _path in created]
+        )
+        self.client_classes = dict(
+            ClientClass.objects.filter(dhcp_server=self.dhcp_server).values_list(
+                "name", "pk"
+            )
+        )
+
+        return owners + [
+            (instance.pk, client_class, path)
+            for instance, client_class, path in created
+        ]
+
+    def get_shared_network_prefix(self, config):
+        prefixes = []
+        for subnet in config.get(self.subnet_key) or ():
+            try:
+                prefixes.append(get_network(subnet, "subnet"))
+            except (KeyError, TypeError, ValueError, netaddr.AddrFormatError):
+                continue
+
+        prefixes = [prefix for prefix in prefixes if prefix.version == self.family]
+        if len(prefixes) > 1:
+            return netaddr.spanning_cidr(prefixes)
+
+        return prefixes[0] if prefixes else None
+
+    def import_shared_networks(self, config):
+        configs = [
+            (f"shared-networks[{index}]", index, shared_network)
+            for index, shared_network in enumerate(config.get("shared-networks") or ())
+        ]
+        existing = self.get_existing(
+            SharedNetwork,
+            [shared_network.get("name") for _path, _index, shared_network in configs],
+        )
+
+        new, seen = [], set()
+        for path, index, shared_network in configs:
+            if not (name := shared_network.get("name")):
+                self.add_error(path, [_("The shared network has no name.")])
+                continue
+
+            valid, pk = self.match_existing(SharedNetwork, path, name, existing, seen)
+            if not valid:
+                continue
+            if pk is not None:
+                self.shared_networks[index] = pk
+            elif (prefix := self.get_shared_network_prefix(shared_network)) is None:
+                self.add_error(
+                    path, [_("The prefix of the shared network cannot be derived.")]
+                )
+            else:
+                new.append((path, index, shared_network, name, prefix))
+
+        prefix_pks = self.resolve_prefixes({prefix for *_values, prefix in new})
+
+        created = []
+        for path, index, shared_network, name, prefix in new:
+            if instance := self.build(
+                SharedNetwork,
+                path,
+                {
+                    "name": name,
+                    "dhcp_server_id": self.dhcp_server.pk,
+                    "prefix_id": prefix_pks[str(prefix)],
+                    "relay": get_relay(shared_network),
+                    **self.get_parameters(
+                        shared_network,
+                        SHARED_NETWORK_PARAMETERS,
+                        "shared-networks",
+                        SHARED_NETWORK_KEYS,
+                    ),
+                },
+            ):
+                created.append(
+                    (
+                        index,
+                        instance,
+                        self.get_client_class_relations(
+                            SharedNetwork, shared_network, path
+                        ),
+                    )
+                )
+
+        self.create_objects(
+            SharedNetwork,
+            [(instance, relations) for _index, instance, relations in created],
+        )
+        for index, instance, _relations in created:
+            self.shared_networks[index] = instance.pk
+
+        return [
+            (SharedNetwork, pk, shared_network.get("option-data"), path)
+            for path, index, shared_network in configs
+            if (pk := self.shared_networks.get(index)) is not None
+        ]
+
+    def import_dhcp_server_objects(self, config):
+        self.import_dhcp_server(config)
+
+        client_classes = self.import_client_classes(config)
+        self.import_option_definitions(
+            [
+                (
+                    "dhcp_server",
+                    self.dhcp_server.pk,
+                    config.get("option-def"),
+                    self.root_key,
+                )
+            ]
+            + [
+                ("client_class", pk, client_class.get("option-def"), path)
+                for pk, client_class, path in client_classes
+            ]
+        )
+        shared_networks = self.import_shared_networks(config)
+
+        self.import_options(
+            [
+                (
+                    DHCPServer,
+                    self.dhcp_server.pk,
+                    config.get("option-data"),
+                    self.root_key,
+                ),
+                *(
+                    (ClientClass, pk, client_class.get("option-data"), path)
+                    for pk, client_class, path in client_classes
+                ),
+                *shared_networks,
+            ]
+        )
+
+    #
+    # Subnets, pools and prefix delegation pools
+    #
+    def iter_subnets(self, config):
+        for index, subnet in enumerate(config.get(self.subnet_key) or ()):
+            yield (
+                f"{self.subnet_key}[{index}]",
+                subnet,
+                {"dhcp_server_id": self.dhcp_server.pk},
+            )
+
+        for index, shared_network in enumerate(config.get("shared-networks") or ()):
+            if (pk := self.shared_networks.get(index)) is None:
+                continue
+
+            for subnet_index, subnet in enumerate(
+                shared_network.get(self.subnet_key) or ()
+            ):
+                yield (
+                    f"shared-networks[{index}].{self.subnet_key}[{subnet_index}]",
+                    subnet,
+                    {"shared_network_id": pk},
+                )
+
+    def set_subnet_ids(self, instances):
+        if explicit := [
+            instance.subnet_id for instance in instances if instance.subnet_id
+        ]:
+            reserve_subnet_id(max(explicit))
+
+        allocated = iter(
+            allocate_subnet_ids(
+                sum(1 for instance in instances if instance.subnet_id is None)
+            )
+        )
+        for instance in instances:
+            if instance.subnet_id is None:
+                instance.subnet_id = next(allocated)
+
+    def set_pool_ids(self, instances):
+        explicit = {}
+        for instance in instances:
+            if instance.pool_id is not None:
+                explicit[instance.subnet_id] = max(
+                    explicit.get(instance.subnet_id, 0), instance.pool_id
+                )
+        for subnet_pk, pool_id in explicit.items():
+            reserve_pool_id(subnet_pk, pool_id)
+
+        allocated = {
+            subnet_pk: iter(pool_ids)
+            for subnet_pk, pool_ids in allocate_pool_ids(
+                Counter(
+                    instance.subnet_id
+                    for instance in instances
+                    if instance.pool_id is None
+                )
+            ).items()
+        }
+        for instance in instances:
+            if instance.pool_id is None:
+                instance.pool_id = next(allocated[instance.subnet_id])
+
+    def import_subnets(self, items):
+        candidates = []
+        for path, subnet, parent in items:
+            try:
+                prefix = get_network(subnet, "subnet")
+            except (KeyError, TypeError, ValueError, netaddr.AddrFormatError):
+                self.add_error(path, [_("The subnet prefix is missing or invalid.")])
+                continue
+            if prefix.version != self.family:
+                self.add_error(
+                    path, [_("The subnet prefix has the wrong address family.")]
+                )
+                continue
+
+            candidates.append(
+                (path, subnet, parent, prefix, f"{self.dhcp_server.name}-{prefix}")
+            )
+
+        existing = self.get_existing(Subnet, [candidate[4] for candidate in candidates])
+        subnet_ids_in_use = set(
+            Subnet.objects.filter(
+                subnet_id__in=[
+                    subnet["id"]
+                    for _path, subnet, *_values in candidates
+                    if "id" in subnet
+                ]
+            ).values_list("subnet_id", flat=True)
+        )
+
+        subnets, new, seen = [], [], set()
+        for path, subnet, parent, prefix, name in candidates:
+            valid, pk = self.match_existing(Subnet, path, name, existing, seen)
+            if not valid:
+                continue
+            if pk is not None:
+                subnets.append((path, subnet, pk, name, prefix))
+            elif subnet.get("id") in subnet_ids_in_use:
+                self.add_error(
+                    path,
+                    [
+                        _("Subnet ID {subnet_id} is already in use.").format(
+                            subnet_id=subnet["id"]
+                        )
+                    ],
+                )
+            else:
+                if "id" in subnet:
+                    subnet_ids_in_use.add(subnet["id"])
+                new.append((path, subnet, parent, prefix, name))
+
+        prefix_pks = self.resolve_prefixes({prefix for *_values, prefix, _name in new})
+
+        created = []
+        for path, subnet, parent, prefix, name in new:
+            if instance := self.build(
+                Subnet,
+                path,
+                {
+                    "name": name,
+                    "subnet_id": subnet.get("id"),
+                    "prefix_id": prefix_pks[str(prefix)],
+                    "relay": get_relay(subnet),
+                    **parent,
+                    **self.get_parameters(
+                        subnet, SUBNET_PARAMETERS, self.subnet_key, SUBNET_KEYS
+                    ),
+                },
+            ):
+                created.append(
+                    (
+                        path,
+                        subnet,
+                        prefix,
+                        instance,
+                        self.get_client_class_relations(Subnet, subnet, path),
+                    )
+                )
+
+        self.set_subnet_ids([instance for *_values, instance, _relations in created])
+        self.create_objects(
+            Subnet, [(instance, relations) for *_values, instance, relations in created]
+        )
+        subnets.extend(
+            (path, subnet, instance.pk, instance.name, prefix)
+            for path, subnet, prefix, instance, _relations in created
+        )
+
+        self.import_pools(subnets)
+        self.import_options(
+            [
+                (Subnet, pk, subnet.get("option-data"), path)
+                for path, subnet, pk, _name, _prefix in subnets
+            ]
+        )
+
+        return subnets
+
+    def import_pools(self, subnets):
+        pools, pd_pools = [], []
+        for path, subnet, pk, name, prefix in subnets:
+            pools.extend(
+                (f"{path}.pools[{index}]", pool, pk, prefix, f"{name}-pool-{index + 1}")
+                for index, pool in enumerate(subnet.get("pools") or ())
+            )
+            if not self.is_dhcp4:
+                pd_pools.extend(
+                    (
+                        f"{path}.pd-pools[{index}]",
+                        pd_pool,
+                        pk,
+                        prefix,
+                        f"{name}-pd-pool-{index + 1}",
+                    )
+                    for index, pd_pool in enumerate(subnet.get("pd-pools") or ())
+                )
+
+        existing = self.get_existing(Pool, [pool[4] for pool in pools])
+        owners, new_pools, seen = [], [], set()
+        for path, pool, subnet_pk, prefix, name in pools:
+            valid, pk = self.match_existing(Pool, path, name, existing, seen)
+            if not valid:
+                continue
+            if pk is not None:
+                owners.append((Pool, pk, pool.get("option-data"), path))
+                continue
+
+            try:
+                start, end = get_pool_range(pool["pool"])
+            except (KeyError, TypeError, ValueError, netaddr.AddrFormatError):
+                self.add_error(path, [_("The pool range is missing or invalid.")])
+                continue
+            new_pools.append((path, pool, subnet_pk, prefix, name, (start, end)))
+
+        existing = self.get_existing(PDPool, [pd_pool[4] for pd_pool in pd_pools])
+        new_pd_pools, seen = [], set()
+        for path, pd_pool, subnet_pk, prefix, name in pd_pools:
+            valid, pk = self.match_existing(PDPool, path, name, existing, seen)
+            if not valid:
+                continue
+            if pk is not None:
+                owners.append((PDPool, pk, pd_pool.get("option-data"), path))
+                continue
+
+            try:
+                prefixes = (
+                    get_network(pd_pool, "prefix", "prefix-len"),
+                    (
+                        get_network(pd_pool, "excluded-prefix", "excluded-prefix-len")
+                        if pd_pool.get("excluded-prefix")
+                        else None
+                    ),
+                )
+            except (KeyError, TypeError, ValueError, netaddr.AddrFormatError):
+                self.add_error(path, [_("The delegated prefix is missing or invalid.")])
+                continue
+            new_pd_pools.append((path, pd_pool, subnet_pk, prefix, name, prefixes))
+
+        range_pks = self.resolve_ip_ranges(
+            {
+                ip_range: prefix.prefixlen
+                for *_values, prefix, _name, ip_range in new_pools
+            }
+        )
+        prefix_pks = self.resolve_prefixes(
+            {
+                pd_prefix
+                for *_values, prefixes in new_pd_pools
+                for pd_prefix in prefixes
+                if pd_prefix is not None
+            }
+        )
+
+        created_pools = []
+        for path, pool, subnet_pk, _prefix, name, (start, end) in new_pools:
+            if instance := self.build(
+                Pool,
+                path,
+                {
+                    "name": name,
+                    "subnet_id": subnet_pk,
+                    "ip_range_id": range_pks[(str(start), str(end))],
+                    "pool_id": pool.get("pool-id"),
+                    **self.get_parameters(pool, POOL_PARAMETERS, "pools", POOL_KEYS),
+                },
+            ):
+                created_pools.append(
+                    (
+                        path,
+                        pool,
+                        instance,
+                        self.get_client_class_relations(Pool, pool, path),
+                    )
+                )
+
+        created_pd_pools = []
+        for path, pd_pool, subnet_pk, _prefix, name, prefixes in new_pd_pools:
+            delegated_prefix, excluded_prefix = prefixes
+            self.get_parameters(pd_pool, (), "pd-pools", PD_POOL_KEYS)
+            if instance := self.build(
+                PDPool,
+                path,
+                {
+                    "name": name,
+                    "subnet_id": subnet_pk,
+                    "prefix_id": prefix_pks[str(delegated_prefix)],
+                    "delegated_length": pd_pool.get("delegated-len"),
+                    "excluded_prefix_id": (
+                        prefix_pks[str(excluded_prefix)] if excluded_prefix else None
+                    ),
+                    "pool_id": pd_pool.get("pool-id"),
+                },
+            ):
+                created_pd_pools.append(
+                    (
+                        path,
+                        pd_pool,
+                        instance,
+                        self.get_client_class_relations(PDPool, pd_pool, path),
+                    )
+                )
+
+        self.set_pool_ids(
+            [instance for _path, _config, instance, _relations in created_pools]
+            + [instance for _path, _config, instance, _relations in created_pd_pools]
+        )
+        for model, created in ((Pool, created_pools), (PDPool, created_pd_pools)):
+            self.create_objects(
+                model,
+                [
+                    (instance, relations)
+                    for _path, _config, instance, relations in created
+                ],
+            )
+            owners.extend(
+                (model, instance.pk, config.get("option-data"), path)
+                for path, config, instance, _relations in created
+            )
+
+        self.import_options(owners)
+
+    #
+    # Host reservations
+    #
+    def iter_host_reservations(self, config):
+        for index, host_reservation in enumerate(config.get("reservations") or ()):
+            yield (
+                f"reservations[{index}]",
+                host_reservation,
+                {"dhcp_server_id": self.dhcp_server.pk},
+                get_host_reservation_name(self.dhcp_server.name, host_reservation),
+                HOST_PREFIX_LENGTHS[self.family],
+            )
+
+        for path, subnet, pk, name, prefix in self.subnets:
+            for index, host_reservation in enumerate(subnet.get("reservations") or ()):
+                yield (
+                    f"{path}.reservations[{index}]",
+                    host_reservation,
+                    {"subnet_id": pk},
+                    get_host_reservation_name(name, host_reservation),
+                    prefix.prefixlen,
+                )
+
+    def skip_host_reservations(self, config):
+        imported = {id(subnet) for _path, subnet, *_values in self.subnets}
+
+        for path, subnet, _parent in self.iter_subnets(config):
+            if id(subnet) not in imported and (
+                count := len(subnet.get("reservations") or ())
+            ):
+                self.add_error(
+                    f"{path}.reservations",
+                    [
+                        _(
+                            "The host reservations of this subnet were not "
+                            "imported because the subnet was not imported."
+                        )
+                    ],
+                    count=count,
+                )
+
+    def get_host_reservation_addresses(self, host_reservation):
+        mac_address_field = MACAddress._meta.get_field("mac_address")
+
+        if self.is_dhcp4:
+            ip_addresses = [host_reservation.get("ip-address")]
+        else:
+            ip_addresses = host_reservation.get("ip-addresses") or []
+
+        return {
+            "hw_address": (
+                str(mac_address_field.to_python(host_reservation["hw-address"]))
+                if host_reservation.get("hw-address")
+                else None
+            ),
+            "ip_addresses": [
+                str(netaddr.IPAddress(ip_address))
+                for ip_address in ip_addresses
+                if ip_address
+            ],
+            "ipv6_prefixes": [
+                netaddr.IPNetwork(prefix).cidr
+                for prefix in host_reservation.get("prefixes") or ()
+            ],
+            "excluded_ipv6_prefixes": [
+                netaddr.IPNetwork(prefix).cidr
+                for prefix in host_reservation.get("excluded-prefixes") or ()
+            ],
+        }
+
+    def import_host_reservations(self, items):
+        candidates = []
+        for path, host_reservation, parent, name, prefix_length in items:
+            if get_host_reservation_identifier(host_reservation) is None:
+                self.add_error(
+                    path, [_("The host reservation has no client identifier.")]
+                )
+                continue
+
+            candidates.append((path, host_reservation, parent, prefix_length, name))
+
+        existing = self.get_existing(
+            HostReservation, [candidate[4] for candidate in candidates]
+        )
+
+        new, seen = [], set()
+        for path, host_reservation, parent, prefix_length, name in candidates:
+            valid, pk = self.match_existing(HostReservation, path, name, existing, seen)
+            if not valid or pk is not None:
+                continue
+
+            try:
+                addresses = self.get_host_reservation_addresses(host_reservation)
+            except (ValidationError, TypeError, ValueError, netaddr.AddrFormatError):
+                self.add_error(path, [_("An address or prefix is invalid.")])
+                continue
+            new.append((path, host_reservation, parent, prefix_length, name, addresses))
+
+        mac_address_pks = self.resolve_mac_addresses(
+            {
+                addresses["hw_address"]
+                for *_values, addresses in new
+                if addresses["hw_address"]
+            }
+        )
+        ip_address_pks = self.resolve_ip_addresses(
+            {
+                ip_address: prefix_length
+                for *_values, prefix_length, _name, addresses in new
+                for ip_address in addresses["ip_addresses"]
+            }
+        )
+        prefix_pks = self.resolve_prefixes(
+            {
+                prefix
+                for *_values, addresses in new
+                for field_name in ("ipv6_prefixes", "excluded_ipv6_prefixes")
+                for prefix in addresses[field_name]
+            }
+        )
+
+        created = []
+        for path, host_reservation, parent, _prefix_length, name, addresses in new:
+            ip_addresses = [
+                ip_address_pks[ip_address] for ip_address in addresses["ip_addresses"]
+            ]
+            values = {
+                "name": name,
+                "hw_address_id": mac_address_pks.get(addresses["hw_address"]),
+                **parent,
+                **self.get_parameters(
+                    host_reservation,
+                    HOST_RESERVATION_PARAMETERS,
+                    "reservations",
+                    HOST_RESERVATION_KEYS,
+                ),
+            }
+            relations = {
+                "client_classes": self.get_client_class_pks(
+                    host_reservation, ("client-classes",), path
+                ),
+                "ipv6_prefixes": {
+                    prefix_pks[str(prefix)] for prefix in addresses["ipv6_prefixes"]
+                },
+                "excluded_ipv6_prefixes": {
+                    prefix_pks[str(prefix)]
+                    for prefix in addresses["excluded_ipv6_prefixes"]
+                },
+            }
+            if self.is_dhcp4:
+                values["ipv4_address_id"] = ip_addresses[0] if ip_addresses else None
+            else:
+                relations["ipv6_addresses"] = set(ip_addresses)
+
+            if instance := self.build(HostReservation, path, values):
+                created.append((path, host_reservation, instance, relations))
+
+        self.create_objects(
+            HostReservation,
+            [(instance, relations) for _path, _config, instance, relations in created],
+        )
+        self.import_options(
+            [
+                (
+                    HostReservation,
+                    instance.pk,
+                    host_reservation.get("option-data"),
+                    path,
+                )
+                for path, host_reservation, instance, _relations in created
+            ]
+        )
+
+    def run(self, config):
+        self.check_permissions()
+
+        with transaction.atomic():
+            self.import_dhcp_server_objects(config)
+        self.created.update(self.chunk_created)
+        self.skipped.update(self.chunk_skipped)
+        self.processed += 1
+        yield self.progress
+
+        subnets = self.iter_subnets(config)
+        while chunk := list(islice(subnets, self.chunk_size)):
+            self.subnets.extend(self.write_chunk(self.import_subnets, chunk) or ())
+            yield self.progress
+
+        self.skip_host_reservations(config)
+
+        host_reservations = self.iter_host_reservations(config)
+        while chunk := list(islice(host_reservations, self.chunk_size)):
+            self.write_chunk(self.import_host_reservations, chunk)
+            yield self.progress
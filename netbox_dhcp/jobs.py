@@ -0,0 +1,72 @@
+from django.utils.translation import gettext as _
+
+from netbox.jobs import JobRunner
+
+from netbox_dhcp.importers import (
+    IMPORT_CHUNK_SIZE,
+    BulkImporter,
+    KeaConfigImporter,
+    parse_kea_config,
+    parse_records,
+)
+
+__all__ = (
+    "BulkImportJob",
+    "KeaImportJob",
+)
+
+
+class BulkImportJob(JobRunner):
+    class Meta:
+        name = "DHCP Bulk Import"
+
+    def run(
+        self,
+        model_name,
+        data,
+        format="auto",
+        csv_delimiter="auto",
+        chunk_size=IMPORT_CHUNK_SIZE,
+        *args,
+        **kwargs,
+    ):
+        records, headers = parse_records(data, format, csv_delimiter)
+        importer = BulkImporter(model_name, self.job.user, self.job.job_id, chunk_size)
+
+        for progress in importer.run(records, headers):
+            self.job.data = progress
+            self.job.save(update_fields=["data"])
+            self.logger.info(
+                _(
+                    "{processed} rows processed, {created} objects created, "
+                    "{failed} rows failed ({rows_per_second} rows/s)"
+                ).format(**progress)
+            )
+
+
+class KeaImportJob(JobRunner):
+    class Meta:
+        name = "Kea Configuration Import"
+
+    def run(
+        self,
+        dhcp_server,
+        data,
+        chunk_size=IMPORT_CHUNK_SIZE,
+        *args,
+        **kwargs,
+    ):
+        family, config = parse_kea_config(data)
+        importer = KeaConfigImporter(
+            dhcp_server, family, self.job.user, self.job.job_id, chunk_size
+        )
+
+        for progress in importer.run(config):
+            self.job.data = progress
+            self.job.save(update_fields=["data"])
+            self.logger.info(
+                _(
+                    "{processed} objects processed, {created} objects created, "
+                    "{failed} objects failed ({objects_per_second} objects/s)"
+                ).format(**(progress | {"created": sum(progress["created"].values())}))
+            )
@@ -0,0 +1,3 @@
+from .renderer import *
+from .delta import *
+from .options import *
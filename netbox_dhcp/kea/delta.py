@@ -0,0 +1,434 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Max, Q
+
+from core.choices import ObjectChangeActionChoices
+from core.models import ObjectChange
+from dcim.models import MACAddress
+from ipam.models import IPAddress, IPRange, Prefix
+
+from netbox_dhcp.models import (
+    DHCPServer,
+    HostReservation,
+    Option,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+from netbox_dhcp.models.dhcp_server import CONFIG_GENERATION_LOOKUPS
+
+from .renderer import KeaConfigRenderer
+
+__all__ = ("KeaConfigDelta",)
+
+
+DELTA_MODELS = (Subnet, Pool, HostReservation)
+IPAM_MODELS = (IPAddress, IPRange, MACAddress, Prefix)
+IDENTIFIER_FIELDS = (
+    ("hw_address", "hw-address"),
+    ("duid", "duid"),
+    ("circuit_id", "circuit-id"),
+    ("client_id", "client-id"),
+    ("flex_id", "flex-id"),
+)
+
+
+class KeaConfigDelta:
+    def __init__(self, dhcp_server, family, since=None, since_time=None):
+        self.dhcp_server = dhcp_server
+        self.renderer = KeaConfigRenderer(dhcp_server, family=family)
+        self.since = since
+        self.since_time = since_time
+
+    @property
+    def family(self):
+        return self.renderer.family
+
+    #
+    # Change log
+    #
+    def get_changes(self, content_types):
+        changes = ObjectChange.objects.filter(
+            changed_object_type__in=content_types.values()
+        )
+        if self.since is not None:
+            changes = changes.filter(pk__gt=self.since)
+        if self.since_time is not None:
+            changes = changes.filter(time__gt=self.since_time)
+
+        return changes.order_by("pk").values_list(
+            "pk",
+            "changed_object_type_id",
+            "changed_object_id",
+            "action",
+            "prechange_data",
+            "postchange_data",
+        )
+
+    def collapse_changes(self):
+        content_types = ContentType.objects.get_for_models(
+            *DELTA_MODELS, Option, *IPAM_MODELS
+        )
+        models = {
+            content_type.pk: model for model, content_type in content_types.items()
+        }
+
+        first_changes = {}
+        last_actions = {}
+        related = defaultdict(set)
+        reload = False
+        cursor = None
+
+        for (
+            pk,
+            content_type_id,
+            object_id,
+            action,
+            prechange_data,
+            postchange_data,
+        ) in self.get_changes(content_types).iterator():
+            cursor = pk
+            model = models[content_type_id]
+
+            if model is Option:
+                for data in (prechange_data, postchange_data):
+                    if data and data.get("assigned_object_type") is not None:
+                        related[
+                            ContentType.objects.get_for_id(
+                                data["assigned_object_type"]
+                            ).model_class()
+                        ].add(data.get("assigned_object_id"))
+                continue
+
+            if model in IPAM_MODELS:
+                # Deleting an IP address, MAC address or prefix clears the
+                # references to it without a change of the referencing object,
+                # so the objects affected can no longer be identified.
+                if action == ObjectChangeActionChoices.ACTION_DELETE:
+                    reload = reload or model is not IPRange
+                else:
+                    related[model].add(object_id)
+                continue
+
+            key = (model, object_id)
+            first_changes.setdefault(key, (action, prechange_data))
+            last_actions[key] = action
+
+        if cursor is None:
+            cursor = (
+                self.since
+                if self.since is not None
+                else ObjectChange.objects.aggregate(Max("pk"))["pk__max"]
+            )
+
+        changes = {model: {} for model in DELTA_MODELS}
+        for key, (first_action, prechange_data) in first_changes.items():
+            model, object_id = key
+
+            existed = first_action != ObjectChangeActionChoices.ACTION_CREATE
+            exists = last_actions[key] != ObjectChangeActionChoices.ACTION_DELETE
+            if not existed and not exists:
+                continue
+
+            changes[model][object_id] = prechange_data if existed else None
+
+        updates, related_reload = self.get_related_updates(related)
+
+        return changes, updates, reload or related_reload, cursor
+
+    #
+    # Related objects
+    #
+    # Options and IPAM objects are rendered as part of the subnets, pools and
+    # host reservations referencing them, so a change to them is an update of
+    # these objects. Changes to anything else referenced by the configuration
+    # of the DHCP server can only be applied by reloading it.
+    #
+    def is_referenced(self, model, pks):
+        condition = Q()
+        for lookup in CONFIG_GENERATION_LOOKUPS.get(model._meta.model_name, ()):
+            if lookup == "pk":
+                condition |= Q(pk__in=pks)
+            else:
+                condition |= Q(**{f"{lookup}__in": pks})
+
+        return bool(condition) and (
+            DHCPServer.objects.filter(condition, pk=self.dhcp_server.pk).exists()
+        )
+
+    def get_related_updates(self, related):
+        updates = {model: set(related.pop(model, ())) for model in DELTA_MODELS}
+
+        if pks := related.pop(IPAddress, None):
+            updates[HostReservation].update(
+                HostReservation.objects.filter(
+                    Q(ipv4_address__in=pks) | Q(ipv6_addresses__in=pks)
+                ).values_list("pk", flat=True)
+            )
+        if pks := related.pop(MACAddress, None):
+            updates[HostReservation].update(
+                HostReservation.objects.filter(hw_address__in=pks).values_list(
+                    "pk", flat=True
+                )
+            )
+        if pks := related.pop(IPRange, None):
+            updates[Pool].update(
+                Pool.objects.filter(ip_range__in=pks).values_list("pk", flat=True)
+            )
+
+        reload = False
+        if pks := related.pop(Prefix, None):
+            updates[Subnet].update(
+                Subnet.objects.filter(prefix__in=pks).values_list("pk", flat=True)
+            )
+            updates[HostReservation].update(
+                HostReservation.objects.filter(
+                    Q(ipv6_prefixes__in=pks) | Q(excluded_ipv6_prefixes__in=pks)
+                ).values_list("pk", flat=True)
+            )
+            reload = (
+                SharedNetwork.objects.filter(
+                    dhcp_server=self.dhcp_server, prefix__in=pks
+                ).exists()
+                or PDPool.objects.filter(
+                    Q(subnet__dhcp_server=self.dhcp_server)
+                    | Q(subnet__shared_network__dhcp_server=self.dhcp_server),
+                    Q(prefix__in=pks) | Q(excluded_prefix__in=pks),
+                ).exists()
+            )
+
+        reload = reload or any(
+            self.is_referenced(model, pks)
+            for model, pks in related.items()
+            if model is not None
+        )
+
+        return updates, reload
+
+    #
+    # Previous state
+    #
+    # Objects that were part of the configuration at the cursor position but
+    # no longer are (deleted or moved) are identified from the pre-change
+    # data of their first change after the cursor.
+    #
+    def get_previous_subnets(self, subnet_changes):
+        shared_network_ids = set(
+            SharedNetwork.objects.filter(dhcp_server=self.dhcp_server).values_list(
+                "pk", flat=True
+            )
+        )
+        current_subnets = {
+            pk: (subnet_id, prefix_id)
+            for pk, subnet_id, prefix_id in Subnet.objects.filter(
+                Q(dhcp_server=self.dhcp_server)
+                | Q(shared_network__dhcp_server=self.dhcp_server)
+            ).values_list("pk", "subnet_id", "prefix_id")
+        }
+
+        previous_subnets = {}
+        for pk, prechange_data in subnet_changes.items():
+            if not prechange_data:
+                continue
+            if (
+                prechange_data.get("dhcp_server") == self.dhcp_server.pk
+                or prechange_data.get("shared_network") in shared_network_ids
+            ):
+                previous_subnets[pk] = (
+                    prechange_data.get("subnet_id"),
+                    prechange_data.get("prefix"),
+                )
+
+        all_subnets = current_subnets | previous_subnets
+        prefixes = dict(
+            Prefix.objects.filter(
+                pk__in={prefix_id for _, prefix_id in all_subnets.values()}
+            ).values_list("pk", "prefix")
+        )
+
+        subnets = {}
+        for pk, (subnet_id, prefix_id) in all_subnets.items():
+            if (prefix := prefixes.get(prefix_id)) is not None and (
+                prefix.version != self.family
+            ):
+                continue
+            subnets[pk] = subnet_id
+
+        return subnets, previous_subnets
+
+    #
+    # Delta
+    #
+    def render(self):
+        changes, updates, reload, cursor = self.collapse_changes()
+        subnet_ids, previous_subnets = self.get_previous_subnets(changes[Subnet])
+
+        delta = {
+            "cursor": cursor,
+            "generation": self.dhcp_server.config_generation,
+            "reload": reload,
+            "subnets": self.render_subnets(
+                changes[Subnet], updates[Subnet], subnet_ids, previous_subnets
+            ),
+            "pools": self.render_pools(changes[Pool], updates[Pool], subnet_ids),
+            "reservations": self.render_host_reservations(
+                changes[HostReservation], updates[HostReservation], subnet_ids
+            ),
+        }
+
+        return delta
+
+    def render_operations(self, changes, current, render, render_previous):
+        operations = {"add": [], "update": [], "delete": []}
+
+        for obj in current:
+            if obj.pk not in changes:
+                operations["update"].append(render(obj))
+            elif (prechange_data := changes[obj.pk]) is None or render_previous(
+                obj.pk, prechange_data
+            ) is None:
+                operations["add"].append(render(obj))
+            else:
+                operations["update"].append(render(obj))
+
+        current_pks = {obj.pk for obj in current}
+        for pk, prechange_data in changes.items():
+            if pk in current_pks or prechange_data is None:
+                continue
+            if (previous := render_previous(pk, prechange_data)) is not None:
+                operations["delete"].append(previous)
+
+        return operations
+
+    def render_subnets(self, changes, updates, subnet_ids, previous_subnets):
+        current = list(
+            self.renderer.get_subnet_queryset(host_reservations=False).filter(
+                Q(dhcp_server=self.dhcp_server)
+                | Q(shared_network__dhcp_server=self.dhcp_server),
+                pk__in=changes.keys() | updates,
+            )
+        )
+
+        def render_previous(pk, prechange_data):
+            if pk not in previous_subnets or pk not in subnet_ids:
+                return None
+
+            return {
+                "id": prechange_data.get("subnet_id"),
+                "name": prechange_data.get("name"),
+            }
+
+        return self.render_operations(
+            changes,
+            current,
+            lambda subnet: self.renderer.render_subnet(subnet, host_reservations=False),
+            render_previous,
+        )
+
+    def render_pools(self, changes, updates, subnet_ids):
+        current = list(
+            self.renderer.get_pool_queryset()
+            .select_related("subnet")
+            .filter(subnet__in=subnet_ids.keys(), pk__in=changes.keys() | updates)
+        )
+
+        ip_ranges = {
+            ip_range.pk: ip_range
+            for ip_range in IPRange.objects.filter(
+                pk__in={
+                    prechange_data.get("ip_range")
+                    for prechange_data in changes.values()
+                    if prechange_data
+                }
+            )
+        }
+
+        def render_pool(pool):
+            return {
+                "subnet-id": pool.subnet.subnet_id,
+                **self.renderer.render_pool(pool),
+            }
+
+        def render_previous(pk, prechange_data):
+            if (subnet_pk := prechange_data.get("subnet")) not in subnet_ids:
+                return None
+
+            deleted = {
+                "subnet-id": subnet_ids[subnet_pk],
+                "name": prechange_data.get("name"),
+            }
+            if ip_range := ip_ranges.get(prechange_data.get("ip_range")):
+                deleted["pool"] = (
+                    f"{ip_range.start_address.ip} - {ip_range.end_address.ip}"
+                )
+
+            return deleted
+
+        return self.render_operations(changes, current, render_pool, render_previous)
+
+    def render_host_reservations(self, changes, updates, subnet_ids):
+        current = list(
+            self.renderer.get_host_reservation_queryset()
+            .select_related("subnet")
+            .filter(
+                Q(dhcp_server=self.dhcp_server) | Q(subnet__in=subnet_ids.keys()),
+                pk__in=changes.keys() | updates,
+            )
+        )
+
+        prechanges = [
+            prechange_data for prechange_data in changes.values() if prechange_data
+        ]
+        mac_addresses = dict(
+            MACAddress.objects.filter(
+                pk__in={
+                    prechange_data.get("hw_address") for prechange_data in prechanges
+                }
+            ).values_list("pk", "mac_address")
+        )
+        ip_addresses = dict(
+            IPAddress.objects.filter(
+                pk__in={
+                    prechange_data.get("ipv4_address") for prechange_data in prechanges
+                }
+            ).values_list("pk", "address")
+        )
+
+        def render_host_reservation(host_reservation):
+            return {
+                "subnet-id": (
+                    host_reservation.subnet.subnet_id if host_reservation.subnet else 0
+                ),
+                **self.renderer.render_host_reservation(host_reservation),
+            }
+
+        def render_previous(pk, prechange_data):
+            if prechange_data.get("dhcp_server") == self.dhcp_server.pk:
+                subnet_id = 0
+            elif (subnet_pk := prechange_data.get("subnet")) in subnet_ids:
+                subnet_id = subnet_ids[subnet_pk]
+            else:
+                return None
+
+            deleted = {"subnet-id": subnet_id, "name": prechange_data.get("name")}
+            for field, identifier_type in IDENTIFIER_FIELDS:
+                if field == "hw_address":
+                    identifier = mac_addresses.get(prechange_data.get(field))
+                else:
+                    identifier = prechange_data.get(field)
+
+                if identifier:
+                    deleted["identifier-type"] = identifier_type
+                    deleted["identifier"] = str(identifier)
+                    break
+            else:
+                if address := ip_addresses.get(prechange_data.get("ipv4_address")):
+                    deleted["ip-address"] = str(address.ip)
+
+            return deleted
+
+        return self.render_operations(
+            changes, current, render_host_reservation, render_previous
+        )
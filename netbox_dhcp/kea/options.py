@@ -0,0 +1,249 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+
+from netbox_dhcp.choices import OptionSendChoices
+from netbox_dhcp.models import (
+    ClientClass,
+    DHCPServer,
+    HostReservation,
+    Option,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+
+__all__ = ("KeaOptionResolver",)
+
+
+# +
+# Scopes that select client classes for the clients they serve. Options of
+# these classes rank below the shared network and above the server (the same
+# precedence Kea uses: host, pool, subnet, shared network, class, global).
+# -
+CLIENT_CLASS_SCOPE_MODELS = (
+    HostReservation,
+    Pool,
+    PDPool,
+    Subnet,
+    SharedNetwork,
+)
+
+
+def get_family(prefix):
+    return prefix.version if prefix is not None else None
+
+
+class KeaOptionResolver:
+    def __init__(self, dhcp_server):
+        self.dhcp_server = dhcp_server
+        self.content_types = ContentType.objects.get_for_models(
+            DHCPServer, ClientClass, *CLIENT_CLASS_SCOPE_MODELS
+        )
+
+    @classmethod
+    def for_object(cls, obj):
+        if isinstance(obj, DHCPServer):
+            return cls(obj)
+        if isinstance(obj, HostReservation) and obj.subnet_id is None:
+            return cls(obj.dhcp_server)
+        if isinstance(obj, (HostReservation, Pool, PDPool)):
+            return cls(obj.subnet.parent_dhcp_server)
+        if isinstance(obj, ClientClass):
+            return cls(obj.dhcp_server)
+
+        return cls(obj.parent_dhcp_server)
+
+    #
+    # Data retrieval
+    #
+    def get_scope_querysets(self):
+        subnets = Subnet.objects.filter(
+            Q(dhcp_server=self.dhcp_server)
+            | Q(shared_network__dhcp_server=self.dhcp_server)
+        )
+
+        return {
+            DHCPServer: DHCPServer.objects.filter(pk=self.dhcp_server.pk),
+            ClientClass: ClientClass.objects.filter(dhcp_server=self.dhcp_server),
+            SharedNetwork: SharedNetwork.objects.filter(dhcp_server=self.dhcp_server),
+            Subnet: subnets,
+            Pool: Pool.objects.filter(subnet__in=subnets),
+            PDPool: PDPool.objects.filter(subnet__in=subnets),
+            HostReservation: HostReservation.objects.filter(
+                Q(dhcp_server=self.dhcp_server) | Q(subnet__in=subnets)
+            ),
+        }
+
+    def get_options(self, scopes):
+        models = {
+            content_type.pk: model for model, content_type in self.content_types.items()
+        }
+        query = reduce(
+            or_,
+            (
+                Q(
+                    assigned_object_type=self.content_types[model],
+                    assigned_object_id__in=pks,
+                )
+                for model, pks in scopes.items()
+            ),
+        )
+
+        options = defaultdict(list)
+        for option in (
+            Option.objects.filter(query)
+            .select_related("definition")
+            .order_by("weight", "pk")
+        ):
+            options[
+                (models[option.assigned_object_type_id], option.assigned_object_id)
+            ].append(option)
+
+        return options
+
+    def get_client_class_memberships(self, querysets):
+        memberships = defaultdict(set)
+
+        for model in CLIENT_CLASS_SCOPE_MODELS:
+            model_name = model._meta.model_name
+            for pk, client_class_pk in model.client_classes.through.objects.filter(
+                **{f"{model_name}__in": querysets[model].values("pk")}
+            ).values_list(f"{model_name}_id", "clientclass_id"):
+                memberships[(model, pk)].add(client_class_pk)
+
+        return memberships
+
+    #
+    # Resolution
+    #
+    def merge(self, scopes, options, family=None):
+        effective = {}
+
+        for scope in scopes:
+            for option in options.get(scope, ()):
+                if family is not None and option.definition.family != family:
+                    continue
+                effective.setdefault(option.definition_id, option)
+
+        return sorted(
+            (
+                option
+                for option in effective.values()
+                if option.send_option != OptionSendChoices.NEVER_SEND
+            ),
+            key=lambda option: (
+                option.definition.space,
+                option.definition.code,
+                option.definition.name,
+            ),
+        )
+
+    def resolve(self):
+        querysets = self.get_scope_querysets()
+        options = self.get_options(
+            {model: queryset.values("pk") for model, queryset in querysets.items()}
+        )
+        memberships = self.get_client_class_memberships(querysets)
+
+        client_classes = {
+            pk: rank
+            for rank, pk in enumerate(
+                querysets[ClientClass].values_list("pk", flat=True)
+            )
+        }
+        server_scope = (DHCPServer, self.dhcp_server.pk)
+
+        def get_scopes(*scopes):
+            scope_classes = set().union(*(memberships[scope] for scope in scopes))
+
+            return [
+                *scopes,
+                *(
+                    (ClientClass, pk)
+                    for pk in sorted(
+                        scope_classes & client_classes.keys(),
+                        key=client_classes.get,
+                    )
+                ),
+                server_scope,
+            ]
+
+        effective = {server_scope: self.merge((server_scope,), options)}
+
+        for pk in client_classes:
+            scope = (ClientClass, pk)
+            effective[scope] = self.merge((scope, server_scope), options)
+
+        for pk, prefix in querysets[SharedNetwork].values_list("pk", "prefix__prefix"):
+            scope = (SharedNetwork, pk)
+            effective[scope] = self.merge(
+                get_scopes(scope), options, get_family(prefix)
+            )
+
+        subnets = {}
+        for pk, shared_network_pk, prefix in querysets[Subnet].values_list(
+            "pk", "shared_network_id", "prefix__prefix"
+        ):
+            scopes = [(Subnet, pk)]
+            if shared_network_pk is not None:
+                scopes.append((SharedNetwork, shared_network_pk))
+            subnets[pk] = (scopes, get_family(prefix))
+
+            effective[scopes[0]] = self.merge(
+                get_scopes(*scopes), options, get_family(prefix)
+            )
+
+        for model in (Pool, PDPool, HostReservation):
+            for pk, subnet_pk in querysets[model].values_list("pk", "subnet_id"):
+                scopes, family = subnets.get(subnet_pk, ((), None))
+                scope = (model, pk)
+
+                effective[scope] = self.merge(
+                    get_scopes(scope, *scopes), options, family
+                )
+
+        return effective
+
+    def resolve_object(self, obj):
+        scopes = []
+        family = None
+
+        if isinstance(obj, (HostReservation, Pool, PDPool)):
+            scopes.append((obj._meta.model, obj.pk))
+            obj = obj.subnet
+        if isinstance(obj, Subnet):
+            scopes.append((Subnet, obj.pk))
+            family = obj.family
+            if obj.shared_network_id is not None:
+                scopes.append((SharedNetwork, obj.shared_network_id))
+        elif isinstance(obj, SharedNetwork):
+            scopes.append((SharedNetwork, obj.pk))
+            family = obj.family
+        elif isinstance(obj, ClientClass):
+            scopes.append((ClientClass, obj.pk))
+
+        if class_scopes := [
+            Q(**{f"{model._meta.model_name}_set": pk})
+            for model, pk in scopes
+            if model in CLIENT_CLASS_SCOPE_MODELS
+        ]:
+            scopes.extend(
+                (ClientClass, pk)
+                for pk in ClientClass.objects.filter(
+                    reduce(or_, class_scopes), dhcp_server=self.dhcp_server
+                )
+                .values_list("pk", flat=True)
+                .distinct()
+            )
+        scopes.append((DHCPServer, self.dhcp_server.pk))
+
+        scope_pks = defaultdict(list)
+        for model, pk in scopes:
+            scope_pks[model].append(pk)
+
+        return self.merge(scopes, self.get_options(scope_pks), family)
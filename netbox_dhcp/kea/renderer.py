@@ -0,0 +1,667 @@
+import json
+import re
+from decimal import Decimal
+
+from django.db.models import Prefetch
+
+from ipam.choices import IPAddressFamilyChoices
+
+from netbox_dhcp.choices import OptionSendChoices
+from netbox_dhcp.models import (
+    ClientClass,
+    DHCPServerInterface,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+
+__all__ = ("KeaConfigRenderer",)
+
+
+STREAM_CHUNK_SIZE = 2000
+STREAM_BUFFER_SIZE = 65536
+
+
+BOOTP_PARAMETERS = (
+    "next_server",
+    "server_hostname",
+    "boot_file_name",
+)
+LIFETIME_PARAMETERS = (
+    "offer_lifetime",
+    "valid_lifetime",
+    "min_valid_lifetime",
+    "max_valid_lifetime",
+    "preferred_lifetime",
+    "min_preferred_lifetime",
+    "max_preferred_lifetime",
+)
+LEASE_PARAMETERS = (
+    "renew_timer",
+    "rebind_timer",
+    "match_client_id",
+    "authoritative",
+    "reservations_global",
+    "reservations_out_of_pool",
+    "reservations_in_subnet",
+    "calculate_tee_times",
+    "t1_percent",
+    "t2_percent",
+    "cache_threshold",
+    "cache_max_age",
+    "adaptive_lease_time_threshold",
+    "store_extended_info",
+    "allocator",
+    "pd_allocator",
+)
+DDNS_PARAMETERS = (
+    "ddns_send_updates",
+    "ddns_override_no_update",
+    "ddns_override_client_update",
+    "ddns_replace_client_name",
+    "ddns_generated_prefix",
+    "ddns_qualifying_suffix",
+    "ddns_update_on_renew",
+    "ddns_conflict_resolution_mode",
+    "ddns_ttl_percent",
+    "ddns_ttl",
+    "ddns_ttl_min",
+    "ddns_ttl_max",
+    "hostname_char_set",
+    "hostname_char_replacement",
+)
+NETWORK_PARAMETERS = (
+    "interface_id",
+    "rapid_commit",
+)
+
+SERVER_PARAMETERS = (
+    "decline_probation_period",
+    "echo_client_id",
+    *BOOTP_PARAMETERS,
+    *LIFETIME_PARAMETERS,
+    *LEASE_PARAMETERS,
+    *DDNS_PARAMETERS,
+)
+SHARED_NETWORK_PARAMETERS = (
+    *BOOTP_PARAMETERS,
+    *LIFETIME_PARAMETERS,
+    *LEASE_PARAMETERS,
+    *DDNS_PARAMETERS,
+    *NETWORK_PARAMETERS,
+)
+SUBNET_PARAMETERS = SHARED_NETWORK_PARAMETERS
+POOL_PARAMETERS = DDNS_PARAMETERS
+CLIENT_CLASS_PARAMETERS = (
+    "only_in_additional_list",
+    *BOOTP_PARAMETERS,
+    *LIFETIME_PARAMETERS,
+)
+HOST_RESERVATION_PARAMETERS = (
+    "duid",
+    "circuit_id",
+    "client_id",
+    "flex_id",
+    "hostname",
+    *BOOTP_PARAMETERS,
+)
+
+DHCP4_ONLY_PARAMETERS = {
+    "echo_client_id",
+    "next_server",
+    "server_hostname",
+    "boot_file_name",
+    "offer_lifetime",
+    "match_client_id",
+    "authoritative",
+    "circuit_id",
+    "client_id",
+}
+DHCP6_ONLY_PARAMETERS = {
+    "preferred_lifetime",
+    "min_preferred_lifetime",
+    "max_preferred_lifetime",
+    "pd_allocator",
+    "interface_id",
+    "rapid_commit",
+}
+
+
+class KeaConfigRenderer:
+    def __init__(self, dhcp_server, family=IPAddressFamilyChoices.FAMILY_4):
+        self.dhcp_server = dhcp_server
+        self.family = int(family)
+
+    @property
+    def is_dhcp4(self):
+        return self.family == IPAddressFamilyChoices.FAMILY_4
+
+    @property
+    def root_key(self):
+        return "Dhcp4" if self.is_dhcp4 else "Dhcp6"
+
+    @property
+    def subnet_key(self):
+        return "subnet4" if self.is_dhcp4 else "subnet6"
+
+    #
+    # Query plan
+    #
+    # Every relation of the configuration tree is fetched by a single
+    # prefetch pass, so the number of queries is independent of the
+    # number of objects assigned to the DHCP server.
+    #
+    def option_prefetch(self, lookup="options"):
+        return Prefetch(
+            lookup,
+            queryset=Option.objects.filter(definition__family=self.family)
+            .select_related("definition")
+            .prefetch_related("client_classes"),
+        )
+
+    def server_interface_prefetch(self):
+        return Prefetch(
+            "server_interfaces",
+            queryset=DHCPServerInterface.objects.with_names(),
+        )
+
+    def get_host_reservation_queryset(self):
+        queryset = HostReservation.objects.select_related(
+            "hw_address",
+            "ipv4_address",
+        ).prefetch_related(
+            "client_classes",
+            self.option_prefetch(),
+        )
+
+        if not self.is_dhcp4:
+            queryset = queryset.prefetch_related(
+                "ipv6_addresses",
+                "ipv6_prefixes",
+                "excluded_ipv6_prefixes",
+            )
+
+        return queryset
+
+    def get_pool_queryset(self):
+        return Pool.objects.select_related("ip_range").prefetch_related(
+            "client_classes",
+            "evaluate_additional_classes",
+            self.option_prefetch(),
+        )
+
+    def get_pd_pool_queryset(self):
+        return PDPool.objects.select_related(
+            "prefix",
+            "excluded_prefix",
+        ).prefetch_related(
+            "client_classes",
+            "evaluate_additional_classes",
+            self.option_prefetch(),
+        )
+
+    def get_subnet_queryset(self, host_reservations=True):
+        queryset = (
+            Subnet.objects.filter(prefix__prefix__family=self.family)
+            .select_related("prefix")
+            .prefetch_related(
+                "client_classes",
+                "evaluate_additional_classes",
+                self.server_interface_prefetch(),
+                self.option_prefetch(),
+                Prefetch("child_pools", queryset=self.get_pool_queryset()),
+            )
+        )
+
+        if not self.is_dhcp4:
+            queryset = queryset.prefetch_related(
+                Prefetch("child_pd_pools", queryset=self.get_pd_pool_queryset())
+            )
+
+        if host_reservations:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "child_host_reservations",
+                    queryset=self.get_host_reservation_queryset(),
+                )
+            )
+
+        return queryset
+
+    def get_subnets(self, host_reservations=True):
+        return self.get_subnet_queryset(host_reservations).filter(
+            dhcp_server=self.dhcp_server
+        )
+
+    def get_shared_networks(self, host_reservations=True):
+        return (
+            SharedNetwork.objects.filter(
+                dhcp_server=self.dhcp_server,
+                prefix__prefix__family=self.family,
+            )
+            .select_related("prefix")
+            .prefetch_related(
+                "client_classes",
+                "evaluate_additional_classes",
+                self.server_interface_prefetch(),
+                self.option_prefetch(),
+                Prefetch(
+                    "child_subnets",
+                    queryset=self.get_subnet_queryset(host_reservations),
+                ),
+            )
+        )
+
+    def get_global_host_reservations(self):
+        return self.get_host_reservation_queryset().filter(dhcp_server=self.dhcp_server)
+
+    def get_client_classes(self):
+        return ClientClass.objects.filter(
+            dhcp_server=self.dhcp_server
+        ).prefetch_related(
+            self.option_prefetch(),
+            Prefetch(
+                "option_definitions",
+                queryset=OptionDefinition.objects.filter(family=self.family),
+            ),
+        )
+
+    def get_option_definitions(self):
+        return OptionDefinition.objects.filter(
+            dhcp_server=self.dhcp_server,
+            family=self.family,
+        )
+
+    def get_options(self):
+        return (
+            self.dhcp_server.options.filter(definition__family=self.family)
+            .select_related("definition")
+            .prefetch_related("client_classes")
+        )
+
+    #
+    # Rendering
+    #
+    def render(self):
+        return {self.root_key: self.render_dhcp_server()}
+
+    def render_parameters(self, obj, parameters):
+        excluded = DHCP6_ONLY_PARAMETERS if self.is_dhcp4 else DHCP4_ONLY_PARAMETERS
+
+        config = {}
+        for parameter in parameters:
+            if parameter in excluded:
+                continue
+
+            value = getattr(obj, parameter, None)
+            if value is None or value == "":
+                continue
+            if isinstance(value, Decimal):
+                value = float(value)
+
+            config[parameter.replace("_", "-")] = value
+
+        return config
+
+    def render_client_class_names(self, config, key, client_classes):
+        if names := [client_class.name for client_class in client_classes]:
+            config[key] = names
+
+    def render_options(self, config, options):
+        if option_data := [self.render_option(option) for option in options]:
+            config["option-data"] = option_data
+
+    def render_relay(self, config, relay):
+        if relay and (addresses := re.split(r"[\s,]+", relay.strip())):
+            config["relay"] = {"ip-addresses": addresses}
+
+    def render_interface(self, config, server_interfaces):
+        for server_interface in server_interfaces:
+            config["interface"] = str(server_interface)
+            break
+
+    def render_dhcp_server(self):
+        config = self.render_dhcp_server_parameters()
+
+        config[self.subnet_key] = [
+            self.render_subnet(subnet) for subnet in self.get_subnets()
+        ]
+        config["shared-networks"] = [
+            self.render_shared_network(shared_network)
+            for shared_network in self.get_shared_networks()
+        ]
+        config["reservations"] = [
+            self.render_host_reservation(host_reservation)
+            for host_reservation in self.get_global_host_reservations()
+        ]
+
+        return config
+
+    def render_dhcp_server_parameters(self):
+        dhcp_server = self.dhcp_server
+
+        config = self.render_parameters(dhcp_server, SERVER_PARAMETERS)
+
+        if interfaces := [
+            str(interface) for interface in dhcp_server.interfaces.with_names()
+        ]:
+            config["interfaces-config"] = {"interfaces": interfaces}
+        if dhcp_server.host_reservation_identifiers:
+            config["host-reservation-identifiers"] = list(
+                dhcp_server.host_reservation_identifiers
+            )
+        if not self.is_dhcp4:
+            if dhcp_server.relay_supplied_options:
+                config["relay-supplied-options"] = [
+                    str(option) for option in dhcp_server.relay_supplied_options
+                ]
+            if dhcp_server.server_id:
+                config["server-id"] = {"type": dhcp_server.server_id}
+
+        if client_classes := [
+            self.render_client_class(client_class)
+            for client_class in self.get_client_classes()
+        ]:
+            config["client-classes"] = client_classes
+        if option_definitions := [
+            self.render_option_definition(option_definition)
+            for option_definition in self.get_option_definitions()
+        ]:
+            config["option-def"] = option_definitions
+        self.render_options(config, self.get_options())
+
+        return config
+
+    def render_client_class(self, client_class):
+        config = {
+            "name": client_class.name,
+            **self.render_parameters(client_class, CLIENT_CLASS_PARAMETERS),
+        }
+
+        if client_class.test:
+            config["test"] = client_class.test
+        if client_class.template_test:
+            config["template-test"] = client_class.template_test
+        if option_definitions := [
+            self.render_option_definition(option_definition)
+            for option_definition in client_class.option_definitions.all()
+        ]:
+            config["option-def"] = option_definitions
+        self.render_options(config, client_class.options.all())
+
+        return config
+
+    def render_option_definition(self, option_definition):
+        config = {
+            "name": option_definition.name,
+            "code": option_definition.code,
+            "space": option_definition.space,
+            "type": option_definition.type,
+        }
+
+        if option_definition.record_types:
+            config["record-types"] = ", ".join(option_definition.record_types)
+        if option_definition.array is not None:
+            config["array"] = option_definition.array
+        if option_definition.encapsulate:
+            config["encapsulate"] = option_definition.encapsulate
+
+        return config
+
+    def render_option(self, option):
+        definition = option.definition
+
+        config = {
+            "name": definition.name,
+            "code": definition.code,
+            "space": definition.space,
+            "data": option.data,
+        }
+
+        if option.csv_format is not None:
+            config["csv-format"] = option.csv_format
+        if option.send_option == OptionSendChoices.ALWAYS_SEND:
+            config["always-send"] = True
+        elif option.send_option == OptionSendChoices.NEVER_SEND:
+            config["never-send"] = True
+        self.render_client_class_names(
+            config, "client-classes", option.client_classes.all()
+        )
+
+        return config
+
+    def render_shared_network(self, shared_network, subnets=True):
+        config = {
+            "name": shared_network.name,
+            **self.render_parameters(shared_network, SHARED_NETWORK_PARAMETERS),
+        }
+
+        self.render_relay(config, shared_network.relay)
+        self.render_interface(config, shared_network.server_interfaces.all())
+        self.render_client_class_names(
+            config, "client-classes", shared_network.client_classes.all()
+        )
+        self.render_client_class_names(
+            config,
+            "evaluate-additional-classes",
+            shared_network.evaluate_additional_classes.all(),
+        )
+        self.render_options(config, shared_network.options.all())
+
+        if subnets:
+            config[self.subnet_key] = [
+                self.render_subnet(subnet)
+                for subnet in shared_network.child_subnets.all()
+            ]
+
+        return config
+
+    def render_subnet(self, subnet, host_reservations=True):
+        config = {
+            "id": subnet.subnet_id,
+            "subnet": str(subnet.prefix.prefix),
+            **self.render_parameters(subnet, SUBNET_PARAMETERS),
+        }
+
+        self.render_relay(config, subnet.relay)
+        self.render_interface(config, subnet.server_interfaces.all())
+        self.render_client_class_names(
+            config, "client-classes", subnet.client_classes.all()
+        )
+        self.render_client_class_names(
+            config,
+            "evaluate-additional-classes",
+            subnet.evaluate_additional_classes.all(),
+        )
+        self.render_options(config, subnet.options.all())
+
+        config["pools"] = [self.render_pool(pool) for pool in subnet.child_pools.all()]
+        if not self.is_dhcp4:
+            config["pd-pools"] = [
+                self.render_pd_pool(pd_pool) for pd_pool in subnet.child_pd_pools.all()
+            ]
+
+        if host_reservations:
+            config["reservations"] = [
+                self.render_host_reservation(host_reservation)
+                for host_reservation in subnet.child_host_reservations.all()
+            ]
+
+        return config
+
+    def render_pool(self, pool):
+        ip_range = pool.ip_range
+
+        config = {
+            "pool": f"{ip_range.start_address.ip} - {ip_range.end_address.ip}",
+            **self.render_parameters(pool, POOL_PARAMETERS),
+        }
+
+        if pool.pool_id is not None:
+            config["pool-id"] = pool.pool_id
+        self.render_client_class_names(
+            config, "client-classes", pool.client_classes.all()
+        )
+        self.render_client_class_names(
+            config,
+            "evaluate-additional-classes",
+            pool.evaluate_additional_classes.all(),
+        )
+        self.render_options(config, pool.options.all())
+
+        return config
+
+    def render_pd_pool(self, pd_pool):
+        prefix = pd_pool.prefix.prefix
+
+        config = {
+            "prefix": str(prefix.network),
+            "prefix-len": prefix.prefixlen,
+            "delegated-len": pd_pool.delegated_length,
+        }
+
+        if pd_pool.excluded_prefix is not None:
+            excluded_prefix = pd_pool.excluded_prefix.prefix
+            config["excluded-prefix"] = str(excluded_prefix.network)
+            config["excluded-prefix-len"] = excluded_prefix.prefixlen
+        if pd_pool.pool_id is not None:
+            config["pool-id"] = pd_pool.pool_id
+        self.render_client_class_names(
+            config, "client-classes", pd_pool.client_classes.all()
+        )
+        self.render_client_class_names(
+            config,
+            "evaluate-additional-classes",
+            pd_pool.evaluate_additional_classes.all(),
+        )
+        self.render_options(config, pd_pool.options.all())
+
+        return config
+
+    def render_host_reservation(self, host_reservation):
+        config = {}
+
+        if host_reservation.hw_address is not None:
+            config["hw-address"] = str(host_reservation.hw_address.mac_address)
+        config.update(
+            self.render_parameters(host_reservation, HOST_RESERVATION_PARAMETERS)
+        )
+
+        if self.is_dhcp4:
+            if host_reservation.ipv4_address is not None:
+                config["ip-address"] = str(host_reservation.ipv4_address.address.ip)
+        else:
+            if ip_addresses := [
+                str(ip_address.address.ip)
+                for ip_address in host_reservation.ipv6_addresses.all()
+            ]:
+                config["ip-addresses"] = ip_addresses
+            if prefixes := [
+                str(prefix.prefix) for prefix in host_reservation.ipv6_prefixes.all()
+            ]:
+                config["prefixes"] = prefixes
+            if excluded_prefixes := [
+                str(prefix.prefix)
+                for prefix in host_reservation.excluded_ipv6_prefixes.all()
+            ]:
+                config["excluded-prefixes"] = excluded_prefixes
+
+        self.render_client_class_names(
+            config, "client-classes", host_reservation.client_classes.all()
+        )
+        self.render_options(config, host_reservation.options.all())
+
+        return config
+
+    #
+    # Streaming
+    #
+    # The streaming variant emits the same document as render(), but reads
+    # host reservations through server-side cursors and writes them out as
+    # they arrive, so memory usage does not depend on the number of host
+    # reservations.
+    #
+    def stream(self, chunk_size=STREAM_CHUNK_SIZE, buffer_size=STREAM_BUFFER_SIZE):
+        buffer = []
+        buffered = 0
+
+        for piece in self.stream_dhcp_server(chunk_size):
+            buffer.append(piece)
+            buffered += len(piece)
+
+            if buffered >= buffer_size:
+                yield "".join(buffer)
+                buffer = []
+                buffered = 0
+
+        if buffer:
+            yield "".join(buffer)
+
+    def stream_dhcp_server(self, chunk_size):
+        yield f"{{{json.dumps(self.root_key)}: "
+        yield from self.stream_object(
+            self.render_dhcp_server_parameters(),
+            {
+                self.subnet_key: self.stream_subnets(
+                    self.get_subnets(host_reservations=False), chunk_size
+                ),
+                "shared-networks": (
+                    self.stream_shared_network(shared_network, chunk_size)
+                    for shared_network in self.get_shared_networks(
+                        host_reservations=False
+                    )
+                ),
+                "reservations": self.stream_host_reservations(
+                    self.get_global_host_reservations(), chunk_size
+                ),
+            },
+        )
+        yield "}"
+
+    def stream_object(self, config, collections):
+        yield json.dumps(config)[:-1]
+
+        separator = ", " if config else ""
+        for key, items in collections.items():
+            yield f"{separator}{json.dumps(key)}: ["
+
+            item_separator = ""
+            for item in items:
+                yield item_separator
+                yield from item
+                item_separator = ", "
+
+            yield "]"
+            separator = ", "
+
+        yield "}"
+
+    def stream_shared_network(self, shared_network, chunk_size):
+        return self.stream_object(
+            self.render_shared_network(shared_network, subnets=False),
+            {
+                self.subnet_key: self.stream_subnets(
+                    shared_network.child_subnets.all(), chunk_size
+                ),
+            },
+        )
+
+    def stream_subnets(self, subnets, chunk_size):
+        for subnet in subnets:
+            yield self.stream_object(
+                self.render_subnet(subnet, host_reservations=False),
+                {
+                    "reservations": self.stream_host_reservations(
+                        self.get_host_reservation_queryset().filter(subnet=subnet),
+                        chunk_size,
+                    ),
+                },
+            )
+
+    def stream_host_reservations(self, host_reservations, chunk_size):
+        for host_reservation in host_reservations.iterator(chunk_size=chunk_size):
+            yield (json.dumps(self.render_host_reservation(host_reservation)),)
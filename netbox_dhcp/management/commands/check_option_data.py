@@ -0,0 +1,108 @@
+from collections import defaultdict, namedtuple
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_dhcp.models import Option, OptionDefinition
+from netbox_dhcp.utilities import validate_option_size
+
+OptionData = namedtuple(
+    "OptionData",
+    (
+        "pk",
+        "definition",
+        "data",
+        "csv_format",
+        "assigned_object_type_id",
+        "assigned_object_id",
+    ),
+)
+
+
+class Command(BaseCommand):
+    help = "Encode all DHCP options to wire format and report invalid or oversized ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--family",
+            type=int,
+            choices=(4, 6),
+            help="Only check options of the given address family",
+        )
+
+    def handle(self, *args, **options):
+        definitions = OptionDefinition.objects.in_bulk()
+        if options["family"] is not None:
+            definitions = {
+                pk: definition
+                for pk, definition in definitions.items()
+                if definition.family == options["family"]
+            }
+
+        option_data = [
+            OptionData(pk, definitions[definition_id], *values)
+            for pk, definition_id, *values in Option.objects.filter(
+                definition__in=definitions.keys()
+            )
+            .values_list(
+                "pk",
+                "definition_id",
+                "data",
+                "csv_format",
+                "assigned_object_type_id",
+                "assigned_object_id",
+            )
+            .iterator(chunk_size=2000)
+        ]
+
+        encapsulated_spaces = {
+            definition.encapsulate
+            for definition in definitions.values()
+            if definition.encapsulate
+        }
+        suboptions = defaultdict(list)
+        for option in option_data:
+            if option.definition.space in encapsulated_spaces:
+                suboptions[
+                    (
+                        option.assigned_object_type_id,
+                        option.assigned_object_id,
+                        option.definition.space,
+                    )
+                ].append(option)
+
+        errors = 0
+        for option in option_data:
+            try:
+                size = validate_option_size(
+                    option,
+                    suboptions.get(
+                        (
+                            option.assigned_object_type_id,
+                            option.assigned_object_id,
+                            option.definition.encapsulate,
+                        ),
+                        (),
+                    ),
+                )
+            except ValidationError as exc:
+                errors += 1
+                for message in exc.message_dict["data"]:
+                    self.stdout.write(
+                        self.style.ERROR(
+                            f"Option {option.pk} ({option.definition}): {message}"
+                        )
+                    )
+                continue
+
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"Option {option.pk} ({option.definition}): {size} octets"
+                )
+
+        if errors:
+            raise CommandError(f"{errors} of {len(option_data)} options are invalid")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"All {len(option_data)} options are valid")
+        )
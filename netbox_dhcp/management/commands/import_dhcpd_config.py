@@ -0,0 +1,63 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import CommandError
+
+from ipam.choices import IPAddressFamilyChoices
+
+from netbox_dhcp.importers import IMPORT_CHUNK_SIZE, DhcpdConfigImporter
+
+from .import_kea_config import Command as KeaImportCommand
+
+
+class Command(KeaImportCommand):
+    help = "Import an ISC dhcpd or dhcpd6 configuration into a DHCP server"
+
+    def add_arguments(self, parser):
+        parser.add_argument("config_file", help="dhcpd configuration file")
+        parser.add_argument(
+            "--dhcp-server",
+            required=True,
+            help="Name of the DHCP server to import into, created if necessary",
+        )
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="User the imported objects are created and logged as",
+        )
+        parser.add_argument(
+            "--family",
+            type=int,
+            choices=(IPAddressFamilyChoices.FAMILY_4, IPAddressFamilyChoices.FAMILY_6),
+            default=IPAddressFamilyChoices.FAMILY_4,
+            help="Address family of the configuration, 6 for dhcpd -6",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help="Number of subnets or host reservations written per transaction",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        importer = DhcpdConfigImporter(
+            options["dhcp_server"],
+            options["family"],
+            user,
+            uuid.uuid4(),
+            options["chunk_size"],
+        )
+        try:
+            with open(
+                options["config_file"], encoding="utf-8", errors="replace"
+            ) as config_file:
+                self.run_importer(importer.run(config_file), options["verbosity"])
+        except OSError as exc:
+            raise CommandError(f"Cannot read {options['config_file']}: {exc}")
+        except ValueError as exc:
+            raise CommandError(f"Invalid dhcpd configuration: {exc}")
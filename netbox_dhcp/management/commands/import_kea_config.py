@@ -0,0 +1,115 @@
+import sys
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from netbox_dhcp.importers import (
+    IMPORT_CHUNK_SIZE,
+    KeaConfigImporter,
+    parse_kea_config,
+)
+from netbox_dhcp.jobs import KeaImportJob
+
+
+class Command(BaseCommand):
+    help = "Import a Kea DHCPv4 or DHCPv6 configuration into a DHCP server"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "config_file",
+            help="Kea configuration file, or - to read from standard input",
+        )
+        parser.add_argument(
+            "--dhcp-server",
+            required=True,
+            help="Name of the DHCP server to import into, created if necessary",
+        )
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="User the imported objects are created and logged as",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help="Number of subnets or host reservations written per transaction",
+        )
+        parser.add_argument(
+            "--background",
+            action="store_true",
+            help="Enqueue the import as a background job instead of running it",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist")
+
+        if options["config_file"] == "-":
+            data = sys.stdin.read()
+        else:
+            try:
+                with open(options["config_file"], encoding="utf-8") as config_file:
+                    data = config_file.read()
+            except OSError as exc:
+                raise CommandError(f"Cannot read {options['config_file']}: {exc}")
+
+        try:
+            family, config = parse_kea_config(data)
+        except ValueError as exc:
+            raise CommandError(f"Invalid Kea configuration: {exc}")
+
+        if options["background"]:
+            job = KeaImportJob.enqueue(
+                user=user,
+                dhcp_server=options["dhcp_server"],
+                data=data,
+                chunk_size=options["chunk_size"],
+            )
+            self.stdout.write(self.style.SUCCESS(f"Enqueued import as job {job.pk}"))
+            return
+
+        importer = KeaConfigImporter(
+            options["dhcp_server"], family, user, uuid.uuid4(), options["chunk_size"]
+        )
+        self.run_importer(importer.run(config), options["verbosity"])
+
+    def run_importer(self, steps, verbosity):
+        try:
+            for progress in steps:
+                if verbosity > 1:
+                    self.stdout.write(
+                        f"{progress['processed']} objects processed, "
+                        f"{sum(progress['created'].values())} objects created "
+                        f"({progress['objects_per_second']} objects/s)"
+                    )
+        except (PermissionDenied, ValidationError) as exc:
+            raise CommandError(f"Import failed: {exc}")
+
+        for label, count in sorted(progress["created"].items()):
+            self.stdout.write(f"{label}: {count} created")
+        for label, count in sorted(progress["skipped"].items()):
+            self.stdout.write(f"{label}: {count} already present")
+        for key in progress["ignored_keys"]:
+            self.stdout.write(self.style.WARNING(f"Ignored configuration key {key}"))
+        for error in progress["errors"]:
+            for message in error["errors"]:
+                self.stdout.write(self.style.ERROR(f"{error['path']}: {message}"))
+
+        if progress["failed"]:
+            raise CommandError(
+                f"{progress['failed']} objects could not be imported "
+                f"in {progress['elapsed']} seconds"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {sum(progress['created'].values())} objects in "
+                f"{progress['elapsed']} seconds "
+                f"({progress['objects_per_second']} objects/s)"
+            )
+        )
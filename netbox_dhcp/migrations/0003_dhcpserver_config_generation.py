@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dhcp", "0002_import_option_definitions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dhcpserver",
+            name="config_generation",
+            field=models.PositiveBigIntegerField(
+                default=0, editable=False, verbose_name="Configuration Generation"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dhcp", "0003_dhcpserver_config_generation"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE SEQUENCE netbox_dhcp_subnet_subnet_id_seq MINVALUE 1 "
+                "OWNED BY netbox_dhcp_subnet.subnet_id;"
+                "SELECT setval('netbox_dhcp_subnet_subnet_id_seq', "
+                "COALESCE((SELECT MAX(subnet_id) FROM netbox_dhcp_subnet), 0) + 1, "
+                "false);"
+            ),
+            reverse_sql="DROP SEQUENCE IF EXISTS netbox_dhcp_subnet_subnet_id_seq;",
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+
+def assign_pool_ids(apps, schema_editor):
+    Subnet = apps.get_model("netbox_dhcp", "Subnet")
+    Pool = apps.get_model("netbox_dhcp", "Pool")
+    PDPool = apps.get_model("netbox_dhcp", "PDPool")
+    db_alias = schema_editor.connection.alias
+
+    for subnet in Subnet.objects.using(db_alias).all():
+        pools = Pool.objects.using(db_alias).filter(subnet=subnet)
+        pd_pools = PDPool.objects.using(db_alias).filter(subnet=subnet)
+
+        last_pool_id = max(
+            pools.aggregate(models.Max("pool_id"))["pool_id__max"] or 0,
+            pd_pools.aggregate(models.Max("pool_id"))["pool_id__max"] or 0,
+        )
+
+        for model, queryset in ((Pool, pools), (PDPool, pd_pools)):
+            unassigned = list(queryset.filter(pool_id__isnull=True).order_by("pk"))
+            for pool in unassigned:
+                last_pool_id += 1
+                pool.pool_id = last_pool_id
+            model.objects.using(db_alias).bulk_update(unassigned, ["pool_id"])
+
+        Subnet.objects.using(db_alias).filter(pk=subnet.pk).update(
+            _last_pool_id=last_pool_id
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dhcp", "0004_subnet_id_sequence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subnet",
+            name="_last_pool_id",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(assign_pool_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,106 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dhcp", "0005_pool_id_allocation"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="option",
+            index=models.Index(
+                fields=["assigned_object_type", "assigned_object_id", "weight"],
+                name="option_assigned_object",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hostreservation",
+            index=models.Index(
+                condition=models.Q(("duid__isnull", False)),
+                fields=["duid"],
+                name="host_reservation_duid",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hostreservation",
+            index=models.Index(
+                condition=models.Q(("client_id__isnull", False)),
+                fields=["client_id"],
+                name="host_reservation_client_id",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hostreservation",
+            index=models.Index(
+                condition=models.Q(("circuit_id__isnull", False)),
+                fields=["circuit_id"],
+                name="host_reservation_circuit_id",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="hostreservation",
+            index=models.Index(
+                condition=models.Q(("flex_id__isnull", False)),
+                fields=["flex_id"],
+                name="host_reservation_flex_id",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subnet",
+            index=models.Index(
+                fields=["-weight", "name"],
+                name="subnet_weight_name",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pool",
+            index=models.Index(
+                fields=["-weight", "name"],
+                name="pool_weight_name",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pdpool",
+            index=models.Index(
+                fields=["-weight", "name"],
+                name="pd_pool_weight_name",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sharednetwork",
+            index=models.Index(
+                fields=["-weight", "name"],
+                name="shared_network_weight_name",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="clientclass",
+            index=models.Index(
+                fields=["-weight", "name"],
+                name="client_class_weight_name",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dhcpserver",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["host_reservation_identifiers"],
+                name="dhcp_server_hr_identifiers",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="dhcpserver",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["relay_supplied_options"],
+                name="dhcp_server_relay_options",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="optiondefinition",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["record_types"],
+                name="option_definition_record_types",
+            ),
+        ),
+    ]
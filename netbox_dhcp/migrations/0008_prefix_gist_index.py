@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+# +
+# The containment filters on subnets, shared networks and prefix delegation
+# pools join to the IPAM prefix table, which has no index supporting the inet
+# containment operators. The GiST index is created (and dropped) by this
+# plugin under its own name.
+# -
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ipam", "0086_gfk_indexes"),
+        ("netbox_dhcp", "0007_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS netbox_dhcp_ipam_prefix_gist "
+                "ON ipam_prefix USING gist (prefix inet_ops)"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS netbox_dhcp_ipam_prefix_gist",
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations, models
+
+
+# +
+# Pool IDs assigned by hand may have been duplicated within a subnet. All but
+# the oldest pool of each duplicate get a new ID from the subnet's counter so
+# that the unique constraints can be added.
+# -
+def renumber_duplicate_pool_ids(apps, schema_editor):
+    Subnet = apps.get_model("netbox_dhcp", "Subnet")
+    db_alias = schema_editor.connection.alias
+
+    for model_name in ("Pool", "PDPool"):
+        model = apps.get_model("netbox_dhcp", model_name)
+        duplicates = (
+            model.objects.using(db_alias)
+            .values("subnet", "pool_id")
+            .annotate(count=models.Count("pk"), first_pk=models.Min("pk"))
+            .filter(count__gt=1, pool_id__isnull=False)
+        )
+
+        for duplicate in duplicates:
+            pools = list(
+                model.objects.using(db_alias)
+                .filter(subnet=duplicate["subnet"], pool_id=duplicate["pool_id"])
+                .exclude(pk=duplicate["first_pk"])
+                .order_by("pk")
+            )
+            subnet = Subnet.objects.using(db_alias).get(pk=duplicate["subnet"])
+            for pool in pools:
+                subnet._last_pool_id += 1
+                pool.pool_id = subnet._last_pool_id
+            model.objects.using(db_alias).bulk_update(pools, ["pool_id"])
+            subnet.save(update_fields=["_last_pool_id"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("netbox_dhcp", "0008_prefix_gist_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(renumber_duplicate_pool_ids, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="pool",
+            constraint=models.UniqueConstraint(
+                fields=("subnet", "pool_id"), name="pool_unique_subnet_pool_id"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="pdpool",
+            constraint=models.UniqueConstraint(
+                fields=("subnet", "pool_id"), name="pd_pool_unique_subnet_pool_id"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+# +
+# DHCP servers are searched by the names of their devices and virtual
+# machines. The core tables have no index supporting substring matches on
+# these names, so trigram indexes matching the expression Django uses for
+# icontains lookups are created (and dropped) by this plugin under its own
+# names.
+# -
+class Migration(migrations.Migration):
+    dependencies = [
+        ("dcim", "0225_gfk_indexes"),
+        ("virtualization", "0052_gfk_indexes"),
+        ("netbox_dhcp", "0009_pool_unique_pool_id"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS netbox_dhcp_dcim_device_name_trgm "
+                "ON dcim_device USING gin ((UPPER(name::text)) gin_trgm_ops)"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS netbox_dhcp_dcim_device_name_trgm",
+        ),
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX IF NOT EXISTS netbox_dhcp_virtualmachine_name_trgm "
+                "ON virtualization_virtualmachine "
+                "USING gin ((UPPER(name::text)) gin_trgm_ops)"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS netbox_dhcp_virtualmachine_name_trgm",
+        ),
+    ]
@@ -5,6 +5,7 @@ from django.contrib.contenttypes.fields import GenericRelation
 from netbox.models import PrimaryModel
 from netbox.search import SearchIndex, register_search
 
+from .indexes import trigram_index
 from .mixins import (
     NetBoxDHCPModelMixin,
     BOOTPModelMixin,
@@ -33,6 +34,17 @@ class ClientClass(
             "name",
         )
 
+        indexes = [
+            models.Index(
+                fields=["-weight", "name"],
+                name="client_class_weight_name",
+            ),
+            trigram_index("name", "client_class_name_trgm"),
+            trigram_index("test", "client_class_test_trgm"),
+            trigram_index("template_test", "client_class_template_trgm"),
+            trigram_index("boot_file_name", "client_class_boot_file_trgm"),
+        ]
+
     clone_fields = (
         "name",
         "description",
@@ -6,6 +6,7 @@ from netbox.search import SearchIndex, register_search
 
 from netbox_dhcp.choices import DHCPClusterStatusChoices
 
+from .indexes import trigram_index
 from .mixins import (
     NetBoxDHCPModelMixin,
 )
@@ -23,6 +24,10 @@ class DHCPCluster(NetBoxDHCPModelMixin, PrimaryModel):
 
         ordering = ("name",)
 
+        indexes = [
+            trigram_index("name", "dhcp_cluster_name_trgm"),
+        ]
+
     clone_fields = (
         "name",
         "description",
@@ -7,6 +7,7 @@ from django.core.validators import (
 )
 from django.core.exceptions import ValidationError
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.contrib.contenttypes.fields import GenericRelation
 
 from netbox.models import NetBoxModel, PrimaryModel
@@ -20,8 +21,10 @@ from netbox_dhcp.choices import (
 )
 from netbox_dhcp.fields import ChoiceArrayField
 
+from .indexes import trigram_index
 from .mixins import (
     NetBoxDHCPModelMixin,
+    CounterModelMixin,
     BOOTPModelMixin,
     LeaseModelMixin,
     DDNSUpdateModelMixin,
@@ -36,41 +39,83 @@ __all__ = (
 )
 
 
-class DHCPServerInterfaceManager(models.Manager.from_queryset(RestrictedQuerySet)):
-    def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .annotate(
-                name=models.ExpressionWrapper(
-                    Case(
-                        When(
-                            device_interface__isnull=False,
-                            then=F("device_interface__name"),
-                        ),
-                        When(
-                            virtual_machine_interface__isnull=False,
-                            then=F("virtual_machine_interface__name"),
-                        ),
+SUBNET_LOOKUPS = (
+    "child_subnets",
+    "child_shared_networks__child_subnets",
+)
+HOST_RESERVATION_LOOKUPS = (
+    "child_host_reservations",
+    *(f"{lookup}__child_host_reservations" for lookup in SUBNET_LOOKUPS),
+)
+CONFIG_GENERATION_LOOKUPS = {
+    "dhcpserver": ("pk",),
+    "clientclass": ("client_class_definition_set",),
+    "optiondefinition": (
+        "option_definitions",
+        "client_class_definition_set__option_definitions",
+    ),
+    "sharednetwork": ("child_shared_networks",),
+    "subnet": SUBNET_LOOKUPS,
+    "pool": tuple(f"{lookup}__child_pools" for lookup in SUBNET_LOOKUPS),
+    "pdpool": tuple(f"{lookup}__child_pd_pools" for lookup in SUBNET_LOOKUPS),
+    "hostreservation": HOST_RESERVATION_LOOKUPS,
+    # +
+    # IPAM objects referenced by the rendered configuration
+    # -
+    "prefix": (
+        "child_shared_networks__prefix",
+        *(f"{lookup}__prefix" for lookup in SUBNET_LOOKUPS),
+        *(
+            f"{lookup}__child_pd_pools__{field_name}"
+            for lookup in SUBNET_LOOKUPS
+            for field_name in ("prefix", "excluded_prefix")
+        ),
+        *(
+            f"{lookup}__{field_name}"
+            for lookup in HOST_RESERVATION_LOOKUPS
+            for field_name in ("ipv6_prefixes", "excluded_ipv6_prefixes")
+        ),
+    ),
+    "iprange": tuple(f"{lookup}__child_pools__ip_range" for lookup in SUBNET_LOOKUPS),
+    "ipaddress": tuple(
+        f"{lookup}__{field_name}"
+        for lookup in HOST_RESERVATION_LOOKUPS
+        for field_name in ("ipv4_address", "ipv6_addresses")
+    ),
+    "macaddress": tuple(f"{lookup}__hw_address" for lookup in HOST_RESERVATION_LOOKUPS),
+}
+
+
+class DHCPServerInterfaceQuerySet(RestrictedQuerySet):
+    def with_names(self):
+        return self.annotate(
+            name=models.ExpressionWrapper(
+                Case(
+                    When(
+                        device_interface__isnull=False,
+                        then=F("device_interface__name"),
+                    ),
+                    When(
+                        virtual_machine_interface__isnull=False,
+                        then=F("virtual_machine_interface__name"),
                     ),
-                    output_field=models.CharField(),
                 ),
-                parent_name=models.ExpressionWrapper(
-                    Case(
-                        When(
-                            device_interface__isnull=False,
-                            then=F("device_interface__device__name"),
-                        ),
-                        When(
-                            virtual_machine_interface__isnull=False,
-                            then=F("virtual_machine_interface__virtual_machine__name"),
-                        ),
+                output_field=models.CharField(),
+            ),
+            parent_name=models.ExpressionWrapper(
+                Case(
+                    When(
+                        device_interface__isnull=False,
+                        then=F("device_interface__device__name"),
+                    ),
+                    When(
+                        virtual_machine_interface__isnull=False,
+                        then=F("virtual_machine_interface__virtual_machine__name"),
                     ),
-                    output_field=models.CharField(),
                 ),
-            )
-            .order_by("dhcp_server", "name")
-        )
+                output_field=models.CharField(),
+            ),
+        ).order_by("dhcp_server", "name")
 
 
 class DHCPServerInterface(NetBoxModel):
@@ -97,7 +142,7 @@ class DHCPServerInterface(NetBoxModel):
             ),
         ]
 
-    objects = DHCPServerInterfaceManager()
+    objects = DHCPServerInterfaceQuerySet.as_manager()
 
     dhcp_server = models.ForeignKey(
         to="DHCPServer",
@@ -121,14 +166,58 @@ class DHCPServerInterface(NetBoxModel):
     )
 
     def __str__(self):
+        if name := self.get_name():
+            return name
+
+        return super().__str__()
+
+    # +
+    # Without the annotations added by with_names() the names are taken from
+    # the related interface and its device or virtual machine.
+    # -
+    def get_interface(self):
+        return self.device_interface or self.virtual_machine_interface
+
+    def get_name(self):
         if hasattr(self, "name"):
             return self.name
 
-        return super().__str__()
+        if interface := self.get_interface():
+            return interface.name
+
+    def get_parent_name(self):
+        if hasattr(self, "parent_name"):
+            return self.parent_name
+
+        if self.device_interface is not None:
+            return self.device_interface.device.name
+        if self.virtual_machine_interface is not None:
+            return self.virtual_machine_interface.virtual_machine.name
+
+
+class DHCPServerManager(models.Manager.from_queryset(RestrictedQuerySet)):
+    def bump_config_generation(self, model, pks):
+        lookups = CONFIG_GENERATION_LOOKUPS.get(model._meta.model_name)
+        if not lookups or not (pks := [pk for pk in pks if pk is not None]):
+            return 0
+
+        condition = Q()
+        for lookup in lookups:
+            if lookup == "pk":
+                condition |= Q(pk__in=pks)
+            else:
+                condition |= Q(
+                    pk__in=self.filter(**{f"{lookup}__in": pks}).values("pk")
+                )
+
+        return self.filter(condition).update(
+            config_generation=F("config_generation") + 1
+        )
 
 
 class DHCPServer(
     NetBoxDHCPModelMixin,
+    CounterModelMixin,
     BOOTPModelMixin,
     LeaseModelMixin,
     DDNSUpdateModelMixin,
@@ -141,6 +230,20 @@ class DHCPServer(
 
         ordering = ("name",)
 
+        indexes = [
+            GinIndex(
+                fields=["host_reservation_identifiers"],
+                name="dhcp_server_hr_identifiers",
+            ),
+            GinIndex(
+                fields=["relay_supplied_options"],
+                name="dhcp_server_relay_options",
+            ),
+            trigram_index("name", "dhcp_server_name_trgm"),
+        ]
+
+    COUNTER_FIELD = "config_generation"
+
     clone_fields = (
         "name",
         "description",
@@ -148,6 +251,8 @@ class DHCPServer(
         "dhcp_cluster",
     )
 
+    objects = DHCPServerManager()
+
     status = models.CharField(
         verbose_name=_("Status"),
         max_length=50,
@@ -234,6 +339,11 @@ class DHCPServer(
         blank=True,
         null=True,
     )
+    config_generation = models.PositiveBigIntegerField(
+        verbose_name=_("Configuration Generation"),
+        default=0,
+        editable=False,
+    )
     options = GenericRelation(
         to=Option,
         content_type_field="assigned_object_type",
@@ -9,6 +9,7 @@ from netbox.search import SearchIndex, register_search
 from dcim.models import MACAddress
 from ipam.models import IPAddress, Prefix
 
+from .indexes import trigram_index
 from .mixins import (
     NetBoxDHCPModelMixin,
     ClientClassModelMixin,
@@ -34,6 +35,18 @@ class HostReservation(
 
         ordering = ("name",)
 
+        indexes = [
+            *(
+                models.Index(
+                    fields=[field_name],
+                    condition=Q(**{f"{field_name}__isnull": False}),
+                    name=f"host_reservation_{field_name}",
+                )
+                for field_name in ("duid", "client_id", "circuit_id", "flex_id")
+            ),
+            trigram_index("name", "host_reservation_name_trgm"),
+        ]
+
         constraints = [
             models.CheckConstraint(
                 condition=Q(
@@ -0,0 +1,20 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models
+from django.db.models.functions import Cast, Upper
+
+__all__ = ("trigram_index",)
+
+
+# +
+# Trigram index matching the expression Django uses for icontains lookups on
+# PostgreSQL (UPPER("field"::text) LIKE UPPER(...)), so that substring search
+# can use the index instead of scanning the table.
+# -
+def trigram_index(field_name, name):
+    return GinIndex(
+        OpClass(
+            Upper(Cast(field_name, output_field=models.TextField())),
+            name="gin_trgm_ops",
+        ),
+        name=name,
+    )
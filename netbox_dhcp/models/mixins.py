@@ -10,6 +10,8 @@ from netbox_dhcp.choices import (
 
 __all__ = (
     "NetBoxDHCPModelMixin",
+    "CounterModelMixin",
+    "TrackedFieldsModelMixin",
     "BOOTPModelMixin",
     "ClientClassModelMixin",
     "EvaluateClientClassModelMixin",
@@ -41,6 +43,56 @@ class NetBoxDHCPModelMixin(models.Model):
         return str(self.name)
 
 
+class CounterModelMixin(models.Model):
+    COUNTER_FIELD = None
+
+    class Meta:
+        abstract = True
+
+    # +
+    # The counter is only ever changed by atomic updates, so a regular save of
+    # an existing object must never write back a stale value.
+    # -
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != self.COUNTER_FIELD
+            ]
+
+        super().save(*args, **kwargs)
+
+
+class TrackedFieldsModelMixin(models.Model):
+    TRACKED_FIELDS = []
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field_name: value
+            for field_name, value in zip(field_names, values)
+            if field_name in cls.TRACKED_FIELDS
+        }
+
+        return instance
+
+    def has_changed(self, *field_names):
+        if self._state.adding:
+            return True
+
+        loaded_values = getattr(self, "_loaded_values", {})
+        return any(
+            field_name not in loaded_values
+            or loaded_values[field_name] != getattr(self, field_name)
+            for field_name in field_names
+        )
+
+
 class BOOTPModelMixin(models.Model):
     FIELDS = [
         "next_server",
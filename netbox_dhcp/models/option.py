@@ -1,5 +1,3 @@
-import re
-
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.contrib.contenttypes.fields import GenericForeignKey
@@ -9,8 +7,10 @@ from netbox.models import PrimaryModel
 from netbox.search import SearchIndex, register_search
 
 from netbox_dhcp.choices import OptionTypeChoices, OptionSendChoices
-from netbox_dhcp.validators import validate_data
+from netbox_dhcp.validators import validate_option_data
+from netbox_dhcp.utilities import DHCPV4_OPTIONS_SIZE_MAX, validate_option_size
 
+from .indexes import trigram_index
 from .mixins import ClientClassModelMixin
 
 __all__ = (
@@ -34,6 +34,14 @@ class Option(
             "weight",
         )
 
+        indexes = [
+            models.Index(
+                fields=["assigned_object_type", "assigned_object_id", "weight"],
+                name="option_assigned_object",
+            ),
+            trigram_index("data", "option_data_trgm"),
+        ]
+
     definition = models.ForeignKey(
         verbose_name=_("Option Definition"),
         to="OptionDefinition",
@@ -96,36 +104,53 @@ class Option(
         if definition.type == OptionTypeChoices.TYPE_BINARY:
             self.csv_format = False
 
-        if definition.type == OptionTypeChoices.TYPE_RECORD:
-            data_array = re.split(r"\s*,\s*", self.data)
-            record_types = definition.record_types
+        validate_option_data(self.data, definition)
 
-            if (definition.array and len(record_types) > len(data_array)) or (
-                not definition.array and len(record_types) != len(data_array)
-            ):
+        assigned_options = Option.objects.none()
+        if self.assigned_object_type_id and self.assigned_object_id:
+            assigned_options = (
+                Option.objects.filter(
+                    assigned_object_type=self.assigned_object_type_id,
+                    assigned_object_id=self.assigned_object_id,
+                )
+                .exclude(pk=self.pk)
+                .select_related("definition")
+            )
+
+        suboptions = ()
+        if definition.encapsulate:
+            suboptions = assigned_options.filter(
+                definition__space=definition.encapsulate
+            )
+
+        validate_option_size(self, suboptions)
+
+        # +
+        # A sub-option adds to the size of the options encapsulating its space,
+        # so these are validated again including the sub-option as saved.
+        # -
+        encapsulating_options = assigned_options.filter(
+            definition__encapsulate=definition.space
+        )
+        for option in encapsulating_options:
+            try:
+                validate_option_size(
+                    option,
+                    [
+                        *assigned_options.filter(definition__space=definition.space),
+                        self,
+                    ],
+                )
+            except ValidationError:
                 raise ValidationError(
                     {
                         "data": _(
-                            "Lengths of record type list and data elements do not match"
-                        )
+                            "The encapsulating option {option} would exceed the "
+                            "maximum size of {maximum} octets"
+                        ).format(option=option, maximum=DHCPV4_OPTIONS_SIZE_MAX)
                     }
                 )
 
-            for mapping in zip(data_array, record_types):
-                validate_data(*mapping)
-
-            if definition.array:
-                for data_field in data_array[len(record_types) :]:
-                    validate_data(data_field, record_types[-1])
-
-        elif definition.array:
-            data_array = re.split(r"\s*,\s*", self.data)
-            for data_field in data_array:
-                validate_data(data_field, definition.type)
-
-        else:
-            validate_data(self.data, definition.type)
-
 
 @register_search
 class OptionIndex(SearchIndex):
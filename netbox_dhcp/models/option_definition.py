@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import (
     MinValueValidator,
@@ -12,6 +13,8 @@ from ipam.choices import IPAddressFamilyChoices
 from netbox_dhcp.choices import OptionSpaceChoices, OptionTypeChoices
 from netbox_dhcp.fields import ChoiceArrayField
 
+from .indexes import trigram_index
+
 __all__ = (
     "OptionDefinition",
     "OptionDefinitionIndex",
@@ -29,6 +32,15 @@ class OptionDefinition(PrimaryModel):
             "name",
         )
 
+        indexes = [
+            GinIndex(
+                fields=["record_types"],
+                name="option_definition_record_types",
+            ),
+            trigram_index("name", "option_definition_name_trgm"),
+            trigram_index("space", "option_definition_space_trgm"),
+        ]
+
     clone_fields = ("space",)
 
     name = models.CharField(
@@ -10,14 +10,18 @@ from netbox.models import PrimaryModel
 from netbox.search import SearchIndex, register_search
 from ipam.models import Prefix
 from ipam.choices import IPAddressFamilyChoices
-from utilities.querysets import RestrictedQuerySet
 
+from netbox_dhcp.utilities import allocate_pool_id, reserve_pool_id
+
+from .indexes import trigram_index
 from .mixins import (
     NetBoxDHCPModelMixin,
+    TrackedFieldsModelMixin,
     ClientClassModelMixin,
     EvaluateClientClassModelMixin,
 )
 from .option import Option
+from .querysets import PrefixQuerySet
 
 __all__ = (
     "PDPool",
@@ -25,22 +29,9 @@ __all__ = (
 )
 
 
-class PDPoolManager(models.Manager.from_queryset(RestrictedQuerySet)):
-    def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .annotate(
-                prefix_display=models.ExpressionWrapper(
-                    models.F("prefix__prefix"),
-                    output_field=models.CharField(),
-                )
-            )
-        )
-
-
 class PDPool(
     NetBoxDHCPModelMixin,
+    TrackedFieldsModelMixin,
     ClientClassModelMixin,
     EvaluateClientClassModelMixin,
     PrimaryModel,
@@ -54,6 +45,25 @@ class PDPool(
             "name",
         )
 
+        indexes = [
+            models.Index(
+                fields=["-weight", "name"],
+                name="pd_pool_weight_name",
+            ),
+            trigram_index("name", "pd_pool_name_trgm"),
+        ]
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subnet", "pool_id"], name="pd_pool_unique_subnet_pool_id"
+            ),
+        ]
+
+    TRACKED_FIELDS = [
+        "subnet_id",
+        "pool_id",
+    ]
+
     clone_fields = (
         "name",
         "description",
@@ -73,7 +83,7 @@ class PDPool(
         default=100,
     )
 
-    objects = PDPoolManager()
+    objects = PrefixQuerySet.as_manager()
 
     pool_id = models.PositiveIntegerField(
         verbose_name=_("Pool ID"),
@@ -117,6 +127,14 @@ class PDPool(
     def available_client_classes(self):
         return self.subnet.available_client_classes
 
+    def save(self, *args, **kwargs):
+        if self.pool_id is None:
+            self.pool_id = allocate_pool_id(self.subnet_id)
+        elif self.has_changed("subnet_id", "pool_id"):
+            reserve_pool_id(self.subnet_id, self.pool_id)
+
+        super().save(*args, **kwargs)
+
 
 @register_search
 class PDPoolIndex(SearchIndex):
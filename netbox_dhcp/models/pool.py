@@ -6,8 +6,12 @@ from netbox.models import PrimaryModel
 from netbox.search import SearchIndex, register_search
 from ipam.models import IPRange
 
+from netbox_dhcp.utilities import allocate_pool_id, reserve_pool_id
+
+from .indexes import trigram_index
 from .mixins import (
     NetBoxDHCPModelMixin,
+    TrackedFieldsModelMixin,
     ClientClassModelMixin,
     EvaluateClientClassModelMixin,
     DDNSUpdateModelMixin,
@@ -22,6 +26,7 @@ __all__ = (
 
 class Pool(
     NetBoxDHCPModelMixin,
+    TrackedFieldsModelMixin,
     ClientClassModelMixin,
     EvaluateClientClassModelMixin,
     DDNSUpdateModelMixin,
@@ -36,6 +41,25 @@ class Pool(
             "name",
         )
 
+        indexes = [
+            models.Index(
+                fields=["-weight", "name"],
+                name="pool_weight_name",
+            ),
+            trigram_index("name", "pool_name_trgm"),
+        ]
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subnet", "pool_id"], name="pool_unique_subnet_pool_id"
+            ),
+        ]
+
+    TRACKED_FIELDS = [
+        "subnet_id",
+        "pool_id",
+    ]
+
     clone_fields = (
         "name",
         "description",
@@ -98,6 +122,14 @@ class Pool(
     def available_client_classes(self):
         return self.subnet.available_client_classes
 
+    def save(self, *args, **kwargs):
+        if self.pool_id is None:
+            self.pool_id = allocate_pool_id(self.subnet_id)
+        elif self.has_changed("subnet_id", "pool_id"):
+            reserve_pool_id(self.subnet_id, self.pool_id)
+
+        super().save(*args, **kwargs)
+
 
 @register_search
 class PoolIndex(SearchIndex):
@@ -0,0 +1,20 @@
+from django.db import models
+
+from utilities.querysets import RestrictedQuerySet
+
+__all__ = ("PrefixQuerySet",)
+
+
+# +
+# The prefix of subnets, shared networks and prefix delegation pools is only
+# annotated on request, so that counts, existence checks and internal queries
+# do not join the prefix table.
+# -
+class PrefixQuerySet(RestrictedQuerySet):
+    def with_prefix_display(self):
+        return self.annotate(
+            prefix_display=models.ExpressionWrapper(
+                models.F("prefix__prefix"),
+                output_field=models.CharField(),
+            )
+        )
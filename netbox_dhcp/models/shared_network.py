@@ -5,8 +5,8 @@ from django.contrib.contenttypes.fields import GenericRelation
 from netbox.models import PrimaryModel
 from netbox.search import SearchIndex, register_search
 from ipam.models import Prefix
-from utilities.querysets import RestrictedQuerySet
 
+from .indexes import trigram_index
 from .mixins import (
     NetBoxDHCPModelMixin,
     ClientClassModelMixin,
@@ -18,6 +18,7 @@ from .mixins import (
     NetworkModelMixin,
 )
 from .option import Option
+from .querysets import PrefixQuerySet
 
 __all__ = (
     "SharedNetwork",
@@ -25,20 +26,6 @@ __all__ = (
 )
 
 
-class SharedNetworkManager(models.Manager.from_queryset(RestrictedQuerySet)):
-    def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .annotate(
-                prefix_display=models.ExpressionWrapper(
-                    models.F("prefix__prefix"),
-                    output_field=models.CharField(),
-                )
-            )
-        )
-
-
 class SharedNetwork(
     NetBoxDHCPModelMixin,
     ClientClassModelMixin,
@@ -59,6 +46,15 @@ class SharedNetwork(
             "name",
         )
 
+        indexes = [
+            models.Index(
+                fields=["-weight", "name"],
+                name="shared_network_weight_name",
+            ),
+            trigram_index("name", "shared_network_name_trgm"),
+            trigram_index("boot_file_name", "shared_network_boot_file_trgm"),
+        ]
+
     clone_fields = (
         "name",
         "description",
@@ -117,7 +113,7 @@ class SharedNetwork(
         on_delete=models.CASCADE,
     )
 
-    objects = SharedNetworkManager()
+    objects = PrefixQuerySet.as_manager()
 
     prefix = models.ForeignKey(
         verbose_name=_("Prefix"),
@@ -6,10 +6,14 @@ from django.contrib.contenttypes.fields import GenericRelation
 from netbox.models import PrimaryModel
 from netbox.search import SearchIndex, register_search
 from ipam.models import Prefix
-from utilities.querysets import RestrictedQuerySet
 
+from netbox_dhcp.utilities import allocate_subnet_id, reserve_subnet_id
+
+from .indexes import trigram_index
 from .mixins import (
     NetBoxDHCPModelMixin,
+    CounterModelMixin,
+    TrackedFieldsModelMixin,
     ClientClassModelMixin,
     EvaluateClientClassModelMixin,
     BOOTPModelMixin,
@@ -19,6 +23,7 @@ from .mixins import (
     NetworkModelMixin,
 )
 from .option import Option
+from .querysets import PrefixQuerySet
 
 __all__ = (
     "Subnet",
@@ -26,22 +31,10 @@ __all__ = (
 )
 
 
-class SubnetManager(models.Manager.from_queryset(RestrictedQuerySet)):
-    def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .annotate(
-                prefix_display=models.ExpressionWrapper(
-                    models.F("prefix__prefix"),
-                    output_field=models.CharField(),
-                )
-            )
-        )
-
-
 class Subnet(
     NetBoxDHCPModelMixin,
+    CounterModelMixin,
+    TrackedFieldsModelMixin,
     ClientClassModelMixin,
     EvaluateClientClassModelMixin,
     BOOTPModelMixin,
@@ -60,6 +53,15 @@ class Subnet(
             "name",
         )
 
+        indexes = [
+            models.Index(
+                fields=["-weight", "name"],
+                name="subnet_weight_name",
+            ),
+            trigram_index("name", "subnet_name_trgm"),
+            trigram_index("boot_file_name", "subnet_boot_file_trgm"),
+        ]
+
         constraints = [
             models.UniqueConstraint(
                 fields=["subnet_id"], name="subnet_unique_subnet_id"
@@ -76,6 +78,11 @@ class Subnet(
             ),
         ]
 
+    COUNTER_FIELD = "_last_pool_id"
+    TRACKED_FIELDS = [
+        "subnet_id",
+    ]
+
     clone_fields = (
         "name",
         "description",
@@ -128,7 +135,7 @@ class Subnet(
         "ddns_ttl_max",
     )
 
-    objects = SubnetManager()
+    objects = PrefixQuerySet.as_manager()
 
     subnet_id = models.PositiveIntegerField(
         verbose_name=_("Subnet ID"),
@@ -164,6 +171,10 @@ class Subnet(
         verbose_name=_("Weight"),
         default=100,
     )
+    _last_pool_id = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
 
     options = GenericRelation(
         to=Option,
@@ -188,17 +199,9 @@ class Subnet(
 
     def save(self, *args, **kwargs):
         if self.subnet_id is None:
-            max_subnet_id = (
-                0
-                if (
-                    max_id := Subnet.objects.aggregate(models.Max("subnet_id")).get(
-                        "subnet_id__max"
-                    )
-                )
-                is None
-                else max_id
-            )
-            self.subnet_id = max_subnet_id + 1
+            self.subnet_id = allocate_subnet_id()
+        elif self.has_changed("subnet_id"):
+            reserve_subnet_id(self.subnet_id)
 
         self.full_clean()
 
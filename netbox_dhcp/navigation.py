@@ -103,6 +103,12 @@ option_menu_item = PluginMenuItem(
             "mdi mdi-upload",
             permissions=["netbox_dhcp.add_option"],
         ),
+        PluginMenuButton(
+            "plugins:netbox_dhcp:option_bulk_import_job",
+            _("Background Import"),
+            "mdi mdi-upload-multiple",
+            permissions=["netbox_dhcp.add_option"],
+        ),
     ),
 )
 
@@ -143,6 +149,12 @@ host_reservation_menu_item = PluginMenuItem(
             "mdi mdi-upload",
             permissions=["netbox_dhcp.add_hostreservation"],
         ),
+        PluginMenuButton(
+            "plugins:netbox_dhcp:hostreservation_bulk_import_job",
+            _("Background Import"),
+            "mdi mdi-upload-multiple",
+            permissions=["netbox_dhcp.add_hostreservation"],
+        ),
     ),
 )
 
@@ -183,6 +195,12 @@ subnet_menu_item = PluginMenuItem(
             "mdi mdi-upload",
             permissions=["netbox_dhcp.add_subnet"],
         ),
+        PluginMenuButton(
+            "plugins:netbox_dhcp:subnet_bulk_import_job",
+            _("Background Import"),
+            "mdi mdi-upload-multiple",
+            permissions=["netbox_dhcp.add_subnet"],
+        ),
     ),
 )
 
@@ -223,6 +241,12 @@ pool_menu_item = PluginMenuItem(
             "mdi mdi-upload",
             permissions=["netbox_dhcp.add_pool"],
         ),
+        PluginMenuButton(
+            "plugins:netbox_dhcp:pool_bulk_import_job",
+            _("Background Import"),
+            "mdi mdi-upload-multiple",
+            permissions=["netbox_dhcp.add_pool"],
+        ),
     ),
 )
 
@@ -0,0 +1,132 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+
+from dcim.models import MACAddress
+from ipam.models import IPAddress, IPRange, Prefix
+
+from netbox_dhcp.models import (
+    ClientClass,
+    DHCPServer,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+
+CONFIG_MODELS = (
+    ClientClass,
+    DHCPServer,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+IPAM_MODELS = (
+    IPAddress,
+    IPRange,
+    MACAddress,
+    Prefix,
+)
+
+
+def get_assigned_object(assigned_object_type_id, assigned_object_id):
+    if assigned_object_type_id is None:
+        return None, None
+
+    return (
+        ContentType.objects.get_for_id(assigned_object_type_id).model_class(),
+        assigned_object_id,
+    )
+
+
+def get_config_object(instance):
+    if isinstance(instance, Option):
+        return get_assigned_object(
+            instance.assigned_object_type_id, instance.assigned_object_id
+        )
+
+    return type(instance), instance.pk
+
+
+def bump_config_generation(model, pks):
+    if model is None:
+        return
+
+    DHCPServer.objects.bump_config_generation(model, pks)
+
+
+def config_object_pre_save(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or sender is DHCPServer:
+        return
+
+    if sender is Option:
+        assigned_object = (
+            Option.objects.filter(pk=instance.pk)
+            .values_list("assigned_object_type_id", "assigned_object_id")
+            .first()
+        )
+        model, pk = get_assigned_object(*(assigned_object or (None, None)))
+    else:
+        model, pk = sender, instance.pk
+
+    bump_config_generation(model, [pk])
+
+
+def config_object_post_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    model, pk = get_config_object(instance)
+    bump_config_generation(model, [pk])
+
+
+def config_object_pre_delete(sender, instance, **kwargs):
+    if sender is DHCPServer:
+        return
+
+    model, pk = get_config_object(instance)
+    bump_config_generation(model, [pk])
+
+
+def config_object_m2m_changed(action, instance, model, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    instance_model, instance_pk = get_config_object(instance)
+    bump_config_generation(instance_model, [instance_pk])
+
+    if pk_set:
+        bump_config_generation(model, pk_set)
+
+
+# +
+# IPAM objects keep their primary key when they are edited, so the servers
+# referencing them are bumped after a change and before the deletion.
+# -
+def ipam_object_changed(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+
+    bump_config_generation(sender, [instance.pk])
+
+
+for model in CONFIG_MODELS:
+    pre_save.connect(config_object_pre_save, sender=model)
+    post_save.connect(config_object_post_save, sender=model)
+    pre_delete.connect(config_object_pre_delete, sender=model)
+
+    for field in model._meta.many_to_many:
+        if field.remote_field.through._meta.app_label == DHCPServer._meta.app_label:
+            m2m_changed.connect(
+                config_object_m2m_changed, sender=field.remote_field.through
+            )
+
+for model in IPAM_MODELS:
+    post_save.connect(ipam_object_changed, sender=model)
+    pre_delete.connect(ipam_object_changed, sender=model)
@@ -1,38 +1,58 @@
 from django.dispatch import receiver
 from django.db.models.signals import m2m_changed
 
+from netbox.context import current_request
+from netbox.search.backends import search_backend
+
 from netbox_dhcp.models import DHCPServer, DHCPServerInterface
+from netbox_dhcp.utilities import log_object_changes
 
 
-@receiver(m2m_changed, sender=DHCPServer.device_interfaces.through)
-def device_interfaces_changed(action, instance, pk_set, **kwargs):
-    if action in ("post_clear", "post_remove"):
-        for interface in instance.interfaces.filter(device_interface__pk__in=pk_set):
-            interface.delete()
+# +
+# bulk_create() bypasses the signals NetBox uses for change logging and the
+# search cache, so both are written for the created interfaces here. As with
+# NetBox's own change logging, changes outside a request are not logged.
+# -
+def log_interfaces(interfaces):
+    objects = list(
+        DHCPServerInterface.objects.with_names()
+        .filter(pk__in=[interface.pk for interface in interfaces])
+        .prefetch_related("tags")
+    )
 
-    if action == "post_add":
-        for pk in pk_set:
-            interface = DHCPServerInterface.objects.create(
-                dhcp_server=instance,
-                device_interface=instance.device_interfaces.get(pk=pk),
-            )
-            instance.interfaces.add(interface)
+    if (request := current_request.get()) is not None:
+        log_object_changes(objects, request.user, request.id)
+    search_backend.cache(objects, remove_existing=False)
 
 
-@receiver(m2m_changed, sender=DHCPServer.virtual_machine_interfaces.through)
-def virtual_machine_interfaces_changed(action, instance, pk_set, **kwargs):
-    if action in ("post_clear", "post_remove"):
-        for interface in instance.interfaces.filter(
-            virtual_machine_interface__pk__in=pk_set
-        ):
-            interface.delete()
+def interfaces_changed(instance, action, reverse, pk_set, field_name):
+    if reverse:
+        return
+
+    if action == "post_clear":
+        DHCPServerInterface.objects.filter(
+            dhcp_server=instance, **{f"{field_name}__isnull": False}
+        ).delete()
+
+    if action == "post_remove":
+        DHCPServerInterface.objects.filter(
+            dhcp_server=instance, **{f"{field_name}__pk__in": pk_set}
+        ).delete()
 
     if action == "post_add":
-        for pk in pk_set:
-            interface = DHCPServerInterface.objects.create(
-                dhcp_server=instance,
-                virtual_machine_interface=instance.virtual_machine_interfaces.get(
-                    pk=pk
-                ),
-            )
-            instance.interfaces.add(interface)
+        interfaces = DHCPServerInterface.objects.bulk_create(
+            DHCPServerInterface(dhcp_server=instance, **{f"{field_name}_id": pk})
+            for pk in pk_set
+        )
+        instance.interfaces.add(*interfaces)
+        log_interfaces(interfaces)
+
+
+@receiver(m2m_changed, sender=DHCPServer.device_interfaces.through)
+def device_interfaces_changed(action, instance, reverse, pk_set, **kwargs):
+    interfaces_changed(instance, action, reverse, pk_set, "device_interface")
+
+
+@receiver(m2m_changed, sender=DHCPServer.virtual_machine_interfaces.through)
+def virtual_machine_interfaces_changed(action, instance, reverse, pk_set, **kwargs):
+    interfaces_changed(instance, action, reverse, pk_set, "virtual_machine_interface")
@@ -14,6 +14,7 @@ __all__ = (
     "OptionTable",
     "ChildOptionTable",
     "ParentOptionTable",
+    "EffectiveOptionTable",
 )
 
 
@@ -97,3 +98,18 @@ class ParentOptionTable(OptionTable):
         pass
 
     actions = None
+
+
+class EffectiveOptionTable(OptionTable):
+    class Meta(OptionTable.Meta):
+        default_columns = (
+            "space",
+            "name",
+            "code",
+            "data",
+            "weight",
+            "assigned_object",
+            "assigned_object_type",
+        )
+
+    actions = None
@@ -1,7 +1,12 @@
 # from django.utils.translation import gettext_lazy as _
 
+from django.db.models import Exists, OuterRef
+
 from netbox.plugins import PluginTemplateExtension
 from ipam.choices import IPAddressFamilyChoices
+from ipam.models import Prefix
+
+from netbox_dhcp.models import PDPool, SharedNetwork, Subnet
 
 from netbox_dhcp.tables import (
     RelatedHostReservationTable,
@@ -65,52 +70,6 @@ class RelatedMACAddressHostReservations(PluginTemplateExtension):
         )
 
 
-class RelatedSharedNetworks(PluginTemplateExtension):
-    models = ("ipam.prefix",)
-
-    def right_page(self):
-        prefix = self.context.get("object")
-        request = self.context.get("request")
-
-        if shared_networks := prefix.netbox_dhcp_shared_networks.all():
-            shared_network_table = RelatedSharedNetworkTable(
-                data=shared_networks,
-            )
-            shared_network_table.configure(request)
-        else:
-            shared_network_table = None
-
-        return self.render(
-            "netbox_dhcp/sharednetwork/related.html",
-            extra_context={
-                "shared_networks": shared_network_table,
-            },
-        )
-
-
-class RelatedSubnets(PluginTemplateExtension):
-    models = ("ipam.prefix",)
-
-    def right_page(self):
-        prefix = self.context.get("object")
-        request = self.context.get("request")
-
-        if subnets := prefix.netbox_dhcp_subnets.all():
-            subnet_table = RelatedSubnetTable(
-                data=subnets,
-            )
-            subnet_table.configure(request)
-        else:
-            subnet_table = None
-
-        return self.render(
-            "netbox_dhcp/subnet/related.html",
-            extra_context={
-                "subnets": subnet_table,
-            },
-        )
-
-
 class RelatedPools(PluginTemplateExtension):
     models = ("ipam.iprange",)
 
@@ -134,34 +93,71 @@ class RelatedPools(PluginTemplateExtension):
         )
 
 
-class RelatedPDPools(PluginTemplateExtension):
+# +
+# The DHCP objects related to a prefix are shown in a single extension. Which
+# of the relations are empty is decided with one query using an EXISTS
+# subquery per relation, and tables are only built and rendered for the
+# relations that have related objects the user is permitted to view.
+# -
+PREFIX_RELATIONS = (
+    ("shared_networks", SharedNetwork, RelatedSharedNetworkTable),
+    ("subnets", Subnet, RelatedSubnetTable),
+    ("pd_pools", PDPool, RelatedPDPoolTable),
+)
+
+
+class RelatedPrefixObjects(PluginTemplateExtension):
     models = ("ipam.prefix",)
 
     def right_page(self):
         prefix = self.context.get("object")
         request = self.context.get("request")
 
-        if pd_pools := prefix.netbox_dhcp_pd_pools.all():
-            pd_pool_table = RelatedPDPoolTable(
-                data=pd_pools,
+        relations = [
+            (name, model, table)
+            for name, model, table in PREFIX_RELATIONS
+            if request.user.has_perm(f"netbox_dhcp.view_{model._meta.model_name}")
+        ]
+        if not relations:
+            return ""
+
+        exists = (
+            Prefix.objects.filter(pk=prefix.pk)
+            .values_list(
+                *(
+                    Exists(
+                        model.objects.restrict(request.user, "view").filter(
+                            prefix=OuterRef("pk")
+                        )
+                    )
+                    for _name, model, _table in relations
+                )
             )
-            pd_pool_table.configure(request)
-        else:
-            pd_pool_table = None
+            .first()
+        ) or (False,) * len(relations)
+
+        tables = {}
+        for (name, model, table_class), has_objects in zip(relations, exists):
+            if has_objects:
+                tables[name] = table_class(
+                    data=model.objects.restrict(request.user, "view").filter(
+                        prefix=prefix
+                    )
+                )
+                tables[name].configure(request)
+
+        if not tables:
+            return ""
 
         return self.render(
-            "netbox_dhcp/pdpool/related.html",
-            extra_context={
-                "pd_pools": pd_pool_table,
-            },
+            "netbox_dhcp/prefix/related.html",
+            extra_context=tables,
         )
 
 
 template_extensions = [
     RelatedHostReservations,
     RelatedMACAddressHostReservations,
-    RelatedSharedNetworks,
-    RelatedSubnets,
     RelatedPools,
-    RelatedPDPools,
+    RelatedPrefixObjects,
 ]
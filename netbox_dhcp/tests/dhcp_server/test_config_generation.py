@@ -0,0 +1,262 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import ObjectType
+from users.models import ObjectPermission
+
+from netbox_dhcp.models import (
+    DHCPServer,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+from netbox_dhcp.choices import OptionSpaceChoices
+from netbox_dhcp.tests.custom import TestObjects, APITestCase
+
+
+class ConfigGenerationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_servers = TestObjects.get_dhcp_servers()
+        cls.ipv4_prefixes = TestObjects.get_ipv4_prefixes()
+
+    def get_generation(self, dhcp_server):
+        return DHCPServer.objects.get(pk=dhcp_server.pk).config_generation
+
+    def assertBumped(self, dhcp_server, generation):
+        self.assertGreater(self.get_generation(dhcp_server), generation)
+
+    def test_subnet(self):
+        dhcp_server = self.dhcp_servers[0]
+
+        generation = self.get_generation(dhcp_server)
+        subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+        self.assertBumped(dhcp_server, generation)
+
+        generation = self.get_generation(dhcp_server)
+        subnet.description = "Test Subnet"
+        subnet.save()
+        self.assertBumped(dhcp_server, generation)
+
+        generation = self.get_generation(dhcp_server)
+        subnet.delete()
+        self.assertBumped(dhcp_server, generation)
+
+    def test_subnet_move(self):
+        subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=self.dhcp_servers[0],
+            prefix=self.ipv4_prefixes[0],
+        )
+
+        generations = [
+            self.get_generation(dhcp_server) for dhcp_server in self.dhcp_servers[:2]
+        ]
+        subnet.dhcp_server = self.dhcp_servers[1]
+        subnet.save()
+
+        self.assertBumped(self.dhcp_servers[0], generations[0])
+        self.assertBumped(self.dhcp_servers[1], generations[1])
+        self.assertEqual(
+            self.get_generation(self.dhcp_servers[2]),
+            self.dhcp_servers[2].config_generation,
+        )
+
+    def test_shared_network_host_reservation(self):
+        dhcp_server = self.dhcp_servers[0]
+
+        shared_network = SharedNetwork.objects.create(
+            name="test-shared-network-1",
+            dhcp_server=dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+        subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            shared_network=shared_network,
+            prefix=self.ipv4_prefixes[1],
+        )
+
+        generation = self.get_generation(dhcp_server)
+        HostReservation.objects.create(
+            name="test-reservation-1",
+            subnet=subnet,
+            hostname="host-1",
+        )
+        self.assertBumped(dhcp_server, generation)
+
+    def test_option(self):
+        dhcp_server = self.dhcp_servers[0]
+        subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+
+        generation = self.get_generation(dhcp_server)
+        option = Option.objects.create(
+            definition=OptionDefinition.objects.get(
+                space=OptionSpaceChoices.DHCPV4, name="routers"
+            ),
+            data="192.0.2.1",
+            assigned_object=subnet,
+        )
+        self.assertBumped(dhcp_server, generation)
+
+        generation = self.get_generation(dhcp_server)
+        option.delete()
+        self.assertBumped(dhcp_server, generation)
+
+    def test_server_save(self):
+        dhcp_server = DHCPServer.objects.get(pk=self.dhcp_servers[0].pk)
+        Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+
+        generation = self.get_generation(dhcp_server)
+        dhcp_server.description = "Test Server"
+        dhcp_server.save()
+        self.assertBumped(dhcp_server, generation)
+
+    def test_ipam_objects(self):
+        dhcp_server = self.dhcp_servers[0]
+        ipv4_range = TestObjects.get_ipv4_ranges()[0]
+        ipv4_address = TestObjects.get_ipv4_addresses()[0]
+        mac_address = TestObjects.get_mac_addresses()[0]
+
+        subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+        Pool.objects.create(name="test-pool-1", subnet=subnet, ip_range=ipv4_range)
+        HostReservation.objects.create(
+            name="test-reservation-1",
+            subnet=subnet,
+            ipv4_address=ipv4_address,
+            hw_address=mac_address,
+        )
+
+        for instance in (
+            self.ipv4_prefixes[0],
+            ipv4_range,
+            ipv4_address,
+            mac_address,
+        ):
+            with self.subTest(instance=instance):
+                generations = [
+                    self.get_generation(dhcp_server)
+                    for dhcp_server in self.dhcp_servers[:2]
+                ]
+                instance.description = "Test"
+                instance.save()
+
+                self.assertBumped(self.dhcp_servers[0], generations[0])
+                self.assertEqual(
+                    self.get_generation(self.dhcp_servers[1]), generations[1]
+                )
+
+
+CONFIG_PERMISSIONS = (
+    "netbox_dhcp.view_dhcpserver",
+    "netbox_dhcp.view_dhcpserverinterface",
+    "netbox_dhcp.view_clientclass",
+    "netbox_dhcp.view_hostreservation",
+    "netbox_dhcp.view_option",
+    "netbox_dhcp.view_optiondefinition",
+    "netbox_dhcp.view_pdpool",
+    "netbox_dhcp.view_pool",
+    "netbox_dhcp.view_sharednetwork",
+    "netbox_dhcp.view_subnet",
+    "ipam.view_ipaddress",
+    "ipam.view_iprange",
+    "ipam.view_prefix",
+    "dcim.view_macaddress",
+)
+
+
+class ConfigETagTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+
+    def get_url(self, name="config"):
+        return reverse(
+            f"plugins-api:netbox_dhcp-api:dhcpserver-{name}",
+            kwargs={"pk": self.dhcp_server.pk},
+        )
+
+    def test_config_etag(self):
+        self.add_permissions(*CONFIG_PERMISSIONS)
+        url = self.get_url()
+
+        response = self.client.get(url, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_304_NOT_MODIFIED)
+
+        DHCPServer.objects.bump_config_generation(DHCPServer, [self.dhcp_server.pk])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_config_permissions(self):
+        subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=self.dhcp_server,
+            prefix=TestObjects.get_ipv4_prefixes()[0],
+        )
+        HostReservation.objects.bulk_create(
+            HostReservation(
+                name=f"test-reservation-{number}",
+                subnet=subnet,
+                hostname=f"host-{number}",
+            )
+            for number in range(2)
+        )
+        self.add_permissions(
+            *(
+                permission
+                for permission in CONFIG_PERMISSIONS
+                if permission != "netbox_dhcp.view_hostreservation"
+            )
+        )
+
+        for name in ("config", "config-changes"):
+            response = self.client.get(self.get_url(name), **self.header)
+            self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+
+        object_permission = ObjectPermission.objects.create(
+            name="Test permission",
+            actions=["view"],
+            constraints={"name": "test-reservation-0"},
+        )
+        object_permission.object_types.set(
+            [ObjectType.objects.get_for_model(HostReservation)]
+        )
+        object_permission.users.add(self.user)
+
+        response = self.client.get(self.get_url(), **self.header)
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+
+        object_permission.constraints = None
+        object_permission.save()
+
+        response = self.client.get(self.get_url(), **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        response = self.client.get(
+            self.get_url("config-changes"), {"since": 0}, **self.header
+        )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
@@ -0,0 +1,198 @@
+import uuid
+
+from django.db.models import Max
+from django.test import TestCase
+
+from core.choices import ObjectChangeActionChoices
+from core.models import ObjectChange
+from ipam.choices import IPAddressFamilyChoices
+
+from netbox_dhcp.choices import OptionSpaceChoices
+from netbox_dhcp.kea import KeaConfigDelta
+from netbox_dhcp.models import (
+    HostReservation,
+    Option,
+    OptionDefinition,
+    SharedNetwork,
+    Subnet,
+)
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class KeaConfigDeltaTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        cls.ipv4_prefixes = TestObjects.get_ipv4_prefixes()
+
+    def save(self, instance, action=ObjectChangeActionChoices.ACTION_CREATE):
+        if action == ObjectChangeActionChoices.ACTION_DELETE:
+            instance.snapshot()
+            objectchange = instance.to_objectchange(action)
+            instance.delete()
+        else:
+            instance.save()
+            objectchange = instance.to_objectchange(action)
+
+        objectchange.request_id = uuid.uuid4()
+        objectchange.save()
+
+    def get_delta(self, since):
+        return KeaConfigDelta(
+            self.dhcp_server,
+            family=IPAddressFamilyChoices.FAMILY_4,
+            since=since,
+        ).render()
+
+    def test_host_reservations(self):
+        subnet = Subnet(
+            name="test-subnet-1",
+            dhcp_server=self.dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+        self.save(subnet)
+
+        host_reservations = [
+            HostReservation(
+                name=f"test-reservation-{index}",
+                subnet=subnet,
+                duid=f"00:01:00:0{index}",
+            )
+            for index in range(1, 4)
+        ]
+        for host_reservation in host_reservations[:2]:
+            self.save(host_reservation)
+
+        since = ObjectChange.objects.aggregate(Max("pk"))["pk__max"]
+
+        self.save(host_reservations[2])
+        host_reservations[0].snapshot()
+        host_reservations[0].hostname = "host-1"
+        self.save(host_reservations[0], ObjectChangeActionChoices.ACTION_UPDATE)
+        self.save(host_reservations[1], ObjectChangeActionChoices.ACTION_DELETE)
+
+        delta = self.get_delta(since)
+        reservations = delta["reservations"]
+
+        self.assertEqual(len(reservations["add"]), 1)
+        self.assertEqual(len(reservations["update"]), 1)
+        self.assertEqual(reservations["update"][0]["hostname"], "host-1")
+        self.assertEqual(len(reservations["delete"]), 1)
+        self.assertEqual(reservations["delete"][0]["subnet-id"], subnet.subnet_id)
+        self.assertEqual(reservations["delete"][0]["identifier-type"], "duid")
+        self.assertEqual(delta["subnets"]["add"], [])
+        self.assertEqual(delta["cursor"], ObjectChange.objects.latest("pk").pk)
+
+        self.assertEqual(
+            self.get_delta(delta["cursor"])["reservations"],
+            {"add": [], "update": [], "delete": []},
+        )
+
+    def test_create_and_delete(self):
+        since = ObjectChange.objects.aggregate(Max("pk"))["pk__max"] or 0
+
+        subnet = Subnet(
+            name="test-subnet-1",
+            dhcp_server=self.dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+        self.save(subnet)
+        self.save(subnet, ObjectChangeActionChoices.ACTION_DELETE)
+
+        delta = self.get_delta(since)
+
+        self.assertEqual(delta["subnets"], {"add": [], "update": [], "delete": []})
+
+    def create_host_reservation(self):
+        subnet = Subnet(
+            name="test-subnet-1",
+            dhcp_server=self.dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+        self.save(subnet)
+        host_reservation = HostReservation(
+            name="test-reservation-1",
+            subnet=subnet,
+            duid="00:01:00:01",
+        )
+        self.save(host_reservation)
+
+        return host_reservation
+
+    def test_option(self):
+        host_reservation = self.create_host_reservation()
+        option = Option(
+            definition=OptionDefinition.objects.get(
+                space=OptionSpaceChoices.DHCPV4, name="routers"
+            ),
+            data="192.0.2.1",
+            assigned_object=host_reservation,
+        )
+        self.save(option)
+
+        since = ObjectChange.objects.aggregate(Max("pk"))["pk__max"]
+        option.snapshot()
+        option.data = "192.0.2.254"
+        self.save(option, ObjectChangeActionChoices.ACTION_UPDATE)
+
+        delta = self.get_delta(since)
+        reservations = delta["reservations"]
+
+        self.assertFalse(delta["reload"])
+        self.assertEqual(reservations["add"], [])
+        self.assertEqual(reservations["delete"], [])
+        self.assertEqual(len(reservations["update"]), 1)
+        self.assertEqual(
+            reservations["update"][0]["option-data"][0]["data"], "192.0.2.254"
+        )
+
+        since = delta["cursor"]
+        self.save(option, ObjectChangeActionChoices.ACTION_DELETE)
+
+        delta = self.get_delta(since)
+        self.assertEqual(len(delta["reservations"]["update"]), 1)
+        self.assertNotIn("option-data", delta["reservations"]["update"][0])
+
+    def test_ip_address(self):
+        host_reservation = self.create_host_reservation()
+        ipv4_address = TestObjects.get_ipv4_addresses()[0]
+        host_reservation.snapshot()
+        host_reservation.ipv4_address = ipv4_address
+        self.save(host_reservation, ObjectChangeActionChoices.ACTION_UPDATE)
+
+        since = ObjectChange.objects.aggregate(Max("pk"))["pk__max"]
+        ipv4_address.snapshot()
+        ipv4_address.address = "192.0.2.100/24"
+        self.save(ipv4_address, ObjectChangeActionChoices.ACTION_UPDATE)
+
+        delta = self.get_delta(since)
+        self.assertFalse(delta["reload"])
+        self.assertEqual(
+            delta["reservations"]["update"][0]["ip-address"], "192.0.2.100"
+        )
+
+        since = delta["cursor"]
+        self.save(ipv4_address, ObjectChangeActionChoices.ACTION_DELETE)
+
+        self.assertTrue(self.get_delta(since)["reload"])
+
+    def test_shared_network_option(self):
+        shared_network = SharedNetwork(
+            name="test-shared-network-1",
+            dhcp_server=self.dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+        self.save(shared_network)
+
+        since = ObjectChange.objects.aggregate(Max("pk"))["pk__max"]
+        self.save(
+            Option(
+                definition=OptionDefinition.objects.get(
+                    space=OptionSpaceChoices.DHCPV4, name="routers"
+                ),
+                data="192.0.2.1",
+                assigned_object=shared_network,
+            )
+        )
+
+        self.assertTrue(self.get_delta(since)["reload"])
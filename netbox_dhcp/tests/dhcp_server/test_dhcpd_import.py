@@ -0,0 +1,200 @@
+import io
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from ipam.models import Prefix
+
+from netbox_dhcp.importers import DhcpdConfigImporter, DhcpdParser, DhcpdTokenizer
+from netbox_dhcp.models import (
+    ClientClass,
+    DHCPServer,
+    HostReservation,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+
+
+DHCPD_CONFIG = """
+# dhcpd.conf
+option domain-name "example.com";
+option domain-name-servers 192.0.2.1, 192.0.2.2;
+default-lease-time 600;
+max-lease-time 7200;
+authoritative;
+ddns-update-style none;
+
+class "pxe" {
+    match if substring(option vendor-class-identifier, 0, 9) = "PXEClient";
+}
+
+shared-network "test-shared-network" {
+    subnet 198.51.100.0 netmask 255.255.255.128 {
+    }
+    subnet 198.51.100.128 netmask 255.255.255.128 {
+    }
+    pool {
+        allow members of "pxe";
+        range 198.51.100.10 198.51.100.20;
+    }
+}
+
+subnet 192.0.2.0 netmask 255.255.255.0 {
+    range 192.0.2.100 192.0.2.199;
+    option routers 192.0.2.1;
+    on commit { set hostname = "x"; }
+    host inner { hardware ethernet 02:00:00:00:01:00; fixed-address 192.0.2.5; }
+}
+
+group {
+    use-host-decl-names on;
+%s
+}
+"""
+
+
+class DhcpdConfigImporterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser", is_superuser=True
+        )
+
+    def get_data(self, count):
+        return DHCPD_CONFIG % "\n".join(
+            f"    host host-{number} {{ hardware ethernet 02:00:00:00:00:{number:02x}; "
+            f"fixed-address 192.0.2.{number + 10}; }}"
+            for number in range(count)
+        )
+
+    def run_import(self, data, chunk_size=10):
+        importer = DhcpdConfigImporter(
+            "test-dhcpd-server", 4, self.user, uuid.uuid4(), chunk_size=chunk_size
+        )
+        progress = list(importer.run(io.StringIO(data)))
+
+        return importer, progress
+
+    def test_import(self):
+        importer, progress = self.run_import(self.get_data(25))
+
+        self.assertEqual(importer.failed, 0)
+        self.assertIn("global.ddns-update-style", progress[-1]["ignored_keys"])
+        self.assertIn("subnet.on", progress[-1]["ignored_keys"])
+
+        dhcp_server = DHCPServer.objects.get(name="test-dhcpd-server")
+        self.assertEqual(dhcp_server.valid_lifetime, 600)
+        self.assertEqual(dhcp_server.max_valid_lifetime, 7200)
+        self.assertTrue(
+            ClientClass.objects.filter(name="pxe", dhcp_server=dhcp_server).exists()
+        )
+
+        subnet = Subnet.objects.get(prefix__prefix="192.0.2.0/24")
+        self.assertEqual(subnet.dhcp_server, dhcp_server)
+        pool = Pool.objects.get(subnet=subnet)
+        self.assertEqual(str(pool.ip_range.start_address), "192.0.2.100/24")
+
+        shared_network = SharedNetwork.objects.get(name="test-shared-network")
+        self.assertEqual(shared_network.child_subnets.count(), 2)
+        pool = Pool.objects.get(subnet__prefix__prefix="198.51.100.0/25")
+        self.assertEqual(
+            [client_class.name for client_class in pool.client_classes.all()],
+            ["pxe"],
+        )
+
+        host_reservations = HostReservation.objects.filter(subnet=subnet)
+        self.assertEqual(host_reservations.count(), 26)
+        host_reservation = host_reservations.get(name="test-dhcpd-server-host-5")
+        self.assertEqual(host_reservation.hostname, "host-5")
+        self.assertEqual(str(host_reservation.ipv4_address.address), "192.0.2.15/24")
+        self.assertIsNone(
+            host_reservations.get(name="test-dhcpd-server-inner").hostname
+        )
+
+    def test_import_again(self):
+        self.run_import(self.get_data(5))
+        counts = [model.objects.count() for model in (Subnet, Pool, HostReservation)]
+
+        importer, _progress = self.run_import(self.get_data(10))
+
+        self.assertEqual(importer.failed, 0)
+        self.assertEqual(
+            [model.objects.count() for model in (Subnet, Pool, HostReservation)],
+            [counts[0], counts[1], counts[2] + 5],
+        )
+
+    def test_global_host(self):
+        importer, _progress = self.run_import(
+            DHCPD_CONFIG % "    host outside { hardware ethernet 02:00:00:00:02:00; "
+            "fixed-address 203.0.113.1; }"
+        )
+
+        self.assertEqual(importer.failed, 0)
+        host_reservation = HostReservation.objects.get(name="test-dhcpd-server-outside")
+        self.assertEqual(host_reservation.dhcp_server.name, "test-dhcpd-server")
+        self.assertIsNone(host_reservation.subnet)
+
+    def test_subnet_errors(self):
+        Subnet.objects.create(
+            name="test-dhcpd-server-192.0.2.0/24",
+            dhcp_server=DHCPServer.objects.create(name="other-dhcpd-server"),
+            prefix=Prefix.objects.create(prefix="192.0.2.0/24"),
+        )
+
+        importer, _progress = self.run_import(self.get_data(1))
+
+        self.assertIn(
+            "host inner (line 29)", [error["path"] for error in importer.errors]
+        )
+        self.assertFalse(
+            HostReservation.objects.filter(name="test-dhcpd-server-inner").exists()
+        )
+
+    def test_tokenizer(self):
+        tokens = list(
+            DhcpdTokenizer(
+                io.StringIO(
+                    'option domain-name "a \\"b\\" # c"; # comment "\n'
+                    'option x "multi\nline",1;\n'
+                )
+            )
+        )
+
+        self.assertEqual(
+            [(token.type, token.value, token.line) for token in tokens],
+            [
+                ("word", "option", 1),
+                ("word", "domain-name", 1),
+                ("string", 'a "b" # c', 1),
+                (";", ";", 1),
+                ("word", "option", 2),
+                ("word", "x", 2),
+                ("string", "multi\nline", 2),
+                (",", ",", 2),
+                ("word", "1", 2),
+                (";", ";", 2),
+            ],
+        )
+
+    def test_invalid_config(self):
+        for data in (
+            "subnet 192.0.2.0 netmask 255.255.255.0 {",
+            "host test { fixed-address 192.0.2.1; }}",
+            'include "hosts.conf";',
+            'option domain-name "unterminated;',
+            "pool { range 192.0.2.1 192.0.2.2; }",
+        ):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                list(DhcpdParser(DhcpdTokenizer(io.StringIO(data)), 4).parse())
+
+    def test_unterminated_string(self):
+        tokenizer = DhcpdTokenizer(
+            io.StringIO(
+                'option domain-name "unterminated;\n' + "host test { }\n" * 1000
+            )
+        )
+
+        with self.assertRaisesMessage(ValueError, "Line 1: Unterminated string."):
+            list(tokenizer)
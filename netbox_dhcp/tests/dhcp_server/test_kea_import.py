@@ -0,0 +1,244 @@
+import json
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.models import ObjectChange, ObjectType
+from dcim.models import MACAddress
+from ipam.models import IPAddress, IPRange, Prefix
+from users.models import ObjectPermission
+
+from netbox_dhcp.importers import KeaConfigImporter, parse_kea_config
+from netbox_dhcp.models import (
+    ClientClass,
+    DHCPServer,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    PDPool,
+    Pool,
+    SharedNetwork,
+    Subnet,
+)
+
+
+KEA_CONFIG = """
+// Exported from kea-dhcp4
+{
+    "Dhcp4": {
+        "valid-lifetime": 4000,
+        "lease-database": {"type": "memfile"},
+        "client-classes": [
+            {"name": "ipxe", "test": "option[77].hex == 'iPXE'"}
+        ],
+        "option-data": [
+            {"name": "domain-name-servers", "data": "192.0.2.1"}
+        ],
+        "subnet4": [
+            {
+                "id": 9001,
+                "subnet": "192.0.2.0/24",
+                "client-classes": ["ipxe"],
+                "pools": [{"pool": "192.0.2.100 - 192.0.2.199"}],
+                "option-data": [{"name": "routers", "data": "192.0.2.1"}],
+                "reservations": %s
+            }
+        ],
+        "shared-networks": [
+            {
+                "name": "test-shared-network",
+                "subnet4": [
+                    {"id": 9002, "subnet": "198.51.100.0/25"},
+                    {"id": 9003, "subnet": "198.51.100.128/25"}
+                ]
+            }
+        ]
+    }
+}
+"""
+
+
+class KeaConfigImporterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser", is_superuser=True
+        )
+
+    def get_data(self, count):
+        return KEA_CONFIG % json.dumps(
+            [
+                {
+                    "hw-address": f"02:00:00:00:00:{number:02x}",
+                    "ip-address": f"192.0.2.{number + 10}",
+                    "hostname": f"host-{number}",
+                }
+                for number in range(count)
+            ]
+        )
+
+    def run_import(self, data, chunk_size=10, name="test-kea-server"):
+        family, config = parse_kea_config(data)
+        importer = KeaConfigImporter(
+            name, family, self.user, uuid.uuid4(), chunk_size=chunk_size
+        )
+        progress = list(importer.run(config))
+
+        return importer, progress
+
+    def test_import(self):
+        importer, progress = self.run_import(self.get_data(25))
+
+        self.assertEqual(importer.failed, 0)
+        self.assertIn("Dhcp4.lease-database", progress[-1]["ignored_keys"])
+
+        dhcp_server = DHCPServer.objects.get(name="test-kea-server")
+        self.assertEqual(dhcp_server.valid_lifetime, 4000)
+        self.assertTrue(
+            ClientClass.objects.filter(name="ipxe", dhcp_server=dhcp_server).exists()
+        )
+
+        subnet = Subnet.objects.get(subnet_id=9001)
+        self.assertEqual(subnet.dhcp_server, dhcp_server)
+        self.assertEqual(str(subnet.prefix.prefix), "192.0.2.0/24")
+        self.assertEqual(
+            [client_class.name for client_class in subnet.client_classes.all()],
+            ["ipxe"],
+        )
+
+        pool = Pool.objects.get(subnet=subnet)
+        self.assertEqual(str(pool.ip_range.start_address), "192.0.2.100/24")
+        self.assertEqual(str(pool.ip_range.end_address), "192.0.2.199/24")
+
+        shared_network = SharedNetwork.objects.get(name="test-shared-network")
+        self.assertEqual(str(shared_network.prefix.prefix), "198.51.100.0/24")
+        self.assertEqual(shared_network.child_subnets.count(), 2)
+
+        host_reservations = HostReservation.objects.filter(subnet=subnet)
+        self.assertEqual(host_reservations.count(), 25)
+        host_reservation = host_reservations.get(hostname="host-5")
+        self.assertEqual(str(host_reservation.ipv4_address.address), "192.0.2.15/24")
+        self.assertEqual(
+            str(host_reservation.hw_address.mac_address), "02:00:00:00:00:05"
+        )
+
+        self.assertEqual(Option.objects.count(), 2)
+        self.assertEqual(
+            ObjectChange.objects.filter(
+                changed_object_id__in=host_reservations.values("pk")
+            ).count(),
+            25,
+        )
+
+    def test_import_again(self):
+        self.run_import(self.get_data(5))
+        counts = [
+            model.objects.count()
+            for model in (Subnet, Pool, HostReservation, Option, Prefix, IPRange)
+        ]
+
+        importer, _progress = self.run_import(self.get_data(10))
+
+        self.assertEqual(importer.failed, 0)
+        self.assertEqual(HostReservation.objects.count(), counts[2] + 5)
+        self.assertEqual(IPAddress.objects.count(), 10)
+        self.assertEqual(
+            [
+                model.objects.count()
+                for model in (Subnet, Pool, Option, Prefix, IPRange)
+            ],
+            [counts[0], counts[1], counts[3], counts[4], counts[5]],
+        )
+
+    def test_errors(self):
+        data = KEA_CONFIG % json.dumps(
+            [
+                {"hostname": "no-identifier", "ip-address": "192.0.2.10"},
+                {"hw-address": "02:00:00:00:00:01", "ip-address": "192.0.2.300"},
+            ]
+        )
+
+        importer, _progress = self.run_import(data)
+
+        self.assertEqual(importer.failed, 2)
+        self.assertEqual(
+            [error["path"] for error in importer.errors],
+            ["subnet4[0].reservations[0]", "subnet4[0].reservations[1]"],
+        )
+
+    def test_row_errors(self):
+        self.run_import(self.get_data(1), name="other-kea-server")
+        data = (
+            self.get_data(3)
+            .replace('"id": 9002', '"id": 9012')
+            .replace('"id": 9003', '"id": 9013')
+        )
+
+        importer, _progress = self.run_import(data)
+
+        self.assertEqual(importer.failed, 4)
+        self.assertEqual(
+            [error["path"] for error in importer.errors],
+            ["subnet4[0]", "subnet4[0].reservations"],
+        )
+        self.assertEqual(
+            sorted(
+                Subnet.objects.filter(dhcp_server__name="test-kea-server").values_list(
+                    "subnet_id", flat=True
+                )
+            ),
+            [9012, 9013],
+        )
+
+    def test_restricted_permissions(self):
+        user = get_user_model().objects.create_user(username="restricteduser")
+        object_permission = ObjectPermission.objects.create(
+            name="Test permission",
+            actions=["add", "change", "view"],
+            constraints={"name": "test-kea-server-192.0.2.0/24"},
+        )
+        object_permission.object_types.set([ObjectType.objects.get_for_model(Subnet)])
+        object_permission.users.add(user)
+        object_permission = ObjectPermission.objects.create(
+            name="Test permission 2",
+            actions=["add", "change", "view"],
+        )
+        object_permission.object_types.set(
+            [
+                ObjectType.objects.get_for_model(model)
+                for model in (
+                    ClientClass,
+                    DHCPServer,
+                    HostReservation,
+                    IPAddress,
+                    IPRange,
+                    MACAddress,
+                    Option,
+                    OptionDefinition,
+                    PDPool,
+                    Pool,
+                    Prefix,
+                    SharedNetwork,
+                )
+            ]
+        )
+        object_permission.users.add(user)
+        family, config = parse_kea_config(self.get_data(1))
+
+        importer = KeaConfigImporter("test-kea-server", family, user, uuid.uuid4())
+        list(importer.run(config))
+
+        self.assertEqual(
+            list(Subnet.objects.values_list("subnet_id", flat=True)), [9001]
+        )
+        self.assertEqual(
+            [error["path"] for error in importer.errors],
+            ["shared-networks[0].subnet4[0]", "shared-networks[0].subnet4[1]"],
+        )
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            parse_kea_config('{"Dhcp4": {}, "Dhcp6": {}}')
+        with self.assertRaises(ValueError):
+            parse_kea_config('<?include "subnets.json"?>')
@@ -0,0 +1,119 @@
+from django.test import TestCase
+
+from netbox_dhcp.choices import OptionSendChoices, OptionSpaceChoices
+from netbox_dhcp.kea import KeaOptionResolver
+from netbox_dhcp.models import (
+    DHCPServer,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    Pool,
+    Subnet,
+)
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class KeaOptionResolverTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        cls.client_classes = TestObjects.get_client_classes(cls.dhcp_server)
+        ipv4_prefixes = TestObjects.get_ipv4_prefixes()
+        ipv4_ranges = TestObjects.get_ipv4_ranges()
+
+        cls.subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=cls.dhcp_server,
+            prefix=ipv4_prefixes[0],
+        )
+        cls.subnet.client_classes.add(cls.client_classes[0])
+        cls.pool = Pool.objects.create(
+            name="test-pool-1",
+            subnet=cls.subnet,
+            ip_range=ipv4_ranges[0],
+        )
+        cls.host_reservation = HostReservation.objects.create(
+            name="test-host-reservation-1",
+            subnet=cls.subnet,
+        )
+
+        definitions = {
+            name: OptionDefinition.objects.get(
+                space=OptionSpaceChoices.DHCPV4, name=name
+            )
+            for name in (
+                "routers",
+                "domain-name-servers",
+                "interface-mtu",
+                "ip-forwarding",
+            )
+        }
+
+        def create_option(name, data, assigned_object, **kwargs):
+            return Option.objects.create(
+                definition=definitions[name],
+                data=data,
+                assigned_object=assigned_object,
+                **kwargs,
+            )
+
+        cls.server_routers = create_option("routers", "192.0.2.1", cls.dhcp_server)
+        cls.server_mtu = create_option("interface-mtu", "1500", cls.dhcp_server)
+        cls.server_forwarding = create_option("ip-forwarding", "false", cls.dhcp_server)
+        cls.class_dns = create_option(
+            "domain-name-servers", "192.0.2.53", cls.client_classes[0]
+        )
+        cls.unused_class_dns = create_option(
+            "domain-name-servers", "192.0.2.54", cls.client_classes[1]
+        )
+        cls.subnet_routers = create_option("routers", "192.0.2.254", cls.subnet)
+        cls.subnet_routers_fallback = create_option(
+            "routers", "192.0.2.253", cls.subnet, weight=200
+        )
+        cls.subnet_forwarding = create_option(
+            "ip-forwarding",
+            "true",
+            cls.subnet,
+            send_option=OptionSendChoices.NEVER_SEND,
+        )
+        cls.host_reservation_mtu = create_option(
+            "interface-mtu", "9000", cls.host_reservation
+        )
+
+    def test_resolve(self):
+        resolver = KeaOptionResolver(self.dhcp_server)
+
+        with self.assertNumQueries(12):
+            effective = resolver.resolve()
+
+        self.assertEqual(
+            set(effective[(DHCPServer, self.dhcp_server.pk)]),
+            {self.server_routers, self.server_mtu, self.server_forwarding},
+        )
+        self.assertEqual(
+            set(effective[(Subnet, self.subnet.pk)]),
+            {self.subnet_routers, self.server_mtu, self.class_dns},
+        )
+        self.assertEqual(
+            set(effective[(Pool, self.pool.pk)]),
+            {self.subnet_routers, self.server_mtu, self.class_dns},
+        )
+        self.assertEqual(
+            set(effective[(HostReservation, self.host_reservation.pk)]),
+            {self.subnet_routers, self.host_reservation_mtu, self.class_dns},
+        )
+
+    def test_resolve_object(self):
+        effective = KeaOptionResolver(self.dhcp_server).resolve()
+
+        for obj in (
+            self.dhcp_server,
+            self.client_classes[0],
+            self.subnet,
+            self.pool,
+            self.host_reservation,
+        ):
+            self.assertEqual(
+                KeaOptionResolver.for_object(obj).resolve_object(obj),
+                effective[(obj._meta.model, obj.pk)],
+            )
@@ -0,0 +1,98 @@
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ipam.choices import IPAddressFamilyChoices
+
+from netbox_dhcp.kea import KeaConfigRenderer
+from netbox_dhcp.models import (
+    HostReservation,
+    Option,
+    OptionDefinition,
+    Pool,
+    Subnet,
+)
+from netbox_dhcp.choices import OptionSpaceChoices
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class KeaConfigRendererTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        cls.ipv4_prefixes = TestObjects.get_ipv4_prefixes()
+        cls.ipv4_ranges = TestObjects.get_ipv4_ranges()
+
+        cls.subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=cls.dhcp_server,
+            prefix=cls.ipv4_prefixes[0],
+        )
+        cls.pool = Pool.objects.create(
+            name="test-pool-1",
+            subnet=cls.subnet,
+            ip_range=cls.ipv4_ranges[0],
+        )
+        Option.objects.create(
+            definition=OptionDefinition.objects.get(
+                space=OptionSpaceChoices.DHCPV4, name="routers"
+            ),
+            data="192.0.2.1",
+            assigned_object=cls.subnet,
+        )
+
+    def create_host_reservations(self, count):
+        HostReservation.objects.bulk_create(
+            HostReservation(
+                name=f"test-reservation-{index}",
+                subnet=self.subnet,
+                hostname=f"host-{index}",
+            )
+            for index in range(HostReservation.objects.count(), count)
+        )
+
+    def render(self):
+        renderer = KeaConfigRenderer(
+            self.dhcp_server, family=IPAddressFamilyChoices.FAMILY_4
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            config = renderer.render()
+
+        return config, len(context.captured_queries)
+
+    def test_render(self):
+        self.create_host_reservations(10)
+
+        config, _ = self.render()
+        subnets = config["Dhcp4"]["subnet4"]
+
+        self.assertEqual(len(subnets), 1)
+        self.assertEqual(subnets[0]["subnet"], str(self.ipv4_prefixes[0].prefix))
+        self.assertEqual(len(subnets[0]["pools"]), 1)
+        self.assertEqual(len(subnets[0]["reservations"]), 10)
+        self.assertEqual(subnets[0]["option-data"][0]["name"], "routers")
+
+    def test_render_query_count(self):
+        self.create_host_reservations(10)
+        _, small_query_count = self.render()
+
+        self.create_host_reservations(1000)
+        config, large_query_count = self.render()
+
+        self.assertEqual(len(config["Dhcp4"]["subnet4"][0]["reservations"]), 1000)
+        self.assertEqual(small_query_count, large_query_count)
+
+    def test_stream(self):
+        self.create_host_reservations(250)
+
+        renderer = KeaConfigRenderer(
+            self.dhcp_server, family=IPAddressFamilyChoices.FAMILY_4
+        )
+
+        self.assertEqual(
+            json.loads("".join(renderer.stream(chunk_size=100, buffer_size=1024))),
+            renderer.render(),
+        )
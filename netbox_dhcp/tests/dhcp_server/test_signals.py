@@ -0,0 +1,133 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.choices import ObjectChangeActionChoices
+from core.models import ObjectChange
+from netbox.context import current_request
+
+from dcim.models import Interface
+from dcim.choices import InterfaceTypeChoices
+from virtualization.models import VMInterface
+
+from netbox_dhcp.models import DHCPServer, DHCPServerInterface
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class DHCPServerInterfaceSignalTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_servers = TestObjects.get_dhcp_servers()
+        devices = TestObjects.get_devices()
+        virtual_machines = TestObjects.get_virtual_machines()
+
+        cls.device_interfaces = [
+            Interface(
+                name=f"eth{number}",
+                device=devices[0],
+                type=InterfaceTypeChoices.TYPE_1GE_FIXED,
+            )
+            for number in range(100)
+        ]
+        Interface.objects.bulk_create(cls.device_interfaces)
+
+        cls.virtual_machine_interfaces = [
+            VMInterface(
+                name=f"veth{number}",
+                virtual_machine=virtual_machines[0],
+            )
+            for number in range(100)
+        ]
+        VMInterface.objects.bulk_create(cls.virtual_machine_interfaces)
+
+    def count_queries(self, function, *args):
+        with CaptureQueriesContext(connection) as context:
+            function(*args)
+
+        return len(context.captured_queries)
+
+    def assertInterfaces(self, dhcp_server, field_name, interfaces):
+        self.assertEqual(
+            set(
+                DHCPServerInterface.objects.filter(dhcp_server=dhcp_server).values_list(
+                    f"{field_name}__pk", flat=True
+                )
+            ),
+            {interface.pk for interface in interfaces},
+        )
+        self.assertEqual(dhcp_server.interfaces.count(), len(interfaces))
+
+    def check_query_count(self, field_name, interfaces):
+        small, large = self.dhcp_servers[0], self.dhcp_servers[1]
+
+        small_queries = self.count_queries(
+            getattr(small, f"{field_name}s").add, *interfaces[:2]
+        )
+        large_queries = self.count_queries(
+            getattr(large, f"{field_name}s").add, *interfaces
+        )
+        self.assertEqual(small_queries, large_queries)
+        self.assertInterfaces(small, field_name, interfaces[:2])
+        self.assertInterfaces(large, field_name, interfaces)
+
+        small_queries = self.count_queries(
+            getattr(small, f"{field_name}s").remove, *interfaces[:1]
+        )
+        large_queries = self.count_queries(
+            getattr(large, f"{field_name}s").remove, *interfaces[:50]
+        )
+        self.assertEqual(small_queries, large_queries)
+        self.assertInterfaces(small, field_name, interfaces[1:2])
+        self.assertInterfaces(large, field_name, interfaces[50:])
+
+        small_queries = self.count_queries(getattr(small, f"{field_name}s").clear)
+        large_queries = self.count_queries(getattr(large, f"{field_name}s").clear)
+        self.assertEqual(small_queries, large_queries)
+        self.assertInterfaces(small, field_name, [])
+        self.assertInterfaces(large, field_name, [])
+
+    def test_device_interfaces(self):
+        self.check_query_count("device_interface", self.device_interfaces)
+
+    def test_virtual_machine_interfaces(self):
+        self.check_query_count(
+            "virtual_machine_interface", self.virtual_machine_interfaces
+        )
+
+    def test_config_generation(self):
+        dhcp_server = self.dhcp_servers[0]
+
+        dhcp_server.device_interfaces.add(*self.device_interfaces[:2])
+
+        self.assertGreater(
+            DHCPServer.objects.get(pk=dhcp_server.pk).config_generation,
+            dhcp_server.config_generation,
+        )
+
+    def test_change_logging(self):
+        dhcp_server = self.dhcp_servers[0]
+        request = RequestFactory().get("/")
+        request.user = get_user_model().objects.create_user(username="testuser")
+        request.id = uuid.uuid4()
+
+        token = current_request.set(request)
+        try:
+            dhcp_server.device_interfaces.add(*self.device_interfaces[:2])
+        finally:
+            current_request.reset(token)
+
+        changes = ObjectChange.objects.filter(
+            request_id=request.id,
+            changed_object_type__model="dhcpserverinterface",
+        )
+        self.assertEqual(
+            set(changes.values_list("action", flat=True)),
+            {ObjectChangeActionChoices.ACTION_CREATE},
+        )
+        self.assertEqual(
+            sorted(changes.values_list("object_repr", flat=True)),
+            ["eth0", "eth1"],
+        )
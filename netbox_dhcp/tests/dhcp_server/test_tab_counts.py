@@ -0,0 +1,46 @@
+from django.test import TestCase
+
+from netbox_dhcp.models import HostReservation, Subnet
+from netbox_dhcp.tests.custom import TestObjects
+from netbox_dhcp.views import (
+    DHCPServerChildHostReservationListView,
+    DHCPServerChildSharedNetworkListView,
+    DHCPServerChildSubnetListView,
+    DHCPServerOptionDefinitionListView,
+    DHCPServerOptionListView,
+)
+
+
+class DHCPServerTabCountTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        ipv4_prefixes = TestObjects.get_ipv4_prefixes()
+
+        for number, prefix in enumerate(ipv4_prefixes[:2], start=1):
+            Subnet.objects.create(
+                name=f"test-subnet-{number}",
+                dhcp_server=cls.dhcp_server,
+                prefix=prefix,
+            )
+        HostReservation.objects.bulk_create(
+            HostReservation(
+                name=f"test-host-reservation-{number}",
+                dhcp_server=cls.dhcp_server,
+            )
+            for number in range(3)
+        )
+
+    def test_badges(self):
+        views = (
+            DHCPServerChildSubnetListView,
+            DHCPServerChildSharedNetworkListView,
+            DHCPServerChildHostReservationListView,
+            DHCPServerOptionListView,
+            DHCPServerOptionDefinitionListView,
+        )
+
+        with self.assertNumQueries(1):
+            badges = [view.tab.badge(self.dhcp_server) for view in views]
+
+        self.assertEqual(badges, [2, 0, 3, 0, 0])
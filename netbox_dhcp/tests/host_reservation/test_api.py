@@ -1,3 +1,9 @@
+import json
+
+from django.urls import reverse
+from rest_framework import status
+
+from extras.models import CachedValue
 from utilities.testing import APIViewTestCases
 
 from netbox_dhcp.tests.custom import (
@@ -105,3 +111,229 @@ class HostReservationAPITestCase(
             "dhcp_server": dhcp_servers[2].pk,
             "client_classes": [client_class.pk for client_class in client_classes],
         }
+
+
+class HostReservationExportTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        dhcp_server = TestObjects.get_dhcp_servers()[0]
+        mac_addresses = TestObjects.get_mac_addresses()
+        ipv4_addresses = TestObjects.get_ipv4_addresses()
+        cls.ipv6_addresses = TestObjects.get_ipv6_addresses()
+        cls.ipv6_prefixes = TestObjects.get_ipv6_prefixes()
+
+        cls.host_reservations = [
+            HostReservation.objects.create(
+                name=f"test-host-reservation-{number}",
+                dhcp_server=dhcp_server,
+                hw_address=mac_addresses[number],
+                ipv4_address=ipv4_addresses[number],
+            )
+            for number in range(3)
+        ]
+        cls.host_reservations[0].ipv6_addresses.set(cls.ipv6_addresses[:2])
+        cls.host_reservations[0].ipv6_prefixes.set(cls.ipv6_prefixes[:1])
+        cls.host_reservations[0].excluded_ipv6_prefixes.set(cls.ipv6_prefixes[1:])
+
+    def get_records(self, **params):
+        response = self.client.get(
+            reverse("plugins-api:netbox_dhcp-api:hostreservation-export-ndjson"),
+            params,
+            **self.header,
+        )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        return [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+
+    def test_export(self):
+        self.add_permissions("netbox_dhcp.view_hostreservation")
+
+        records = self.get_records()
+        self.assertEqual(
+            [record["id"] for record in records],
+            [host_reservation.pk for host_reservation in self.host_reservations],
+        )
+
+        record = records[0]
+        self.assertEqual(record["name"], "test-host-reservation-0")
+        self.assertEqual(record["hw_address"], "08:00:2B:00:00:01")
+        self.assertEqual(record["ipv4_address"], "192.0.2.1/24")
+        self.assertEqual(record["ipv6_addresses"], ["2001:db8::1/64", "2001:db8::2/64"])
+        self.assertEqual(record["ipv6_prefixes"], ["2001:db8:1::/64"])
+        self.assertEqual(
+            record["excluded_ipv6_prefixes"], ["2001:db8:2::/64", "2001:db8:3::/64"]
+        )
+        self.assertEqual(records[1]["ipv6_addresses"], [])
+
+    def test_export_filtered(self):
+        self.add_permissions("netbox_dhcp.view_hostreservation")
+
+        records = self.get_records(name="test-host-reservation-1")
+        self.assertEqual(
+            [record["id"] for record in records], [self.host_reservations[1].pk]
+        )
+
+    def test_export_without_permission(self):
+        response = self.client.get(
+            reverse("plugins-api:netbox_dhcp-api:hostreservation-export-ndjson"),
+            **self.header,
+        )
+
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+
+
+class HostReservationUpsertTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        cls.client_classes = TestObjects.get_client_classes(cls.dhcp_server)
+        cls.ipv6_addresses = TestObjects.get_ipv6_addresses()
+
+        cls.host_reservation = HostReservation.objects.create(
+            name="test-host-reservation-1",
+            dhcp_server=cls.dhcp_server,
+            duid="00:01:00:01:00:00:00:01",
+        )
+        cls.host_reservation.ipv6_addresses.set(cls.ipv6_addresses[:2])
+
+    def upsert(self, host_reservations, identifier="duid"):
+        response = self.client.post(
+            reverse("plugins-api:netbox_dhcp-api:hostreservation-upsert"),
+            {"identifier": identifier, "host_reservations": host_reservations},
+            format="json",
+            **self.header,
+        )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+        return response.data
+
+    def test_upsert(self):
+        self.add_permissions(
+            "netbox_dhcp.add_hostreservation",
+            "netbox_dhcp.change_hostreservation",
+            "netbox_dhcp.view_clientclass",
+            "netbox_dhcp.view_dhcpserver",
+            "ipam.view_ipaddress",
+        )
+
+        results = self.upsert(
+            [
+                {
+                    "dhcp_server": self.dhcp_server.pk,
+                    "duid": "00:01:00:01:00:00:00:01",
+                    "hostname": "host1.example.com",
+                    "ipv6_addresses": [self.ipv6_addresses[1].pk],
+                    "client_classes": [self.client_classes[0].pk],
+                },
+                {
+                    "name": "test-host-reservation-2",
+                    "dhcp_server": self.dhcp_server.pk,
+                    "duid": "00:01:00:01:00:00:00:02",
+                    "ipv6_addresses": [self.ipv6_addresses[2].pk],
+                },
+                {
+                    "dhcp_server": self.dhcp_server.pk,
+                    "duid": "00:01:00:01:00:00:00:03",
+                },
+                {
+                    "name": "test-host-reservation-4",
+                    "dhcp_server": self.dhcp_server.pk,
+                    "duid": "00:01:00:01:00:00:00:04",
+                    "ipv6_addresses": [0],
+                },
+            ]
+        )
+
+        self.assertEqual(
+            [result["status"] for result in results],
+            ["updated", "created", "error", "error"],
+        )
+        self.assertEqual(results[0]["id"], self.host_reservation.pk)
+        self.assertIn("name", results[2]["errors"])
+        self.assertIn("ipv6_addresses", results[3]["errors"])
+
+        self.host_reservation.refresh_from_db()
+        self.assertEqual(self.host_reservation.name, "test-host-reservation-1")
+        self.assertEqual(self.host_reservation.hostname, "host1.example.com")
+        self.assertEqual(
+            list(self.host_reservation.ipv6_addresses.all()), [self.ipv6_addresses[1]]
+        )
+        self.assertEqual(
+            list(self.host_reservation.client_classes.all()), [self.client_classes[0]]
+        )
+
+        host_reservation = HostReservation.objects.get(pk=results[1]["id"])
+        self.assertEqual(host_reservation.name, "test-host-reservation-2")
+        self.assertEqual(
+            list(host_reservation.ipv6_addresses.all()), [self.ipv6_addresses[2]]
+        )
+        self.assertFalse(
+            HostReservation.objects.filter(name="test-host-reservation-4").exists()
+        )
+        self.assertTrue(
+            CachedValue.objects.filter(
+                object_id=host_reservation.pk, value="test-host-reservation-2"
+            ).exists()
+        )
+
+    def test_upsert_change_permission(self):
+        self.add_permissions(
+            "netbox_dhcp.change_hostreservation",
+            "netbox_dhcp.view_dhcpserver",
+        )
+
+        results = self.upsert(
+            [
+                {
+                    "dhcp_server": self.dhcp_server.pk,
+                    "duid": "00:01:00:01:00:00:00:01",
+                    "hostname": "host1.example.com",
+                },
+                {
+                    "name": "test-host-reservation-2",
+                    "dhcp_server": self.dhcp_server.pk,
+                    "duid": "00:01:00:01:00:00:00:02",
+                },
+            ]
+        )
+
+        self.assertEqual([result["status"] for result in results], ["updated", "error"])
+        self.host_reservation.refresh_from_db()
+        self.assertEqual(self.host_reservation.hostname, "host1.example.com")
+
+    def test_upsert_without_permission(self):
+        self.add_permissions("netbox_dhcp.view_hostreservation")
+
+        response = self.client.post(
+            reverse("plugins-api:netbox_dhcp-api:hostreservation-upsert"),
+            {"identifier": "duid", "host_reservations": []},
+            format="json",
+            **self.header,
+        )
+
+        self.assertHttpStatus(response, status.HTTP_403_FORBIDDEN)
+
+    def test_upsert_duplicate_identifier(self):
+        self.add_permissions(
+            "netbox_dhcp.add_hostreservation",
+            "netbox_dhcp.change_hostreservation",
+            "netbox_dhcp.view_dhcpserver",
+        )
+
+        results = self.upsert(
+            [
+                {
+                    "name": f"test-host-reservation-{number}",
+                    "dhcp_server": self.dhcp_server.pk,
+                    "duid": "00:01:00:01:00:00:00:02",
+                }
+                for number in (2, 3)
+            ]
+        )
+
+        self.assertEqual([result["status"] for result in results], ["created", "error"])
+        self.assertIn("duid", results[1]["errors"])
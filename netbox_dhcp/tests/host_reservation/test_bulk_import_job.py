@@ -0,0 +1,98 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from core.models import ObjectChange
+from extras.models import CachedValue
+
+from netbox_dhcp.importers import BulkImporter, parse_records
+from netbox_dhcp.models import DHCPServer, HostReservation
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class HostReservationBulkImporterTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_servers = TestObjects.get_dhcp_servers()
+        cls.client_classes = TestObjects.get_client_classes(
+            dhcp_server=cls.dhcp_servers[0]
+        )
+        cls.user = get_user_model().objects.create_user(
+            username="testuser", is_superuser=True
+        )
+
+    def get_data(self, count):
+        return "\n".join(
+            (
+                "name,dhcp_server,client_classes",
+                *(
+                    f'test-host-reservation-{number},{self.dhcp_servers[0].name},"'
+                    f'{self.client_classes[0].name},{self.client_classes[1].name}"'
+                    for number in range(count)
+                ),
+            )
+        )
+
+    def run_import(self, data, chunk_size=10):
+        importer = BulkImporter(
+            "hostreservation", self.user, uuid.uuid4(), chunk_size=chunk_size
+        )
+        progress = list(importer.run(*parse_records(data)))
+
+        return importer, progress
+
+    def test_import(self):
+        config_generation = self.dhcp_servers[0].config_generation
+
+        importer, progress = self.run_import(self.get_data(25))
+
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(importer.created, 25)
+        self.assertEqual(importer.failed, 0)
+        self.assertEqual(progress[-1]["processed"], 25)
+
+        host_reservations = HostReservation.objects.filter(
+            name__startswith="test-host-reservation-"
+        )
+        self.assertEqual(host_reservations.count(), 25)
+        for host_reservation in host_reservations.prefetch_related("client_classes"):
+            self.assertEqual(
+                set(host_reservation.client_classes.all()),
+                set(self.client_classes[:2]),
+            )
+
+        self.assertEqual(
+            ObjectChange.objects.filter(
+                changed_object_id__in=host_reservations.values("pk")
+            ).count(),
+            25,
+        )
+        self.assertGreater(
+            DHCPServer.objects.get(pk=self.dhcp_servers[0].pk).config_generation,
+            config_generation,
+        )
+
+    def test_row_errors(self):
+        data = "\n".join(
+            (
+                "name,dhcp_server",
+                f"test-host-reservation-1,{self.dhcp_servers[0].name}",
+                "test-host-reservation-2,nonexistent-server",
+                f"test-host-reservation-1,{self.dhcp_servers[1].name}",
+                f"test-host-reservation-3,{self.dhcp_servers[1].name}",
+            )
+        )
+
+        importer, _progress = self.run_import(data)
+
+        self.assertEqual(importer.created, 2)
+        self.assertEqual(importer.failed, 2)
+        self.assertEqual([error["row"] for error in importer.errors], [2, 3])
+        self.assertEqual(
+            set(HostReservation.objects.values_list("name", flat=True)),
+            {"test-host-reservation-1", "test-host-reservation-3"},
+        )
+        self.assertEqual(
+            CachedValue.objects.filter(value="test-host-reservation-3").count(), 1
+        )
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from netbox_dhcp.forms import HostReservationImportForm
+from netbox_dhcp.forms.mixins import get_import_lookups, get_lookup_import_form
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class HostReservationImportLookupTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_servers = TestObjects.get_dhcp_servers()
+        cls.mac_addresses = TestObjects.get_mac_addresses()
+        cls.client_classes = TestObjects.get_client_classes(
+            dhcp_server=cls.dhcp_servers[0]
+        )
+        cls.user = get_user_model().objects.create_user(
+            username="testuser", is_superuser=True
+        )
+
+    def get_records(self):
+        return [
+            {
+                "name": f"test-host-reservation-{number}",
+                "dhcp_server": self.dhcp_servers[number % 3].name,
+                "hw_address": str(self.mac_addresses[number % 3].mac_address),
+                "client_classes": ",".join(
+                    client_class.name for client_class in self.client_classes[:2]
+                ),
+            }
+            for number in range(30)
+        ]
+
+    def test_lookups(self):
+        records = self.get_records()
+
+        # One query per referenced field, regardless of the number of records
+        with self.assertNumQueries(3):
+            lookups = get_import_lookups(
+                HostReservationImportForm, records, None, self.user
+            )
+        form_class = get_lookup_import_form(HostReservationImportForm, lookups)
+
+        for number, record in enumerate(records):
+            form = form_class(data=record)
+
+            with self.assertNumQueries(0):
+                self.assertEqual(
+                    form.fields["dhcp_server"].clean(record["dhcp_server"]),
+                    self.dhcp_servers[number % 3],
+                )
+                self.assertEqual(
+                    form.fields["hw_address"].clean(record["hw_address"]),
+                    self.mac_addresses[number % 3],
+                )
+                self.assertEqual(
+                    set(form.fields["client_classes"].clean(record["client_classes"])),
+                    set(self.client_classes[:2]),
+                )
+
+    def test_missing_object(self):
+        records = [{"dhcp_server": "nonexistent-server"}]
+        form_class = get_lookup_import_form(
+            HostReservationImportForm,
+            get_import_lookups(HostReservationImportForm, records, None, self.user),
+        )
+        form = form_class(data=records[0])
+
+        with self.assertNumQueries(0), self.assertRaises(ValidationError):
+            form.fields["dhcp_server"].clean("nonexistent-server")
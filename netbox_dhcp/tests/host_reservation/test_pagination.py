@@ -0,0 +1,73 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from netbox_dhcp.tests.custom import TestObjects, APITestCase
+from netbox_dhcp.models import HostReservation
+
+
+class HostReservationKeysetPaginationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        dhcp_server = TestObjects.get_dhcp_servers()[0]
+
+        HostReservation.objects.bulk_create(
+            HostReservation(
+                name=f"test-host-reservation-{number % 5}",
+                dhcp_server=dhcp_server,
+            )
+            for number in range(20)
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.add_permissions("netbox_dhcp.view_hostreservation")
+
+    def get_page(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params, **self.header)
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+        return response.data, len(context.captured_queries)
+
+    def test_keyset_pages(self):
+        url = reverse("plugins-api:netbox_dhcp-api:hostreservation-list")
+
+        data, first_queries = self.get_page(url, {"cursor": "", "limit": 3})
+        self.assertIsNone(data["count"])
+        self.assertIsNone(data["previous"])
+
+        results = [result["id"] for result in data["results"]]
+        while data["next"] is not None:
+            data, queries = self.get_page(data["next"])
+            self.assertEqual(queries, first_queries)
+            self.assertLessEqual(len(data["results"]), 3)
+            results.extend(result["id"] for result in data["results"])
+
+        self.assertEqual(
+            results,
+            list(
+                HostReservation.objects.order_by("name", "pk").values_list(
+                    "pk", flat=True
+                )
+            ),
+        )
+
+    def test_offset_pages(self):
+        data, _ = self.get_page(
+            reverse("plugins-api:netbox_dhcp-api:hostreservation-list"),
+            {"limit": 3, "offset": 3},
+        )
+
+        self.assertEqual(data["count"], 20)
+        self.assertEqual(len(data["results"]), 3)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            reverse("plugins-api:netbox_dhcp-api:hostreservation-list"),
+            {"cursor": "invalid"},
+            **self.header,
+        )
+
+        self.assertHttpStatus(response, status.HTTP_404_NOT_FOUND)
@@ -1,5 +1,9 @@
 from utilities.testing import APIViewTestCases
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
 
 from netbox_dhcp.tests.custom import (
     TestObjects,
@@ -127,3 +131,44 @@ class OptionAPITestCase(
             "client_classes": [],
             "send_option": None,
         }
+
+
+class OptionListQueryTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_servers = TestObjects.get_dhcp_servers()
+        cls.client_classes = TestObjects.get_client_classes(
+            dhcp_server=cls.dhcp_servers[0]
+        )
+        cls.definition = OptionDefinition.objects.get(
+            space=OptionSpaceChoices.DHCPV4,
+            name="interface-mtu",
+        )
+
+    def create_options(self, assigned_objects):
+        Option.objects.bulk_create(
+            Option(
+                definition=self.definition,
+                assigned_object=assigned_object,
+                data="1500",
+            )
+            for assigned_object in assigned_objects
+        )
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("plugins-api:netbox_dhcp-api:option-list"), **self.header
+            )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+        return len(context.captured_queries)
+
+    def test_list_query_count(self):
+        self.add_permissions("netbox_dhcp.view_option")
+
+        self.create_options(self.dhcp_servers[:1] + self.client_classes[:1])
+        queries = self.count_queries()
+
+        self.create_options(self.dhcp_servers * 10 + self.client_classes * 10)
+        self.assertEqual(self.count_queries(), queries)
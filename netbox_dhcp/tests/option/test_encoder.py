@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from ipam.choices import IPAddressFamilyChoices
+
+from netbox_dhcp.choices import OptionTypeChoices
+from netbox_dhcp.utilities import (
+    DHCPV4_OPTIONS_SIZE_MAX,
+    encode_option,
+    validate_option_size,
+)
+
+
+def get_option(data, csv_format=None, **definition):
+    return SimpleNamespace(
+        data=data,
+        csv_format=csv_format,
+        definition=SimpleNamespace(
+            **{
+                "family": IPAddressFamilyChoices.FAMILY_4,
+                "code": 1,
+                "array": False,
+                "record_types": None,
+                "encapsulate": None,
+                **definition,
+            }
+        ),
+    )
+
+
+class OptionEncoderTestCase(SimpleTestCase):
+    def test_encode_dhcpv4(self):
+        self.assertEqual(
+            encode_option(
+                get_option("255.255.255.0", type=OptionTypeChoices.TYPE_IPV4_ADDRESS)
+            ),
+            bytes.fromhex("0104ffffff00"),
+        )
+        self.assertEqual(
+            encode_option(
+                get_option(
+                    "192.0.2.1, 192.0.2.2",
+                    type=OptionTypeChoices.TYPE_IPV4_ADDRESS,
+                    array=True,
+                    code=6,
+                )
+            ),
+            bytes.fromhex("0608c0000201c0000202"),
+        )
+        self.assertEqual(
+            encode_option(
+                get_option("example.com", type=OptionTypeChoices.TYPE_FQDN, code=15)
+            ),
+            bytes.fromhex("0f0d076578616d706c6503636f6d00"),
+        )
+        self.assertEqual(
+            encode_option(
+                get_option(
+                    "0a:0b:0c", csv_format=False, type=OptionTypeChoices.TYPE_BINARY
+                )
+            ),
+            bytes.fromhex("01030a0b0c"),
+        )
+
+    def test_encode_dhcpv6(self):
+        self.assertEqual(
+            encode_option(
+                get_option(
+                    "1, 2001:db8::1",
+                    type=OptionTypeChoices.TYPE_RECORD,
+                    record_types=[
+                        OptionTypeChoices.TYPE_UINT8,
+                        OptionTypeChoices.TYPE_IPV6_ADDRESS,
+                    ],
+                    family=IPAddressFamilyChoices.FAMILY_6,
+                    code=1000,
+                )
+            ),
+            bytes.fromhex("03e800110120010db8000000000000000000000001"),
+        )
+
+    def test_long_option(self):
+        option = get_option("x" * 300, type=OptionTypeChoices.TYPE_STRING)
+        encoded = encode_option(option)
+
+        self.assertEqual(len(encoded), 304)
+        self.assertEqual(encoded[:2], bytes((1, 255)))
+        self.assertEqual(encoded[257:259], bytes((1, 45)))
+        self.assertEqual(validate_option_size(option), 304)
+
+        with self.assertRaises(ValidationError):
+            validate_option_size(
+                get_option(
+                    "x" * DHCPV4_OPTIONS_SIZE_MAX, type=OptionTypeChoices.TYPE_STRING
+                )
+            )
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValidationError):
+            encode_option(get_option("300", type=OptionTypeChoices.TYPE_UINT8))
@@ -0,0 +1,64 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from ipam.choices import IPAddressFamilyChoices
+
+from netbox_dhcp.choices import OptionSpaceChoices, OptionTypeChoices
+from netbox_dhcp.models import Option, OptionDefinition, Subnet
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class OptionSizeTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        dhcp_server = TestObjects.get_dhcp_servers()[0]
+
+        cls.subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=dhcp_server,
+            prefix=TestObjects.get_ipv4_prefixes()[0],
+        )
+        cls.definition, cls.suboption_definition = OptionDefinition.objects.bulk_create(
+            (
+                OptionDefinition(
+                    name="test-vendor-options",
+                    code=250,
+                    family=IPAddressFamilyChoices.FAMILY_4,
+                    type=OptionTypeChoices.TYPE_EMPTY,
+                    space=OptionSpaceChoices.DHCPV4,
+                    encapsulate=OptionSpaceChoices.VENDOR,
+                    dhcp_server=dhcp_server,
+                ),
+                OptionDefinition(
+                    name="test-vendor-option",
+                    code=1,
+                    family=IPAddressFamilyChoices.FAMILY_4,
+                    type=OptionTypeChoices.TYPE_STRING,
+                    space=OptionSpaceChoices.VENDOR,
+                    dhcp_server=dhcp_server,
+                ),
+            )
+        )
+
+    def test_suboption_size(self):
+        Option.objects.create(
+            definition=self.definition,
+            data="",
+            assigned_object=self.subnet,
+        )
+        Option.objects.create(
+            definition=self.suboption_definition,
+            data="x" * 200,
+            assigned_object=self.subnet,
+        )
+
+        option = Option(
+            definition=self.suboption_definition,
+            data="x" * 110,
+            assigned_object=self.subnet,
+        )
+        with self.assertRaises(ValidationError):
+            option.clean()
+
+        option.data = "x" * 50
+        option.clean()
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from netbox_dhcp.choices import OptionTypeChoices
+from netbox_dhcp.validators import validate_data, validate_many, validate_option_data
+
+
+class OptionDataValidatorTestCase(SimpleTestCase):
+    def test_validate_data(self):
+        validate_data("192.0.2.1", OptionTypeChoices.TYPE_IPV4_ADDRESS)
+        validate_data("-128", OptionTypeChoices.TYPE_INT8)
+        validate_data("0a:0b:0c", OptionTypeChoices.TYPE_BINARY)
+
+        with self.assertRaises(ValidationError):
+            validate_data("-129", OptionTypeChoices.TYPE_INT8)
+
+    def test_validate_many(self):
+        validate_many(
+            [str(value) for value in range(1000)], OptionTypeChoices.TYPE_UINT16
+        )
+
+        with self.assertRaises(ValidationError) as context:
+            validate_many(["1", "256", "x", "255"], OptionTypeChoices.TYPE_UINT8)
+
+        self.assertEqual(len(context.exception.message_dict["data"]), 2)
+
+    def test_validate_record(self):
+        definition = SimpleNamespace(
+            type=OptionTypeChoices.TYPE_RECORD,
+            array=True,
+            record_types=[
+                OptionTypeChoices.TYPE_UINT8,
+                OptionTypeChoices.TYPE_IPV4_ADDRESS,
+            ],
+        )
+
+        validate_option_data("1, 192.0.2.1, 192.0.2.2", definition)
+
+        with self.assertRaises(ValidationError) as context:
+            validate_option_data("256, 192.0.2.1, 192.0.2", definition)
+
+        self.assertEqual(len(context.exception.message_dict["data"]), 2)
+
+        with self.assertRaises(ValidationError):
+            validate_option_data("1", definition)
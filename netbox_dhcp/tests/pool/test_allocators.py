@@ -0,0 +1,110 @@
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from netbox_dhcp.models import Pool, Subnet
+from netbox_dhcp.utilities import allocate_pool_ids
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class PoolIDAllocatorTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        cls.ipv4_prefixes = TestObjects.get_ipv4_prefixes()
+        cls.ipv4_ranges = TestObjects.get_ipv4_ranges()
+
+        cls.subnets = [
+            Subnet.objects.create(
+                name=f"test-subnet-{index}",
+                dhcp_server=cls.dhcp_server,
+                prefix=prefix,
+            )
+            for index, prefix in enumerate(cls.ipv4_prefixes[:2], start=1)
+        ]
+
+    def test_allocate_pool_ids(self):
+        with CaptureQueriesContext(connection) as context:
+            pool_ids = allocate_pool_ids(
+                {self.subnets[0].pk: 1000, self.subnets[1].pk: 10}
+            )
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(pool_ids[self.subnets[0].pk], list(range(1, 1001)))
+        self.assertEqual(pool_ids[self.subnets[1].pk], list(range(1, 11)))
+
+        pool_ids = allocate_pool_ids({self.subnets[0].pk: 1})
+        self.assertEqual(pool_ids[self.subnets[0].pk], [1001])
+
+    def test_pool_save(self):
+        pools = [
+            Pool.objects.create(
+                name=f"test-pool-{index}",
+                subnet=self.subnets[0],
+                ip_range=ip_range,
+            )
+            for index, ip_range in enumerate(self.ipv4_ranges[:2], start=1)
+        ]
+        self.assertEqual([pool.pool_id for pool in pools], [1, 2])
+
+        pool = Pool.objects.create(
+            name="test-pool-3",
+            subnet=self.subnets[1],
+            ip_range=self.ipv4_ranges[2],
+        )
+        self.assertEqual(pool.pool_id, 1)
+
+    def test_explicit_pool_id(self):
+        Pool.objects.create(
+            name="test-pool-1",
+            subnet=self.subnets[0],
+            ip_range=self.ipv4_ranges[0],
+            pool_id=42,
+        )
+        pool = Pool.objects.create(
+            name="test-pool-2",
+            subnet=self.subnets[0],
+            ip_range=self.ipv4_ranges[1],
+        )
+
+        self.assertEqual(pool.pool_id, 43)
+
+    def test_pool_update(self):
+        pool = Pool.objects.create(
+            name="test-pool-1",
+            subnet=self.subnets[0],
+            ip_range=self.ipv4_ranges[0],
+        )
+        pool = Pool.objects.get(pk=pool.pk)
+
+        pool.description = "Test Pool"
+        with CaptureQueriesContext(connection) as context:
+            pool.save()
+        self.assertFalse(
+            any(
+                query["sql"].startswith("UPDATE netbox_dhcp_subnet")
+                for query in context.captured_queries
+            )
+        )
+
+        pool.pool_id = 42
+        pool.save()
+        self.assertEqual(Subnet.objects.get(pk=self.subnets[0].pk)._last_pool_id, 42)
+
+    def test_duplicate_pool_id(self):
+        Pool.objects.create(
+            name="test-pool-1",
+            subnet=self.subnets[0],
+            ip_range=self.ipv4_ranges[0],
+            pool_id=42,
+        )
+        pool = Pool(
+            name="test-pool-2",
+            subnet=self.subnets[0],
+            ip_range=self.ipv4_ranges[1],
+            pool_id=42,
+        )
+
+        with self.assertRaises(ValidationError):
+            pool.full_clean()
@@ -0,0 +1,75 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from netbox_dhcp.models import Subnet
+from netbox_dhcp.utilities import allocate_subnet_ids
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class SubnetIDAllocatorTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        cls.ipv4_prefixes = TestObjects.get_ipv4_prefixes()
+
+    def test_allocate_subnet_ids(self):
+        with CaptureQueriesContext(connection) as context:
+            subnet_ids = allocate_subnet_ids(1000)
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(len(set(subnet_ids)), 1000)
+        self.assertEqual(subnet_ids, sorted(subnet_ids))
+
+    def test_subnet_save(self):
+        subnets = [
+            Subnet(
+                name=f"test-subnet-{index}",
+                dhcp_server=self.dhcp_server,
+                prefix=prefix,
+            )
+            for index, prefix in enumerate(self.ipv4_prefixes, start=1)
+        ]
+        for subnet in subnets:
+            subnet.save()
+
+        subnet_ids = [subnet.subnet_id for subnet in subnets]
+        self.assertEqual(len(set(subnet_ids)), len(subnets))
+        self.assertEqual(subnet_ids, sorted(subnet_ids))
+
+    def test_explicit_subnet_id(self):
+        explicit_subnet_id = allocate_subnet_ids(1)[0] + 100
+
+        Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=self.dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+            subnet_id=explicit_subnet_id,
+        )
+        subnet = Subnet.objects.create(
+            name="test-subnet-2",
+            dhcp_server=self.dhcp_server,
+            prefix=self.ipv4_prefixes[1],
+        )
+
+        self.assertGreater(subnet.subnet_id, explicit_subnet_id)
+
+    def test_subnet_update(self):
+        subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=self.dhcp_server,
+            prefix=self.ipv4_prefixes[0],
+        )
+        subnet = Subnet.objects.get(pk=subnet.pk)
+
+        subnet.description = "Test Subnet"
+        with CaptureQueriesContext(connection) as context:
+            subnet.save()
+        self.assertFalse(
+            any("setval" in query["sql"] for query in context.captured_queries)
+        )
+
+        explicit_subnet_id = subnet.subnet_id + 100
+        subnet.subnet_id = explicit_subnet_id
+        subnet.save()
+        self.assertGreater(allocate_subnet_ids(1)[0], explicit_subnet_id)
@@ -1,3 +1,8 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
 from utilities.testing import APIViewTestCases
 
 from netbox_dhcp.tests.custom import (
@@ -5,7 +10,8 @@ from netbox_dhcp.tests.custom import (
     APITestCase,
     NetBoxDHCPGraphQLMixin,
 )
-from netbox_dhcp.models import Subnet
+from netbox_dhcp.models import Option, OptionDefinition, Subnet
+from netbox_dhcp.choices import OptionSpaceChoices
 
 
 class SubnetAPITestCase(
@@ -105,3 +111,51 @@ class SubnetAPITestCase(
             "client_classes": [client_classes[0].pk],
             "evaluate_additional_classes": [client_classes[2].pk],
         }
+
+
+class SubnetListQueryTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        cls.client_classes = TestObjects.get_client_classes(cls.dhcp_server)
+        cls.definition = OptionDefinition.objects.get(
+            space=OptionSpaceChoices.DHCPV4,
+            name="routers",
+        )
+
+    def create_subnets(self, offsets):
+        for offset in offsets:
+            subnet = Subnet.objects.create(
+                name=f"test-subnet-{offset}",
+                dhcp_server=self.dhcp_server,
+                prefix=TestObjects.get_ipv4_prefixes(offset=offset)[0],
+            )
+            subnet.client_classes.set(self.client_classes)
+            Option.objects.create(
+                definition=self.definition,
+                assigned_object=subnet,
+                data=f"192.0.{2 + offset}.1",
+            )
+
+    def count_queries(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse("plugins-api:netbox_dhcp-api:subnet-list"),
+                params,
+                **self.header,
+            )
+        self.assertHttpStatus(response, status.HTTP_200_OK)
+
+        return len(context.captured_queries)
+
+    def test_list_query_count(self):
+        self.add_permissions("netbox_dhcp.view_subnet")
+
+        self.create_subnets(range(1))
+        queries = self.count_queries()
+        brief_queries = self.count_queries(brief=1)
+
+        self.create_subnets(range(1, 10))
+        self.assertEqual(self.count_queries(), queries)
+        self.assertEqual(self.count_queries(brief=1), brief_queries)
+        self.assertLess(brief_queries, queries)
@@ -197,6 +197,26 @@ class SubnetFilterSetTestCase(
         params = {"prefix__iregex": r"192.0.2.(0|64)/26"}
         self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
 
+    def test_within(self):
+        params = {"within": "192.0.2.0/24"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+        params = {"within": "2001:db8::/32"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 3)
+        params = {"within": "invalid"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 0)
+
+    def test_within_include(self):
+        params = {"within_include": "192.0.2.0/24"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 3)
+        params = {"within_include": "2001:db8:1::/64"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+
+    def test_contains(self):
+        params = {"contains": "192.0.2.65"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 2)
+        params = {"contains": "2001:db8:2::1"}
+        self.assertEqual(self.filterset(params, self.queryset).qs.count(), 1)
+
     def test_child_host_reservations(self):
         params = {
             "child_host_reservation_id": [
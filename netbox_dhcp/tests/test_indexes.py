@@ -0,0 +1,136 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+
+from netbox_dhcp.choices import HostReservationIdentifierChoices, OptionSpaceChoices
+from netbox_dhcp.filtersets import (
+    DHCPServerFilterSet,
+    HostReservationFilterSet,
+    OptionFilterSet,
+)
+from netbox_dhcp.models import (
+    DHCPServer,
+    HostReservation,
+    Option,
+    OptionDefinition,
+    Subnet,
+)
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class IndexTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        DHCPServer.objects.filter(pk=cls.dhcp_server.pk).update(
+            host_reservation_identifiers=[HostReservationIdentifierChoices.DUID],
+            relay_supplied_options=[110],
+        )
+
+        cls.host_reservations = HostReservation.objects.bulk_create(
+            HostReservation(
+                name=f"test-host-reservation-{number}",
+                dhcp_server=cls.dhcp_server,
+                duid=f"00:01:00:01:00:00:{number // 256:02x}:{number % 256:02x}",
+            )
+            for number in range(1000)
+        )
+
+        definition = OptionDefinition.objects.get(
+            space=OptionSpaceChoices.DHCPV4,
+            name="routers",
+        )
+        content_type = ContentType.objects.get_for_model(HostReservation)
+        Option.objects.bulk_create(
+            Option(
+                definition=definition,
+                assigned_object_type=content_type,
+                assigned_object_id=host_reservation.pk,
+                data="192.0.2.1",
+            )
+            for host_reservation in cls.host_reservations
+        )
+
+        prefix = TestObjects.get_ipv4_prefixes()[0]
+        Subnet.objects.bulk_create(
+            Subnet(
+                name=f"test-subnet-{number}",
+                dhcp_server=cls.dhcp_server,
+                prefix=prefix,
+                subnet_id=number + 1,
+                weight=number % 10,
+            )
+            for number in range(1000)
+        )
+
+        with connection.cursor() as cursor:
+            for model in (DHCPServer, HostReservation, Option, Subnet):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+    # +
+    # The seeded tables are small enough for a sequential scan to win, so
+    # sequential scans are disabled to check that the planner can use the
+    # index for the query at all.
+    # -
+    def assertUsesIndex(self, queryset, index_name):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        self.assertIn(index_name, queryset.explain())
+
+    def test_option_assigned_object(self):
+        host_reservation = self.host_reservations[500]
+
+        self.assertUsesIndex(
+            Option.objects.filter(
+                assigned_object_type=ContentType.objects.get_for_model(HostReservation),
+                assigned_object_id=host_reservation.pk,
+            ).order_by("weight"),
+            "option_assigned_object",
+        )
+
+    def test_host_reservation_identifier(self):
+        self.assertUsesIndex(
+            HostReservation.objects.filter(duid="00:01:00:01:00:00:01:f4"),
+            "host_reservation_duid",
+        )
+
+    def test_subnet_ordering(self):
+        self.assertUsesIndex(
+            Subnet.objects.order_by("-weight", "name")[:10],
+            "subnet_weight_name",
+        )
+
+    def test_dhcp_server_array_overlap(self):
+        self.assertUsesIndex(
+            DHCPServer.objects.filter(
+                host_reservation_identifiers__overlap=[
+                    HostReservationIdentifierChoices.DUID
+                ]
+            ),
+            "dhcp_server_hr_identifiers",
+        )
+        self.assertUsesIndex(
+            DHCPServer.objects.filter(relay_supplied_options__overlap=[110]),
+            "dhcp_server_relay_options",
+        )
+
+    def test_host_reservation_search(self):
+        self.assertUsesIndex(
+            HostReservationFilterSet(
+                {"q": "reservation-50"}, HostReservation.objects.all()
+            ).qs,
+            "host_reservation_name_trgm",
+        )
+
+    def test_dhcp_server_search(self):
+        queryset = DHCPServerFilterSet({"q": "device"}, DHCPServer.objects.all()).qs
+
+        self.assertUsesIndex(queryset, "netbox_dhcp_dcim_device_name_trgm")
+        self.assertUsesIndex(queryset, "netbox_dhcp_virtualmachine_name_trgm")
+
+    def test_option_search(self):
+        queryset = OptionFilterSet({"q": "192.0.2"}, Option.objects.all()).qs
+
+        self.assertUsesIndex(queryset, "option_data_trgm")
+        self.assertEqual(queryset.count(), len(self.host_reservations))
@@ -0,0 +1,95 @@
+from django.test import TestCase
+
+from dcim.choices import InterfaceTypeChoices
+from dcim.models import Interface
+
+from netbox_dhcp.models import (
+    DHCPServerInterface,
+    PDPool,
+    SharedNetwork,
+    Subnet,
+)
+from netbox_dhcp.tests.custom import TestObjects
+from netbox_dhcp.views import SharedNetworkView, SubnetView
+
+
+class QuerySetAnnotationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dhcp_server = TestObjects.get_dhcp_servers()[0]
+        cls.prefix = TestObjects.get_ipv4_prefixes()[0]
+
+        cls.subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=cls.dhcp_server,
+            prefix=cls.prefix,
+        )
+
+        cls.device = TestObjects.get_devices()[0]
+        cls.interface = Interface.objects.create(
+            name="eth0",
+            device=cls.device,
+            type=InterfaceTypeChoices.TYPE_1GE_FIXED,
+        )
+        cls.dhcp_server.device_interfaces.add(cls.interface)
+
+        cls.shared_network = SharedNetwork.objects.create(
+            name="test-shared-network-1",
+            dhcp_server=cls.dhcp_server,
+            prefix=cls.prefix,
+        )
+
+    def test_prefix_display(self):
+        for model in (Subnet, SharedNetwork, PDPool):
+            self.assertNotIn("ipam_prefix", str(model.objects.all().query))
+            self.assertIn("ipam_prefix", str(model.objects.with_prefix_display().query))
+
+        self.assertEqual(
+            Subnet.objects.with_prefix_display().get(pk=self.subnet.pk).prefix_display,
+            str(self.prefix.prefix),
+        )
+
+    def test_interface_names(self):
+        self.assertNotIn("dcim_interface", str(DHCPServerInterface.objects.all().query))
+
+        annotated = DHCPServerInterface.objects.with_names().get(
+            dhcp_server=self.dhcp_server
+        )
+        self.assertEqual(annotated.get_name(), self.interface.name)
+        self.assertEqual(annotated.get_parent_name(), self.device.name)
+
+        interface = DHCPServerInterface.objects.get(dhcp_server=self.dhcp_server)
+        self.assertEqual(interface.get_name(), self.interface.name)
+        self.assertEqual(interface.get_parent_name(), self.device.name)
+        self.assertEqual(str(interface), self.interface.name)
+
+    def test_network_card_interfaces(self):
+        interfaces = [
+            Interface(
+                name=f"eth{number}",
+                device=self.device,
+                type=InterfaceTypeChoices.TYPE_1GE_FIXED,
+            )
+            for number in range(5, 0, -1)
+        ]
+        Interface.objects.bulk_create(interfaces)
+        self.dhcp_server.device_interfaces.add(*interfaces)
+        server_interfaces = DHCPServerInterface.objects.filter(
+            dhcp_server=self.dhcp_server
+        )
+        self.subnet.server_interfaces.set(server_interfaces)
+        self.shared_network.server_interfaces.set(server_interfaces)
+
+        for view, instance in (
+            (SubnetView, self.subnet),
+            (SharedNetworkView, self.shared_network),
+        ):
+            with self.subTest(view=view.__name__), self.assertNumQueries(2):
+                names = [
+                    str(interface)
+                    for interface in view.queryset.get(
+                        pk=instance.pk
+                    ).server_interfaces.all()
+                ]
+
+            self.assertEqual(names, [f"eth{number}" for number in range(6)])
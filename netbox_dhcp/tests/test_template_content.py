@@ -0,0 +1,64 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.context_processors import PermWrapper
+from django.test import RequestFactory, TestCase
+
+from core.models import ObjectType
+from users.models import ObjectPermission
+
+from netbox_dhcp.models import Subnet
+from netbox_dhcp.template_content import RelatedPrefixObjects
+from netbox_dhcp.tests.custom import TestObjects
+
+
+class RelatedPrefixObjectsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.prefixes = TestObjects.get_ipv4_prefixes()
+        cls.subnet = Subnet.objects.create(
+            name="test-subnet-1",
+            dhcp_server=TestObjects.get_dhcp_servers()[0],
+            prefix=cls.prefixes[0],
+        )
+        cls.user = get_user_model().objects.create_user(
+            username="testuser", is_superuser=True
+        )
+
+    def get_extension(self, prefix, user=None):
+        request = RequestFactory().get("/")
+        request.user = user or self.user
+
+        return RelatedPrefixObjects(
+            {"object": prefix, "request": request, "perms": PermWrapper(request.user)}
+        )
+
+    def test_empty_relations(self):
+        extension = self.get_extension(self.prefixes[1])
+
+        with self.assertNumQueries(1):
+            self.assertEqual(extension.right_page(), "")
+
+    def test_related_subnet(self):
+        content = self.get_extension(self.prefixes[0]).right_page()
+
+        self.assertIn(self.subnet.name, content)
+        self.assertNotIn("DHCP Shared Network", content)
+        self.assertNotIn("DHCP Prefix Delegation Pool", content)
+
+    def test_constrained_user(self):
+        user = get_user_model().objects.create_user(username="constraineduser")
+        object_permission = ObjectPermission.objects.create(
+            name="Test permission",
+            actions=["view"],
+            constraints={"name": "test-subnet-2"},
+        )
+        object_permission.object_types.set([ObjectType.objects.get_for_model(Subnet)])
+        object_permission.users.add(user)
+
+        self.assertEqual(self.get_extension(self.prefixes[0], user).right_page(), "")
+
+        object_permission.constraints = {"name": self.subnet.name}
+        object_permission.save()
+        user = get_user_model().objects.get(pk=user.pk)
+
+        content = self.get_extension(self.prefixes[0], user).right_page()
+        self.assertIn(self.subnet.name, content)
@@ -0,0 +1,4 @@
+from .allocators import *
+from .encoder import *
+from .tabs import *
+from .changelog import *
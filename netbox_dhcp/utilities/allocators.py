@@ -0,0 +1,98 @@
+from collections import Counter
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+__all__ = (
+    "SUBNET_ID_SEQUENCE",
+    "allocate_subnet_id",
+    "allocate_subnet_ids",
+    "reserve_subnet_id",
+    "allocate_pool_id",
+    "allocate_pool_ids",
+    "reserve_pool_id",
+    "assign_pool_ids",
+)
+
+
+SUBNET_ID_SEQUENCE = "netbox_dhcp_subnet_subnet_id_seq"
+
+
+def allocate_subnet_ids(count, using=DEFAULT_DB_ALIAS):
+    if count < 1:
+        return []
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(%s) FROM generate_series(1, %s)",
+            [SUBNET_ID_SEQUENCE, count],
+        )
+        return [subnet_id for (subnet_id,) in cursor.fetchall()]
+
+
+def allocate_subnet_id(using=DEFAULT_DB_ALIAS):
+    return allocate_subnet_ids(1, using=using)[0]
+
+
+def reserve_subnet_id(subnet_id, using=DEFAULT_DB_ALIAS):
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"SELECT setval(%s, %s) FROM {SUBNET_ID_SEQUENCE} WHERE last_value <= %s",
+            [SUBNET_ID_SEQUENCE, subnet_id, subnet_id],
+        )
+
+
+def allocate_pool_ids(counts, using=DEFAULT_DB_ALIAS):
+    counts = {subnet_pk: count for subnet_pk, count in counts.items() if count > 0}
+    if not counts:
+        return {}
+
+    values = ", ".join(["(%s, %s)"] * len(counts))
+    params = [value for item in sorted(counts.items()) for value in item]
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "UPDATE netbox_dhcp_subnet AS subnet "
+            "SET _last_pool_id = subnet._last_pool_id + allocation.count "
+            f"FROM (VALUES {values}) AS allocation (id, count) "
+            "WHERE subnet.id = allocation.id "
+            "RETURNING subnet.id, subnet._last_pool_id",
+            params,
+        )
+        rows = cursor.fetchall()
+
+    pool_ids = {}
+    for subnet_pk, last_pool_id in rows:
+        pool_ids[subnet_pk] = list(
+            range(last_pool_id - counts[subnet_pk] + 1, last_pool_id + 1)
+        )
+
+    return pool_ids
+
+
+def allocate_pool_id(subnet_pk, using=DEFAULT_DB_ALIAS):
+    return allocate_pool_ids({subnet_pk: 1}, using=using)[subnet_pk][0]
+
+
+def reserve_pool_id(subnet_pk, pool_id, using=DEFAULT_DB_ALIAS):
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "UPDATE netbox_dhcp_subnet SET _last_pool_id = %s "
+            "WHERE id = %s AND _last_pool_id < %s",
+            [pool_id, subnet_pk, pool_id],
+        )
+
+
+def assign_pool_ids(items, subnet_pks, using=DEFAULT_DB_ALIAS):
+    items = list(items)
+    subnet_pks = list(subnet_pks)
+
+    pool_ids = {
+        subnet_pk: iter(allocated)
+        for subnet_pk, allocated in allocate_pool_ids(
+            Counter(subnet_pk for subnet_pk in subnet_pks if subnet_pk is not None),
+            using=using,
+        ).items()
+    }
+    for item, subnet_pk in zip(items, subnet_pks):
+        if subnet_pk in pool_ids:
+            item["pool_id"] = next(pool_ids[subnet_pk])
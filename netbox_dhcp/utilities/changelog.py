@@ -0,0 +1,30 @@
+from core.choices import ObjectChangeActionChoices
+from core.models import ObjectChange
+
+__all__ = ("log_object_changes",)
+
+
+# +
+# Change records for objects written with bulk_create()/bulk_update(), which
+# bypass the signals NetBox uses for change logging. Objects with an entry in
+# snapshots are logged as updates, all others as creations. The objects should
+# have their tags and many-to-many relations prefetched.
+# -
+def log_object_changes(objects, user, request_id, snapshots=None):
+    snapshots = snapshots or {}
+
+    changes = []
+    for obj in objects:
+        if obj.pk in snapshots:
+            obj._prechange_snapshot = snapshots[obj.pk]
+            action = ObjectChangeActionChoices.ACTION_UPDATE
+        else:
+            action = ObjectChangeActionChoices.ACTION_CREATE
+
+        change = obj.to_objectchange(action)
+        change.user = user
+        change.user_name = user.username
+        change.request_id = request_id
+        changes.append(change)
+
+    return ObjectChange.objects.bulk_create(changes)
@@ -0,0 +1,275 @@
+import json
+import struct
+
+import netaddr
+
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from ipam.choices import IPAddressFamilyChoices
+
+from netbox_dhcp.choices import OptionTypeChoices
+from netbox_dhcp.validators.option import split_data
+
+__all__ = (
+    "DHCPV4_OPTION_LENGTH_MAX",
+    "DHCPV4_OPTIONS_SIZE_MAX",
+    "DHCPV6_OPTION_LENGTH_MAX",
+    "encode_option",
+    "encode_option_data",
+    "frame_option",
+    "get_option_size",
+    "validate_option_size",
+)
+
+
+DHCPV4_OPTION_LENGTH_MAX = 0xFF
+DHCPV6_OPTION_LENGTH_MAX = 0xFFFF
+
+# +
+# RFC 2131 requires clients to accept an options field of at least 312 octets,
+# four of which are taken by the magic cookie. Larger options are split into
+# several instances (RFC 3396), but still have to fit into that space.
+# -
+DHCPV4_OPTIONS_SIZE_MAX = 308
+
+DHCPV4_OPTION_HEADER = struct.Struct("!BB")
+DHCPV6_OPTION_HEADER = struct.Struct("!HH")
+
+INTEGER_FORMATS = {
+    OptionTypeChoices.TYPE_UINT8: struct.Struct("!B"),
+    OptionTypeChoices.TYPE_UINT16: struct.Struct("!H"),
+    OptionTypeChoices.TYPE_UINT32: struct.Struct("!I"),
+    OptionTypeChoices.TYPE_INT8: struct.Struct("!b"),
+    OptionTypeChoices.TYPE_INT16: struct.Struct("!h"),
+    OptionTypeChoices.TYPE_INT32: struct.Struct("!i"),
+}
+PSID_FORMAT = struct.Struct("!BH")
+
+
+def encode_empty(buffer, data, family):
+    if data:
+        raise ValueError(data)
+
+
+def encode_binary(buffer, data, family):
+    data = data.strip()
+
+    if len(data) > 1 and data[0] == data[-1] == "'":
+        buffer += data[1:-1].encode()
+    elif ":" in data or " " in data:
+        for octet in data.replace(":", " ").split():
+            buffer += bytes.fromhex(octet.zfill(2))
+    else:
+        data = data.removeprefix("0x").removeprefix("0X")
+        buffer += bytes.fromhex(data.zfill(len(data) + len(data) % 2))
+
+
+def encode_boolean(buffer, data, family):
+    buffer.append(data.lower() == "true")
+
+
+def encode_fqdn(buffer, data, family):
+    for label in data.rstrip(".").split("."):
+        if not label:
+            continue
+        label = label.encode("ascii")
+        if len(label) > 63:
+            raise ValueError(data)
+        buffer.append(len(label))
+        buffer += label
+    buffer.append(0)
+
+
+def encode_ipv4_address(buffer, data, family):
+    buffer += netaddr.IPAddress(data, version=4).packed
+
+
+def encode_ipv6_address(buffer, data, family):
+    buffer += netaddr.IPAddress(data, version=6).packed
+
+
+def encode_ipv6_prefix(buffer, data, family):
+    address, prefixlen = data.rsplit("/", 1)
+    prefixlen = int(prefixlen)
+    if prefixlen > 128:
+        raise ValueError(data)
+
+    buffer.append(prefixlen)
+    buffer += netaddr.IPAddress(address, version=6).packed[: (prefixlen + 7) // 8]
+
+
+def encode_psid(buffer, data, family):
+    psid, psid_len = (int(value) for value in data.split("/"))
+    if psid_len > 16 or psid >= 1 << psid_len:
+        raise ValueError(data)
+
+    buffer += PSID_FORMAT.pack(psid_len, psid << (16 - psid_len) & 0xFFFF)
+
+
+def encode_string(buffer, data, family):
+    buffer += data.encode()
+
+
+def encode_tuple(buffer, data, family):
+    try:
+        value = json.loads(data)
+    except json.JSONDecodeError:
+        value = data
+    if not isinstance(value, str):
+        value = data
+
+    value = value.encode()
+    if family == IPAddressFamilyChoices.FAMILY_6:
+        buffer += struct.pack("!H", len(value))
+    else:
+        buffer.append(len(value))
+    buffer += value
+
+
+def integer_encoder(integer_format):
+    def encode_integer(buffer, data, family):
+        buffer += integer_format.pack(int(data))
+
+    return encode_integer
+
+
+ENCODERS = {
+    OptionTypeChoices.TYPE_EMPTY: encode_empty,
+    OptionTypeChoices.TYPE_BINARY: encode_binary,
+    OptionTypeChoices.TYPE_BOOLEAN: encode_boolean,
+    OptionTypeChoices.TYPE_FQDN: encode_fqdn,
+    OptionTypeChoices.TYPE_IPV4_ADDRESS: encode_ipv4_address,
+    OptionTypeChoices.TYPE_IPV6_ADDRESS: encode_ipv6_address,
+    OptionTypeChoices.TYPE_IPV6_PREFIX: encode_ipv6_prefix,
+    OptionTypeChoices.TYPE_PSID: encode_psid,
+    OptionTypeChoices.TYPE_STRING: encode_string,
+    OptionTypeChoices.TYPE_TUPLE: encode_tuple,
+    **{
+        data_type: integer_encoder(integer_format)
+        for data_type, integer_format in INTEGER_FORMATS.items()
+    },
+}
+
+
+def get_data_types(definition, count):
+    if definition.type == OptionTypeChoices.TYPE_RECORD:
+        record_types = definition.record_types or []
+        if count < len(record_types) or (
+            count > len(record_types) and not definition.array
+        ):
+            raise ValidationError(
+                {
+                    "data": _(
+                        "Lengths of record type list and data elements do not match"
+                    )
+                }
+            )
+        return record_types + record_types[-1:] * (count - len(record_types))
+
+    return [definition.type] * count
+
+
+def encode_option_data(data, definition, csv_format=None, buffer=None):
+    if buffer is None:
+        buffer = bytearray()
+    data = data or ""
+
+    if csv_format is False or definition.type == OptionTypeChoices.TYPE_BINARY:
+        values = (data,)
+        data_types = (OptionTypeChoices.TYPE_BINARY,)
+    elif definition.array or definition.type == OptionTypeChoices.TYPE_RECORD:
+        values = split_data(data) if data else []
+        data_types = get_data_types(definition, len(values))
+    else:
+        values = (data,)
+        data_types = (definition.type,)
+
+    for value, data_type in zip(values, data_types):
+        try:
+            ENCODERS.get(data_type, encode_string)(buffer, value, definition.family)
+        except (
+            ValueError,
+            TypeError,
+            OverflowError,
+            struct.error,
+            netaddr.AddrFormatError,
+        ):
+            raise ValidationError(
+                {
+                    "data": _("{data} cannot be encoded as {type}").format(
+                        data=value, type=data_type
+                    )
+                }
+            )
+
+    return buffer
+
+
+def frame_option(code, payload, family, buffer=None):
+    if buffer is None:
+        buffer = bytearray()
+    payload = memoryview(payload)
+
+    if family == IPAddressFamilyChoices.FAMILY_6:
+        if len(payload) > DHCPV6_OPTION_LENGTH_MAX:
+            raise ValidationError(
+                {
+                    "data": _(
+                        "Option data length {length} exceeds the maximum of {maximum} octets"
+                    ).format(length=len(payload), maximum=DHCPV6_OPTION_LENGTH_MAX)
+                }
+            )
+        buffer += DHCPV6_OPTION_HEADER.pack(code, len(payload))
+        buffer += payload
+
+        return buffer
+
+    if not payload:
+        buffer += DHCPV4_OPTION_HEADER.pack(code, 0)
+
+    for offset in range(0, len(payload), DHCPV4_OPTION_LENGTH_MAX):
+        fragment = payload[offset : offset + DHCPV4_OPTION_LENGTH_MAX]
+        buffer += DHCPV4_OPTION_HEADER.pack(code, len(fragment))
+        buffer += fragment
+
+    return buffer
+
+
+def encode_option(option, suboptions=()):
+    definition = option.definition
+    payload = encode_option_data(option.data, definition, option.csv_format)
+
+    for suboption in suboptions:
+        frame_option(
+            suboption.definition.code,
+            encode_option_data(
+                suboption.data, suboption.definition, suboption.csv_format
+            ),
+            definition.family,
+            buffer=payload,
+        )
+
+    return frame_option(definition.code, payload, definition.family)
+
+
+def get_option_size(option, suboptions=()):
+    return len(encode_option(option, suboptions))
+
+
+def validate_option_size(option, suboptions=()):
+    size = get_option_size(option, suboptions)
+
+    if (
+        option.definition.family == IPAddressFamilyChoices.FAMILY_4
+        and size > DHCPV4_OPTIONS_SIZE_MAX
+    ):
+        raise ValidationError(
+            {
+                "data": _(
+                    "Encoded option size {size} exceeds the maximum of {maximum} octets"
+                ).format(size=size, maximum=DHCPV4_OPTIONS_SIZE_MAX)
+            }
+        )
+
+    return size
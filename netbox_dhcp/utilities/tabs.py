@@ -0,0 +1,39 @@
+from django.db.models import IntegerField, Subquery
+
+__all__ = ("TabCounts",)
+
+
+class SubqueryCount(Subquery):
+    template = "(SELECT COUNT(*) FROM (%(subquery)s) _count)"
+    output_field = IntegerField()
+
+
+# +
+# Badge counts for the tabs of an object view. The first badge rendered for
+# an object fetches the counts of all related objects listed in the tabs in a
+# single query with one COUNT subquery per relation and caches them on the
+# object for the remaining badges.
+# -
+class TabCounts:
+    def __init__(self, *relations):
+        self.relations = relations
+
+    def get_counts(self, obj):
+        if (counts := getattr(obj, "_tab_counts", None)) is None:
+            values = (
+                type(obj)
+                .objects.filter(pk=obj.pk)
+                .values_list(
+                    *(
+                        SubqueryCount(getattr(obj, relation).order_by().values("pk"))
+                        for relation in self.relations
+                    )
+                )
+                .first()
+            ) or (0,) * len(self.relations)
+            counts = obj._tab_counts = dict(zip(self.relations, values))
+
+        return counts
+
+    def badge(self, relation):
+        return lambda obj: self.get_counts(obj)[relation]
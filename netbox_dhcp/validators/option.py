@@ -9,7 +9,21 @@ from django.core.exceptions import ValidationError
 from netbox_dhcp.choices import OptionTypeChoices
 
 
-__all__ = ("validate_data",)
+__all__ = (
+    "split_data",
+    "validate_data",
+    "validate_many",
+    "validate_option_data",
+)
+
+
+DATA_SEPARATOR = re.compile(r"\s*,\s*")
+BINARY_PATTERNS = (
+    re.compile(r"^([0-9a-f]{1,2}[: ]){0,254}[0-9a-f]{1,2}$", flags=re.IGNORECASE),
+    re.compile(r"^(0x)?[0-9a-f]{1,510}$", flags=re.IGNORECASE),
+    re.compile(r"^'.{0,255}'$"),
+)
+SLASH_SEPARATED = re.compile(r"(.*)/(.*)")
 
 
 def validate_empty(data):
@@ -18,14 +32,9 @@ def validate_empty(data):
 
 
 def validate_binary(data):
-    if re.search(
-        r"^([0-9a-f]{1,2}[: ]){0,254}[0-9a-f]{1,2}$", data, flags=re.IGNORECASE
-    ):
-        return
-    if re.search(r"^(0x)?[0-9a-f]{1,510}$", data, flags=re.IGNORECASE):
-        return
-    if re.search(r"^'.{0,255}'$", data):
-        return
+    for pattern in BINARY_PATTERNS:
+        if pattern.search(data):
+            return
 
     raise ValidationError(_("{data} is not a valid binary value").format(data=data))
 
@@ -55,7 +64,7 @@ def validate_ipv6_address(data):
 
 
 def validate_ipv6_prefix(data):
-    if not (split_data := re.match(r"(.*)/(.*)", data)):
+    if not (split_data := SLASH_SEPARATED.match(data)):
         raise ValidationError(_("{data} is not a valid IPv6 prefix").format(data=data))
 
     (address, prefixlen) = split_data.groups()
@@ -68,7 +77,7 @@ def validate_ipv6_prefix(data):
 
 
 def validate_psid(data):
-    if not (split_data := re.match(r"(.*)/(.*)", data)):
+    if not (split_data := SLASH_SEPARATED.match(data)):
         raise ValidationError(_("{data} is not a valid PSID").format(data=data))
 
     (psid, psid_len) = split_data.groups()
@@ -109,48 +118,105 @@ def validate_uint32(data):
 
 
 def validate_int8(data):
-    if not re.sub(r"^-", "", data).isnumeric() or int(data) not in range(-0x80, 0x80):
+    if not data.removeprefix("-").isnumeric() or int(data) not in range(-0x80, 0x80):
         raise ValidationError(_("{data} is not a valid int8 value").format(data=data))
 
 
 def validate_int16(data):
-    if not re.sub(r"^-", "", data).isnumeric() or int(data) not in range(
+    if not data.removeprefix("-").isnumeric() or int(data) not in range(
         -0x8000, 0x8000
     ):
         raise ValidationError(_("{data} is not a valid int16 value").format(data=data))
 
 
 def validate_int32(data):
-    if not re.sub(r"^-", "", data).isnumeric() or int(data) not in range(
+    if not data.removeprefix("-").isnumeric() or int(data) not in range(
         -0x80000000, 0x80000000
     ):
         raise ValidationError(_("{data} is not a valid int32 value").format(data=data))
 
 
+# +
+# Built once at import time, a missing entry falls back to validate_string and
+# None marks a type (record) whose elements are validated individually.
+# -
+VALIDATORS = {
+    OptionTypeChoices.TYPE_EMPTY: validate_empty,
+    OptionTypeChoices.TYPE_BINARY: validate_binary,
+    OptionTypeChoices.TYPE_BOOLEAN: validate_boolean,
+    OptionTypeChoices.TYPE_FQDN: validate_fqdn,
+    OptionTypeChoices.TYPE_IPV4_ADDRESS: validate_ipv4_address,
+    OptionTypeChoices.TYPE_IPV6_ADDRESS: validate_ipv6_address,
+    OptionTypeChoices.TYPE_IPV6_PREFIX: validate_ipv6_prefix,
+    OptionTypeChoices.TYPE_PSID: validate_psid,
+    OptionTypeChoices.TYPE_RECORD: None,
+    OptionTypeChoices.TYPE_STRING: validate_string,
+    OptionTypeChoices.TYPE_TUPLE: validate_tuple,
+    OptionTypeChoices.TYPE_UINT8: validate_uint8,
+    OptionTypeChoices.TYPE_UINT16: validate_uint16,
+    OptionTypeChoices.TYPE_UINT32: validate_uint32,
+    OptionTypeChoices.TYPE_INT8: validate_int8,
+    OptionTypeChoices.TYPE_INT16: validate_int16,
+    OptionTypeChoices.TYPE_INT32: validate_int32,
+}
+
+
+def split_data(data):
+    return DATA_SEPARATOR.split(data)
+
+
 def validate_data(data, data_type):
-    if data_type == OptionTypeChoices.TYPE_RECORD:
-        return
+    validate_many((data,), data_type)
 
-    validator_function = {
-        OptionTypeChoices.TYPE_EMPTY: validate_empty,
-        OptionTypeChoices.TYPE_BINARY: validate_binary,
-        OptionTypeChoices.TYPE_BOOLEAN: validate_boolean,
-        OptionTypeChoices.TYPE_FQDN: validate_fqdn,
-        OptionTypeChoices.TYPE_IPV4_ADDRESS: validate_ipv4_address,
-        OptionTypeChoices.TYPE_IPV6_ADDRESS: validate_ipv6_address,
-        OptionTypeChoices.TYPE_IPV6_PREFIX: validate_ipv6_prefix,
-        OptionTypeChoices.TYPE_PSID: validate_psid,
-        OptionTypeChoices.TYPE_STRING: validate_string,
-        OptionTypeChoices.TYPE_TUPLE: validate_tuple,
-        OptionTypeChoices.TYPE_UINT8: validate_uint8,
-        OptionTypeChoices.TYPE_UINT16: validate_uint16,
-        OptionTypeChoices.TYPE_UINT32: validate_uint32,
-        OptionTypeChoices.TYPE_INT8: validate_int8,
-        OptionTypeChoices.TYPE_INT16: validate_int16,
-        OptionTypeChoices.TYPE_INT32: validate_int32,
-    }
 
-    try:
-        validator_function.get(data_type, validate_string)(data)
-    except ValidationError as exc:
-        raise ValidationError({"data": exc.message})
+def validate_many(values, data_type):
+    if (validator_function := VALIDATORS.get(data_type, validate_string)) is None:
+        return
+
+    errors = []
+    for data in values:
+        try:
+            validator_function(data)
+        except ValidationError as exc:
+            errors.append(exc.message)
+
+    if errors:
+        raise ValidationError({"data": errors})
+
+
+def validate_option_data(data, definition):
+    if definition.type == OptionTypeChoices.TYPE_RECORD:
+        data_array = split_data(data)
+        record_types = definition.record_types
+
+        if (definition.array and len(record_types) > len(data_array)) or (
+            not definition.array and len(record_types) != len(data_array)
+        ):
+            raise ValidationError(
+                {
+                    "data": _(
+                        "Lengths of record type list and data elements do not match"
+                    )
+                }
+            )
+
+        values = {}
+        for index, data_field in enumerate(data_array):
+            data_type = record_types[min(index, len(record_types) - 1)]
+            values.setdefault(data_type, []).append(data_field)
+
+        errors = []
+        for data_type, data_fields in values.items():
+            try:
+                validate_many(data_fields, data_type)
+            except ValidationError as exc:
+                errors.extend(exc.message_dict["data"])
+
+        if errors:
+            raise ValidationError({"data": errors})
+
+    elif definition.array:
+        validate_many(split_data(data), definition.type)
+
+    else:
+        validate_data(data, definition.type)
@@ -0,0 +1,58 @@
+from django.contrib import messages
+from django.shortcuts import redirect, render
+from django.utils.translation import gettext_lazy as _
+
+from netbox.views.generic.base import BaseMultiObjectView
+from utilities.permissions import get_permission_for_model
+from utilities.views import GetReturnURLMixin
+
+from netbox_dhcp.forms import BulkImportJobForm
+from netbox_dhcp.importers import IMPORT_CHUNK_SIZE
+from netbox_dhcp.jobs import BulkImportJob
+
+__all__ = ("BulkImportJobView",)
+
+
+class BulkImportJobView(GetReturnURLMixin, BaseMultiObjectView):
+    template_name = "netbox_dhcp/bulk_import_job.html"
+
+    def get_required_permission(self):
+        return get_permission_for_model(self.queryset.model, "add")
+
+    def render_form(self, request, form):
+        return render(
+            request,
+            self.template_name,
+            {
+                "model": self.queryset.model,
+                "form": form,
+                "return_url": self.get_return_url(request),
+            },
+        )
+
+    def get(self, request):
+        return self.render_form(
+            request, BulkImportJobForm(initial={"chunk_size": IMPORT_CHUNK_SIZE})
+        )
+
+    def post(self, request):
+        form = BulkImportJobForm(request.POST, request.FILES)
+        if not form.is_valid():
+            return self.render_form(request, form)
+
+        job = BulkImportJob.enqueue(
+            user=request.user,
+            model_name=self.queryset.model._meta.model_name,
+            data=form.cleaned_data["data"],
+            format=form.cleaned_data["format"],
+            csv_delimiter=form.cleaned_data["csv_delimiter"],
+            chunk_size=form.cleaned_data["chunk_size"],
+        )
+        messages.info(
+            request,
+            _("Background import of {model} enqueued as job {job}.").format(
+                model=self.queryset.model._meta.verbose_name_plural, job=job.pk
+            ),
+        )
+
+        return redirect(job.get_absolute_url())
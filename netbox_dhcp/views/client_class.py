@@ -15,6 +15,8 @@ from netbox_dhcp.models import (
     Pool,
     HostReservation,
 )
+from netbox_dhcp.kea import KeaOptionResolver
+from netbox_dhcp.utilities import TabCounts
 from netbox_dhcp.filtersets import (
     ClientClassFilterSet,
     OptionFilterSet,
@@ -25,6 +27,7 @@ from netbox_dhcp.filtersets import (
     PoolFilterSet,
     HostReservationFilterSet,
 )
+from netbox_dhcp.views.mixins import BulkImportLookupMixin
 from netbox_dhcp.forms import (
     ClientClassForm,
     ClientClassFilterForm,
@@ -34,6 +37,7 @@ from netbox_dhcp.forms import (
 from netbox_dhcp.tables import (
     ClientClassTable,
     ChildOptionTable,
+    EffectiveOptionTable,
     OptionDefinitionTable,
     ParentSharedNetworkTable,
     ParentSubnetTable,
@@ -47,6 +51,18 @@ from netbox_dhcp.tables import (
 __all__ = ()
 
 
+TAB_COUNTS = TabCounts(
+    "options",
+    "option_definitions",
+    "option_set",
+    "sharednetwork_set",
+    "subnet_set",
+    "pdpool_set",
+    "pool_set",
+    "hostreservation_set",
+)
+
+
 @register_model_view(ClientClass, "list", path="", detail=False)
 class ClientClassListView(generic.ObjectListView):
     queryset = ClientClass.objects.all()
@@ -84,7 +100,7 @@ class ClientClassDeleteView(generic.ObjectDeleteView):
 
 
 @register_model_view(ClientClass, "bulk_import", detail=False)
-class ClientClassBulkImportView(generic.BulkImportView):
+class ClientClassBulkImportView(BulkImportLookupMixin, generic.BulkImportView):
     queryset = ClientClass.objects.all()
     model_form = ClientClassImportForm
     table = ClientClassTable
@@ -116,7 +132,7 @@ class ClientClassOptionListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Options"),
         permission="netbox_dhcp.view_option",
-        badge=lambda obj: obj.options.count(),
+        badge=TAB_COUNTS.badge("options"),
         hide_if_empty=True,
     )
 
@@ -124,6 +140,27 @@ class ClientClassOptionListView(generic.ObjectChildrenView):
         return parent.options.restrict(request.user, "view")
 
 
+@register_model_view(ClientClass, "effective_options")
+class ClientClassEffectiveOptionListView(generic.ObjectChildrenView):
+    queryset = ClientClass.objects.all()
+    child_model = Option
+    table = EffectiveOptionTable
+    filterset = OptionFilterSet
+    template_name = "netbox_dhcp/clientclass/effective_options.html"
+
+    tab = ViewTab(
+        label=_("Effective Options"),
+        permission="netbox_dhcp.view_option",
+    )
+
+    def get_children(self, request, parent):
+        options = KeaOptionResolver.for_object(parent).resolve_object(parent)
+
+        return Option.objects.restrict(request.user, "view").filter(
+            pk__in=[option.pk for option in options]
+        )
+
+
 @register_model_view(ClientClass, "option_definitions")
 class ClientClassOptionDefinitionListView(generic.ObjectChildrenView):
     queryset = ClientClass.objects.all()
@@ -135,7 +172,7 @@ class ClientClassOptionDefinitionListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Option Definitions"),
         permission="netbox_dhcp.view_optiondefinition",
-        badge=lambda obj: obj.option_definitions.count(),
+        badge=TAB_COUNTS.badge("option_definitions"),
         hide_if_empty=True,
     )
 
@@ -155,7 +192,7 @@ class ClientClassParentOptionListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Parent Options"),
         permission="netbox_dhcp.view_option",
-        badge=lambda obj: obj.option_set.count(),
+        badge=TAB_COUNTS.badge("option_set"),
         hide_if_empty=True,
     )
 
@@ -175,7 +212,7 @@ class ClientClassParentSharedNetworkListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Parent Shared Networks"),
         permission="netbox_dhcp.view_sharednetwork",
-        badge=lambda obj: obj.sharednetwork_set.count(),
+        badge=TAB_COUNTS.badge("sharednetwork_set"),
         hide_if_empty=True,
     )
 
@@ -195,7 +232,7 @@ class ClientClassParentSubnetListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Parent Subnets"),
         permission="netbox_dhcp.view_subnet",
-        badge=lambda obj: obj.subnet_set.count(),
+        badge=TAB_COUNTS.badge("subnet_set"),
         hide_if_empty=True,
     )
 
@@ -215,7 +252,7 @@ class ClientClassParentPDPoolListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Parent Prefix Delegation Pools"),
         permission="netbox_dhcp.view_pdpool",
-        badge=lambda obj: obj.pdpool_set.count(),
+        badge=TAB_COUNTS.badge("pdpool_set"),
         hide_if_empty=True,
     )
 
@@ -235,7 +272,7 @@ class ClientClassParentPoolListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Parent Pools"),
         permission="netbox_dhcp.view_pool",
-        badge=lambda obj: obj.pool_set.count(),
+        badge=TAB_COUNTS.badge("pool_set"),
         hide_if_empty=True,
     )
 
@@ -255,7 +292,7 @@ class ClientClassParentHostReservationListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Parent Host Reservations"),
         permission="netbox_dhcp.view_hostreservation",
-        badge=lambda obj: obj.hostreservation_set.count(),
+        badge=TAB_COUNTS.badge("hostreservation_set"),
         hide_if_empty=True,
     )
 
@@ -12,6 +12,8 @@ from netbox_dhcp.models import (
     Option,
     OptionDefinition,
 )
+from netbox_dhcp.kea import KeaOptionResolver
+from netbox_dhcp.utilities import TabCounts
 from netbox_dhcp.filtersets import (
     DHCPServerFilterSet,
     SubnetFilterSet,
@@ -21,6 +23,7 @@ from netbox_dhcp.filtersets import (
     OptionFilterSet,
     OptionDefinitionFilterSet,
 )
+from netbox_dhcp.views.mixins import BulkImportLookupMixin
 from netbox_dhcp.forms import (
     DHCPServerForm,
     DHCPServerFilterForm,
@@ -34,6 +37,7 @@ from netbox_dhcp.tables import (
     HostReservationTable,
     ClientClassTable,
     ChildOptionTable,
+    EffectiveOptionTable,
     OptionDefinitionTable,
 )
 
@@ -50,10 +54,21 @@ __all__ = (
     "DHCPServerChildSharedNetworkListView",
     "DHCPServerChildHostReservationListView",
     "DHCPServerOptionListView",
+    "DHCPServerEffectiveOptionListView",
     "DHCPServerOptionDefinitionListView",
 )
 
 
+TAB_COUNTS = TabCounts(
+    "child_subnets",
+    "child_shared_networks",
+    "child_host_reservations",
+    "client_class_definition_set",
+    "options",
+    "option_definitions",
+)
+
+
 @register_model_view(DHCPServer, "list", path="", detail=False)
 class DHCPServerListView(generic.ObjectListView):
     queryset = DHCPServer.objects.all()
@@ -80,7 +95,7 @@ class DHCPServerDeleteView(generic.ObjectDeleteView):
 
 
 @register_model_view(DHCPServer, "bulk_import", detail=False)
-class DHCPServerBulkImportView(generic.BulkImportView):
+class DHCPServerBulkImportView(BulkImportLookupMixin, generic.BulkImportView):
     queryset = DHCPServer.objects.all()
     model_form = DHCPServerImportForm
     table = DHCPServerTable
@@ -112,7 +127,7 @@ class DHCPServerChildSubnetListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Subnets"),
         permission="netbox_dhcp.view_subnet",
-        badge=lambda obj: obj.child_subnets.count(),
+        badge=TAB_COUNTS.badge("child_subnets"),
         hide_if_empty=True,
     )
 
@@ -131,7 +146,7 @@ class DHCPServerChildSharedNetworkListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Shared Networks"),
         permission="netbox_dhcp.view_sharednetwork",
-        badge=lambda obj: obj.child_shared_networks.count(),
+        badge=TAB_COUNTS.badge("child_shared_networks"),
         hide_if_empty=True,
     )
 
@@ -150,7 +165,7 @@ class DHCPServerChildHostReservationListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Host Reservations"),
         permission="netbox_dhcp.view_hostreservation",
-        badge=lambda obj: obj.child_host_reservations.count(),
+        badge=TAB_COUNTS.badge("child_host_reservations"),
         hide_if_empty=True,
     )
 
@@ -169,7 +184,7 @@ class DHCPServerClientClassListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Client Classes"),
         permission="netbox_dhcp.view_clientclass",
-        badge=lambda obj: obj.client_class_definition_set.count(),
+        badge=TAB_COUNTS.badge("client_class_definition_set"),
         hide_if_empty=True,
     )
 
@@ -188,7 +203,7 @@ class DHCPServerOptionListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Options"),
         permission="netbox_dhcp.view_option",
-        badge=lambda obj: obj.options.count(),
+        badge=TAB_COUNTS.badge("options"),
         hide_if_empty=True,
     )
 
@@ -196,6 +211,27 @@ class DHCPServerOptionListView(generic.ObjectChildrenView):
         return parent.options.restrict(request.user, "view")
 
 
+@register_model_view(DHCPServer, "effective_options")
+class DHCPServerEffectiveOptionListView(generic.ObjectChildrenView):
+    queryset = DHCPServer.objects.all()
+    child_model = Option
+    table = EffectiveOptionTable
+    filterset = OptionFilterSet
+    template_name = "netbox_dhcp/dhcpserver/effective_options.html"
+
+    tab = ViewTab(
+        label=_("Effective Options"),
+        permission="netbox_dhcp.view_option",
+    )
+
+    def get_children(self, request, parent):
+        options = KeaOptionResolver.for_object(parent).resolve_object(parent)
+
+        return Option.objects.restrict(request.user, "view").filter(
+            pk__in=[option.pk for option in options]
+        )
+
+
 @register_model_view(DHCPServer, "option_definitions")
 class DHCPServerOptionDefinitionListView(generic.ObjectChildrenView):
     queryset = DHCPServer.objects.all()
@@ -207,7 +243,7 @@ class DHCPServerOptionDefinitionListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Option Definitions"),
         permission="netbox_dhcp.view_optiondefinition",
-        badge=lambda obj: obj.option_definitions.count(),
+        badge=TAB_COUNTS.badge("option_definitions"),
         hide_if_empty=True,
     )
 
@@ -4,14 +4,21 @@ from netbox.views import generic
 from utilities.views import register_model_view, ViewTab
 
 from netbox_dhcp.models import HostReservation, Option
+from netbox_dhcp.kea import KeaOptionResolver
 from netbox_dhcp.filtersets import HostReservationFilterSet, OptionFilterSet
+from netbox_dhcp.views.bulk_import_job import BulkImportJobView
+from netbox_dhcp.views.mixins import BulkImportLookupMixin
 from netbox_dhcp.forms import (
     HostReservationForm,
     HostReservationFilterForm,
     HostReservationImportForm,
     HostReservationBulkEditForm,
 )
-from netbox_dhcp.tables import HostReservationTable, ChildOptionTable
+from netbox_dhcp.tables import (
+    HostReservationTable,
+    ChildOptionTable,
+    EffectiveOptionTable,
+)
 
 
 __all__ = (
@@ -20,9 +27,11 @@ __all__ = (
     "HostReservationEditView",
     "HostReservationDeleteView",
     "HostReservationBulkImportView",
+    "HostReservationBulkImportJobView",
     "HostReservationBulkEditView",
     "HostReservationBulkDeleteView",
     "HostReservationOptionsListView",
+    "HostReservationEffectiveOptionsListView",
 )
 
 
@@ -52,12 +61,19 @@ class HostReservationDeleteView(generic.ObjectDeleteView):
 
 
 @register_model_view(HostReservation, "bulk_import", detail=False)
-class HostReservationBulkImportView(generic.BulkImportView):
+class HostReservationBulkImportView(BulkImportLookupMixin, generic.BulkImportView):
     queryset = HostReservation.objects.all()
     model_form = HostReservationImportForm
     table = HostReservationTable
 
 
+@register_model_view(
+    HostReservation, "bulk_import_job", path="import/job", detail=False
+)
+class HostReservationBulkImportJobView(BulkImportJobView):
+    queryset = HostReservation.objects.all()
+
+
 @register_model_view(HostReservation, "bulk_edit", path="edit", detail=False)
 class HostReservationBulkEditView(generic.BulkEditView):
     queryset = HostReservation.objects.all()
@@ -90,3 +106,24 @@ class HostReservationOptionsListView(generic.ObjectChildrenView):
 
     def get_children(self, request, parent):
         return parent.options.restrict(request.user, "view")
+
+
+@register_model_view(HostReservation, "effective_options")
+class HostReservationEffectiveOptionsListView(generic.ObjectChildrenView):
+    queryset = HostReservation.objects.all()
+    child_model = Option
+    table = EffectiveOptionTable
+    filterset = OptionFilterSet
+    template_name = "netbox_dhcp/hostreservation/effective_options.html"
+
+    tab = ViewTab(
+        label=_("Effective Options"),
+        permission="netbox_dhcp.view_option",
+    )
+
+    def get_children(self, request, parent):
+        options = KeaOptionResolver.for_object(parent).resolve_object(parent)
+
+        return Option.objects.restrict(request.user, "view").filter(
+            pk__in=[option.pk for option in options]
+        )
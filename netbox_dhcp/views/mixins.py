@@ -0,0 +1,20 @@
+from netbox_dhcp.forms.mixins import get_import_lookups, get_lookup_import_form
+
+__all__ = ("BulkImportLookupMixin",)
+
+
+class BulkImportLookupMixin:
+    def create_and_update_objects(self, form, request):
+        model_form = self.model_form
+        lookups = get_import_lookups(
+            model_form,
+            form.cleaned_data["data"],
+            getattr(form, "_csv_headers", None),
+            request.user,
+        )
+
+        self.model_form = get_lookup_import_form(model_form, lookups)
+        try:
+            return super().create_and_update_objects(form, request)
+        finally:
+            self.model_form = model_form
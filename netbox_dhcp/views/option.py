@@ -12,6 +12,8 @@ from netbox_dhcp.models import (
     ClientClass,
 )
 from netbox_dhcp.filtersets import OptionFilterSet
+from netbox_dhcp.views.bulk_import_job import BulkImportJobView
+from netbox_dhcp.views.mixins import BulkImportLookupMixin
 from netbox_dhcp.forms import (
     OptionForm,
     OptionFilterForm,
@@ -27,6 +29,7 @@ __all__ = (
     "OptionEditView",
     "OptionDeleteView",
     "OptionBulkImportView",
+    "OptionBulkImportJobView",
     "OptionBulkEditView",
     "OptionBulkDeleteView",
 )
@@ -132,12 +135,17 @@ class OptionDeleteView(generic.ObjectDeleteView):
 
 
 @register_model_view(Option, "bulk_import", detail=False)
-class OptionBulkImportView(generic.BulkImportView):
+class OptionBulkImportView(BulkImportLookupMixin, generic.BulkImportView):
     queryset = Option.objects.all()
     model_form = OptionImportForm
     table = OptionTable
 
 
+@register_model_view(Option, "bulk_import_job", path="import/job", detail=False)
+class OptionBulkImportJobView(BulkImportJobView):
+    queryset = Option.objects.all()
+
+
 @register_model_view(Option, "bulk_edit", path="edit", detail=False)
 class OptionBulkEditView(generic.BulkEditView):
     queryset = Option.objects.all()
@@ -3,15 +3,18 @@ from django.utils.translation import gettext_lazy as _
 from netbox.views import generic
 from utilities.views import register_model_view, ViewTab
 
-from netbox_dhcp.models import PDPool, Option
+from netbox_dhcp.models import PDPool, Subnet, Option
+from netbox_dhcp.utilities import assign_pool_ids
+from netbox_dhcp.kea import KeaOptionResolver
 from netbox_dhcp.filtersets import PDPoolFilterSet, OptionFilterSet
+from netbox_dhcp.views.mixins import BulkImportLookupMixin
 from netbox_dhcp.forms import (
     PDPoolForm,
     PDPoolFilterForm,
     PDPoolImportForm,
     PDPoolBulkEditForm,
 )
-from netbox_dhcp.tables import PDPoolTable, ChildOptionTable
+from netbox_dhcp.tables import PDPoolTable, ChildOptionTable, EffectiveOptionTable
 
 
 __all__ = (
@@ -23,6 +26,7 @@ __all__ = (
     "PDPoolBulkEditView",
     "PDPoolBulkDeleteView",
     "PDPoolOptionsListView",
+    "PDPoolEffectiveOptionsListView",
 )
 
 
@@ -52,11 +56,28 @@ class PDPoolDeleteView(generic.ObjectDeleteView):
 
 
 @register_model_view(PDPool, "bulk_import", detail=False)
-class PDPoolBulkImportView(generic.BulkImportView):
+class PDPoolBulkImportView(BulkImportLookupMixin, generic.BulkImportView):
     queryset = PDPool.objects.all()
     model_form = PDPoolImportForm
     table = PDPoolTable
 
+    def create_and_update_objects(self, form, request):
+        records = [
+            record
+            for record in form.cleaned_data["data"]
+            if not record.get("id") and not record.get("pool_id")
+        ]
+        subnets = dict(
+            Subnet.objects.filter(
+                name__in={record.get("subnet") for record in records}
+            ).values_list("name", "pk")
+        )
+        assign_pool_ids(
+            records, [subnets.get(record.get("subnet")) for record in records]
+        )
+
+        return super().create_and_update_objects(form, request)
+
 
 @register_model_view(PDPool, "bulk_edit", path="edit", detail=False)
 class PDPoolBulkEditView(generic.BulkEditView):
@@ -90,3 +111,24 @@ class PDPoolOptionsListView(generic.ObjectChildrenView):
 
     def get_children(self, request, parent):
         return parent.options.restrict(request.user, "view")
+
+
+@register_model_view(PDPool, "effective_options")
+class PDPoolEffectiveOptionsListView(generic.ObjectChildrenView):
+    queryset = PDPool.objects.all()
+    child_model = Option
+    table = EffectiveOptionTable
+    filterset = OptionFilterSet
+    template_name = "netbox_dhcp/pdpool/effective_options.html"
+
+    tab = ViewTab(
+        label=_("Effective Options"),
+        permission="netbox_dhcp.view_option",
+    )
+
+    def get_children(self, request, parent):
+        options = KeaOptionResolver.for_object(parent).resolve_object(parent)
+
+        return Option.objects.restrict(request.user, "view").filter(
+            pk__in=[option.pk for option in options]
+        )
@@ -3,15 +3,19 @@ from django.utils.translation import gettext_lazy as _
 from netbox.views import generic
 from utilities.views import register_model_view, ViewTab
 
-from netbox_dhcp.models import Pool, Option
+from netbox_dhcp.models import Pool, Subnet, Option
+from netbox_dhcp.utilities import assign_pool_ids
+from netbox_dhcp.kea import KeaOptionResolver
 from netbox_dhcp.filtersets import PoolFilterSet, OptionFilterSet
+from netbox_dhcp.views.bulk_import_job import BulkImportJobView
+from netbox_dhcp.views.mixins import BulkImportLookupMixin
 from netbox_dhcp.forms import (
     PoolForm,
     PoolFilterForm,
     PoolImportForm,
     PoolBulkEditForm,
 )
-from netbox_dhcp.tables import PoolTable, ChildOptionTable
+from netbox_dhcp.tables import PoolTable, ChildOptionTable, EffectiveOptionTable
 
 
 __all__ = (
@@ -20,8 +24,10 @@ __all__ = (
     "PoolEditView",
     "PoolDeleteView",
     "PoolBulkImportView",
+    "PoolBulkImportJobView",
     "PoolBulkEditView",
     "PoolOptionsListView",
+    "PoolEffectiveOptionsListView",
 )
 
 
@@ -51,11 +57,33 @@ class PoolDeleteView(generic.ObjectDeleteView):
 
 
 @register_model_view(Pool, "bulk_import", detail=False)
-class PoolBulkImportView(generic.BulkImportView):
+class PoolBulkImportView(BulkImportLookupMixin, generic.BulkImportView):
     queryset = Pool.objects.all()
     model_form = PoolImportForm
     table = PoolTable
 
+    def create_and_update_objects(self, form, request):
+        records = [
+            record
+            for record in form.cleaned_data["data"]
+            if not record.get("id") and not record.get("pool_id")
+        ]
+        subnets = dict(
+            Subnet.objects.filter(
+                name__in={record.get("subnet") for record in records}
+            ).values_list("name", "pk")
+        )
+        assign_pool_ids(
+            records, [subnets.get(record.get("subnet")) for record in records]
+        )
+
+        return super().create_and_update_objects(form, request)
+
+
+@register_model_view(Pool, "bulk_import_job", path="import/job", detail=False)
+class PoolBulkImportJobView(BulkImportJobView):
+    queryset = Pool.objects.all()
+
 
 @register_model_view(Pool, "bulk_edit", path="edit", detail=False)
 class PoolBulkEditView(generic.BulkEditView):
@@ -89,3 +117,24 @@ class PoolOptionsListView(generic.ObjectChildrenView):
 
     def get_children(self, request, parent):
         return parent.options.restrict(request.user, "view")
+
+
+@register_model_view(Pool, "effective_options")
+class PoolEffectiveOptionsListView(generic.ObjectChildrenView):
+    queryset = Pool.objects.all()
+    child_model = Option
+    table = EffectiveOptionTable
+    filterset = OptionFilterSet
+    template_name = "netbox_dhcp/pool/effective_options.html"
+
+    tab = ViewTab(
+        label=_("Effective Options"),
+        permission="netbox_dhcp.view_option",
+    )
+
+    def get_children(self, request, parent):
+        options = KeaOptionResolver.for_object(parent).resolve_object(parent)
+
+        return Option.objects.restrict(request.user, "view").filter(
+            pk__in=[option.pk for option in options]
+        )
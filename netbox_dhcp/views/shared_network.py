@@ -1,21 +1,30 @@
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _
 
 from netbox.views import generic
 from utilities.views import register_model_view, ViewTab
 
-from netbox_dhcp.models import SharedNetwork, Subnet, Option
+from netbox_dhcp.models import DHCPServerInterface, SharedNetwork, Subnet, Option
+from netbox_dhcp.kea import KeaOptionResolver
+from netbox_dhcp.utilities import TabCounts
 from netbox_dhcp.filtersets import (
     SharedNetworkFilterSet,
     SubnetFilterSet,
     OptionFilterSet,
 )
+from netbox_dhcp.views.mixins import BulkImportLookupMixin
 from netbox_dhcp.forms import (
     SharedNetworkForm,
     SharedNetworkFilterForm,
     SharedNetworkImportForm,
     SharedNetworkBulkEditForm,
 )
-from netbox_dhcp.tables import SharedNetworkTable, SubnetTable, ChildOptionTable
+from netbox_dhcp.tables import (
+    SharedNetworkTable,
+    SubnetTable,
+    ChildOptionTable,
+    EffectiveOptionTable,
+)
 
 
 __all__ = (
@@ -28,6 +37,13 @@ __all__ = (
     "SharedNetworkBulkDeleteView",
     "SharedNetworkChildSubnetListView",
     "SharedNetworkOptionsListView",
+    "SharedNetworkEffectiveOptionsListView",
+)
+
+
+TAB_COUNTS = TabCounts(
+    "child_subnets",
+    "options",
 )
 
 
@@ -41,7 +57,12 @@ class SharedNetworkListView(generic.ObjectListView):
 
 @register_model_view(SharedNetwork)
 class SharedNetworkView(generic.ObjectView):
-    queryset = SharedNetwork.objects.all()
+    queryset = SharedNetwork.objects.prefetch_related(
+        Prefetch(
+            "server_interfaces",
+            queryset=DHCPServerInterface.objects.with_names(),
+        )
+    )
 
 
 @register_model_view(SharedNetwork, "add", detail=False)
@@ -57,7 +78,7 @@ class SharedNetworkDeleteView(generic.ObjectDeleteView):
 
 
 @register_model_view(SharedNetwork, "bulk_import", detail=False)
-class SharedNetworkBulkImportView(generic.BulkImportView):
+class SharedNetworkBulkImportView(BulkImportLookupMixin, generic.BulkImportView):
     queryset = SharedNetwork.objects.all()
     model_form = SharedNetworkImportForm
     table = SharedNetworkTable
@@ -89,7 +110,7 @@ class SharedNetworkChildSubnetListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Child Subnets"),
         permission="netbox_dhcp.view_subnet",
-        badge=lambda obj: obj.child_subnets.count(),
+        badge=TAB_COUNTS.badge("child_subnets"),
         hide_if_empty=True,
     )
 
@@ -108,9 +129,30 @@ class SharedNetworkOptionsListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Options"),
         permission="netbox_dhcp.view_option",
-        badge=lambda obj: obj.options.count(),
+        badge=TAB_COUNTS.badge("options"),
         hide_if_empty=True,
     )
 
     def get_children(self, request, parent):
         return parent.options.restrict(request.user, "view")
+
+
+@register_model_view(SharedNetwork, "effective_options")
+class SharedNetworkEffectiveOptionsListView(generic.ObjectChildrenView):
+    queryset = SharedNetwork.objects.all()
+    child_model = Option
+    table = EffectiveOptionTable
+    filterset = OptionFilterSet
+    template_name = "netbox_dhcp/sharednetwork/effective_options.html"
+
+    tab = ViewTab(
+        label=_("Effective Options"),
+        permission="netbox_dhcp.view_option",
+    )
+
+    def get_children(self, request, parent):
+        options = KeaOptionResolver.for_object(parent).resolve_object(parent)
+
+        return Option.objects.restrict(request.user, "view").filter(
+            pk__in=[option.pk for option in options]
+        )
@@ -1,9 +1,19 @@
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _
 
 from netbox.views import generic
 from utilities.views import register_model_view, ViewTab
 
-from netbox_dhcp.models import Subnet, Pool, PDPool, HostReservation, Option
+from netbox_dhcp.models import (
+    DHCPServerInterface,
+    Subnet,
+    Pool,
+    PDPool,
+    HostReservation,
+    Option,
+)
+from netbox_dhcp.utilities import TabCounts, allocate_subnet_ids
+from netbox_dhcp.kea import KeaOptionResolver
 from netbox_dhcp.filtersets import (
     SubnetFilterSet,
     PoolFilterSet,
@@ -11,6 +21,8 @@ from netbox_dhcp.filtersets import (
     HostReservationFilterSet,
     OptionFilterSet,
 )
+from netbox_dhcp.views.bulk_import_job import BulkImportJobView
+from netbox_dhcp.views.mixins import BulkImportLookupMixin
 from netbox_dhcp.forms import (
     SubnetForm,
     SubnetFilterForm,
@@ -23,6 +35,7 @@ from netbox_dhcp.tables import (
     PDPoolTable,
     HostReservationTable,
     ChildOptionTable,
+    EffectiveOptionTable,
 )
 
 
@@ -32,12 +45,22 @@ __all__ = (
     "SubnetEditView",
     "SubnetDeleteView",
     "SubnetBulkImportView",
+    "SubnetBulkImportJobView",
     "SubnetBulkEditView",
     "SubnetBulkDeleteView",
     "SubnetChildPoolListView",
     "SubnetChildPDPoolListView",
     "SubnetChildHostReservationListView",
     "SubnetOptionsListView",
+    "SubnetEffectiveOptionsListView",
+)
+
+
+TAB_COUNTS = TabCounts(
+    "child_pools",
+    "child_pd_pools",
+    "child_host_reservations",
+    "options",
 )
 
 
@@ -51,7 +74,12 @@ class SubnetListView(generic.ObjectListView):
 
 @register_model_view(Subnet)
 class SubnetView(generic.ObjectView):
-    queryset = Subnet.objects.all()
+    queryset = Subnet.objects.prefetch_related(
+        Prefetch(
+            "server_interfaces",
+            queryset=DHCPServerInterface.objects.with_names(),
+        )
+    )
 
 
 @register_model_view(Subnet, "add", detail=False)
@@ -67,11 +95,27 @@ class SubnetDeleteView(generic.ObjectDeleteView):
 
 
 @register_model_view(Subnet, "bulk_import", detail=False)
-class SubnetBulkImportView(generic.BulkImportView):
+class SubnetBulkImportView(BulkImportLookupMixin, generic.BulkImportView):
     queryset = Subnet.objects.all()
     model_form = SubnetImportForm
     table = SubnetTable
 
+    def create_and_update_objects(self, form, request):
+        records = [
+            record
+            for record in form.cleaned_data["data"]
+            if not record.get("id") and not record.get("subnet_id")
+        ]
+        for record, subnet_id in zip(records, allocate_subnet_ids(len(records))):
+            record["subnet_id"] = subnet_id
+
+        return super().create_and_update_objects(form, request)
+
+
+@register_model_view(Subnet, "bulk_import_job", path="import/job", detail=False)
+class SubnetBulkImportJobView(BulkImportJobView):
+    queryset = Subnet.objects.all()
+
 
 @register_model_view(Subnet, "bulk_edit", path="edit", detail=False)
 class SubnetBulkEditView(generic.BulkEditView):
@@ -99,7 +143,7 @@ class SubnetChildPoolListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Pools"),
         permission="netbox_dhcp.view_pool",
-        badge=lambda obj: obj.child_pools.count(),
+        badge=TAB_COUNTS.badge("child_pools"),
         hide_if_empty=True,
     )
 
@@ -118,7 +162,7 @@ class SubnetChildPDPoolListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Prefix Delegation Pools"),
         permission="netbox_dhcp.view_pdpool",
-        badge=lambda obj: obj.child_pd_pools.count(),
+        badge=TAB_COUNTS.badge("child_pd_pools"),
         hide_if_empty=True,
     )
 
@@ -137,7 +181,7 @@ class SubnetChildHostReservationListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Host Reservations"),
         permission="netbox_dhcp.view_hostreservation",
-        badge=lambda obj: obj.child_host_reservations.count(),
+        badge=TAB_COUNTS.badge("child_host_reservations"),
         hide_if_empty=True,
     )
 
@@ -156,9 +200,30 @@ class SubnetOptionsListView(generic.ObjectChildrenView):
     tab = ViewTab(
         label=_("Options"),
         permission="netbox_dhcp.view_option",
-        badge=lambda obj: obj.options.count(),
+        badge=TAB_COUNTS.badge("options"),
         hide_if_empty=True,
     )
 
     def get_children(self, request, parent):
         return parent.options.restrict(request.user, "view")
+
+
+@register_model_view(Subnet, "effective_options")
+class SubnetEffectiveOptionsListView(generic.ObjectChildrenView):
+    queryset = Subnet.objects.all()
+    child_model = Option
+    table = EffectiveOptionTable
+    filterset = OptionFilterSet
+    template_name = "netbox_dhcp/subnet/effective_options.html"
+
+    tab = ViewTab(
+        label=_("Effective Options"),
+        permission="netbox_dhcp.view_option",
+    )
+
+    def get_children(self, request, parent):
+        options = KeaOptionResolver.for_object(parent).resolve_object(parent)
+
+        return Option.objects.restrict(request.user, "view").filter(
+            pk__in=[option.pk for option in options]
+        )